@@ -5,15 +5,20 @@ from flask_login import LoginManager
 from flask_bcrypt import Bcrypt
 from flask_admin import Admin
 from werkzeug.exceptions import HTTPException
-from typing import Any
+from threading import Lock
+import os
+from typing import Any, Callable, Iterable
 from .localization import get_translations
-from .config import Config
+from .config import config_profiles
+from .database import configure_sqlite
 
 
 app = Flask(__name__)
-app.config.from_object(Config)
+app.config.from_object(config_profiles[os.environ.get("APP_CONFIG", "default")])
 
 db = SQLAlchemy(app)
+with app.app_context():
+    configure_sqlite(db.engine, app.config.get("SQLITE_PRAGMAS", {}))
 bcrypt = Bcrypt(app)
 admin = Admin(app)
 mail = Mail(app)
@@ -88,7 +93,58 @@ def set_language() -> None:
     g.lang = lang or 'en'
     session['lang'] = g.lang
 
+_admin_lock = Lock()
+_admin_registered = False
+
+def init_admin() -> None:
+    """
+    Register the Flask-Admin model views once.
+
+    Importing the SQLAlchemy admin views is deferred until the app serves its
+    first request, so importing the package stays cheap for workers, scripts
+    and tests that never reach the admin interface.
+    """
+    global _admin_registered
+    if _admin_registered:
+        return
+    with _admin_lock:
+        if not _admin_registered:
+            from .admin_views import register_admin_views
+            register_admin_views()
+            _admin_registered = True
+
+def lazy_setup(wsgi_app: Callable) -> Callable:
+    """
+    Wrap the WSGI application to run deferred setup before the first request.
+
+    Blueprints can only be registered before Flask handles a request, so the
+    admin views are added here rather than from a request hook. The mail
+    worker, the report snapshot refresher and the service scheduler are
+    started here too, so only processes serving requests run them.
+
+    Args:
+        wsgi_app (Callable): The wrapped WSGI application.
+
+    Returns:
+        Callable: WSGI application running deferred setup before dispatching.
+    """
+    def wrapper(environ: dict, start_response: Callable) -> Iterable[bytes]:
+        init_admin()
+        mail_worker.start()
+        report_snapshot.start()
+        service_scheduler.start()
+        return wsgi_app(environ, start_response)
+    return wrapper
+
+app.wsgi_app = lazy_setup(app.wsgi_app)
+
 from .routes import *
+from .mailer import mail_worker
+from .snapshot import report_snapshot
+from .audit import audit_page
+from .summary import rebuild_machine_summary_command
+from .rollups import rebuild_rollups_command
+from .scheduler import service_scheduler
 
 @app.errorhandler(404)
 def not_found(e: HTTPException) -> Response:
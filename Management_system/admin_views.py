@@ -0,0 +1,160 @@
+from flask import redirect, request, Response
+from flask_admin import BaseView, expose
+from flask_admin.contrib.sqla import ModelView
+from flask_login import current_user
+from sqlalchemy.orm import configure_mappers
+from . import db, admin, lang_url_for
+from .audit import AUDIT_EXCLUDED_TABLES, audit_page, format_cursor, parse_cursor
+from .models import (
+    User, Machine, Client, Part, Location, Service, PartsReplaced, MachineType,
+    OneTimeLink, Task, Visit, OutboxMessage
+)
+
+
+class AdminModelView(ModelView):
+    """Base admin view that restricts access not authenticated users."""
+    def is_accessible(self) -> bool:
+        """
+        Determine if the current user has access to the admin view.
+
+        Returns:
+            bool: True if user is authenticated and an admin, False otherwise.
+        """
+        user = current_user
+        return user.is_authenticated and user.is_admin
+
+class RedirectHomeView(BaseView):
+    """Custom admin view that redirects to the index page."""
+    @expose('/')
+    def index(self) -> Response:
+        """
+        Redirect to the localized index route.
+
+        Returns:
+            Response: A Flask redirect response to the index page.
+        """
+        return redirect(lang_url_for('index'))
+
+    def is_accessible(self) -> bool:
+        """
+        Determine if the current user can access the redirect view.
+
+        Returns:
+            bool: True if user is authenticated and an admin, False otherwise.
+        """
+        user = current_user
+        return user.is_authenticated and user.is_admin
+    
+class UserAdminView(AdminModelView):
+    """Admin view configuration of fields"""
+    form_columns = [
+        'name',
+        'surname',
+        'phone_number',
+        'email',
+        'password',
+        'is_admin',
+        'is_active',
+        'is_verified'
+    ]
+
+class MachineAdminView(AdminModelView):
+    """Admin view configuration of fields"""
+    form_columns = [
+        'client',
+        'machine_type',
+        'serial_number',
+        'start_of_operation',
+        'end_of_warranty',
+        'is_active'
+    ]
+
+class ClientAdminView(AdminModelView):
+    """Admin view configuration of fields"""
+    form_columns = [
+        'company',
+        'address',
+        'city',
+        'contact_person',
+        'phone_number',
+        'email'
+    ]
+
+class PartAdminView(AdminModelView):
+    """Admin view configuration of fields"""
+    form_columns = [
+        'part_number',
+        'name_en',
+        'name_lt',
+        'price'
+    ]
+
+class LocationAdminView(AdminModelView):
+    """Admin view configuration of fields"""
+    form_columns = [
+        'location_en',
+        'location_lt'
+    ]
+
+
+class AuditLogView(BaseView):
+    """Read-only audit trail browser with keyset pagination."""
+    @expose('/')
+    def index(self) -> str:
+        """
+        Show one page of audit entries, newest first.
+
+        Filters: `entity_type`, `entity_id`, `user_id`. Pages are navigated
+        with `after`/`before` cursors.
+
+        Returns:
+            str: The rendered audit log page.
+        """
+        filters = {
+            'entity_type': request.args.get('entity_type') or None,
+            'entity_id': request.args.get('entity_id', type=int),
+            'user_id': request.args.get('user_id', type=int),
+        }
+        page = audit_page(
+            **filters,
+            after=parse_cursor(request.args.get('after')),
+            before=parse_cursor(request.args.get('before'))
+        )
+        entity_types = sorted(
+            table for table in db.metadata.tables if table not in AUDIT_EXCLUDED_TABLES
+        )
+        return self.render(
+            'admin/audit_log.html',
+            entries=page.items,
+            page=page,
+            filters={key: value for key, value in filters.items() if value is not None},
+            entity_types=entity_types,
+            users=User.query.order_by(User.name).all(),
+            format_cursor=format_cursor
+        )
+
+    def is_accessible(self) -> bool:
+        """
+        Determine if the current user can access the audit log.
+
+        Returns:
+            bool: True if user is authenticated and an admin, False otherwise.
+        """
+        user = current_user
+        return user.is_authenticated and user.is_admin
+
+
+def register_admin_views() -> None:
+    """Add the model views to the Flask-Admin interface."""
+    configure_mappers()
+    admin.add_view(RedirectHomeView(name='Index'))
+    admin.add_view(UserAdminView(User, db.session))
+    admin.add_view(MachineAdminView(Machine, db.session))
+    admin.add_view(ClientAdminView(Client, db.session))
+    admin.add_view(PartAdminView(Part, db.session))
+    admin.add_view(LocationAdminView(Location, db.session))
+
+    tables = [Service, PartsReplaced, MachineType, OneTimeLink, Task, Visit, OutboxMessage]
+    for table in tables:
+        admin.add_view(AdminModelView(table, db.session))
+    admin.add_view(AuditLogView(name='Audit log', endpoint='audit_log'))
@@ -0,0 +1,273 @@
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional, Sequence
+from flask import g, has_request_context
+from sqlalchemy import event, inspect, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import LoaderCallableStatus, Session, joinedload
+from . import app, db
+from .models import AuditEntry
+from .pagination import Page, keyset_page
+from .utils import LOCK_RETRIES, is_database_locked, lock_retry_delay, log_user_action
+
+AUDIT_PER_PAGE = 50
+AUDIT_EXCLUDED_TABLES = {"audit_log", "mail_outbox"}
+REDACTED_COLUMNS = {"password"}
+
+
+def json_value(value: Any) -> Any:
+    """Convert a column value to a JSON serializable value."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+def column_values(obj: Any) -> dict[str, Any]:
+    """Return the loaded column values of a mapped object, without emitting SQL."""
+    state = inspect(obj)
+    values = {}
+    for attr in state.mapper.column_attrs:
+        value = state.attrs[attr.key].loaded_value
+        if value is LoaderCallableStatus.NO_VALUE:
+            continue
+        values[attr.key] = "***" if attr.key in REDACTED_COLUMNS else json_value(value)
+    return values
+
+def changed_values(obj: Any, old_values: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Return the old and new values of the columns changed since the last flush.
+
+    Args:
+        obj: Updated object.
+        old_values: Old values read by `load_old_values` for columns that were
+            changed without being loaded first.
+    """
+    state = inspect(obj)
+    before, after = {}, {}
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        if not history.has_changes():
+            continue
+        if attr.key in REDACTED_COLUMNS:
+            before[attr.key] = after[attr.key] = "***"
+            continue
+        old_value = history.deleted[0] if history.deleted else old_values.get(attr.key)
+        before[attr.key] = json_value(old_value)
+        after[attr.key] = json_value(history.added[0]) if history.added else None
+    return before, after
+
+@event.listens_for(db.session, "before_flush")
+def load_old_values(session: Session, flush_context: Any, instances: Any) -> None:
+    """
+    Read the database values of columns assigned while expired.
+
+    After a commit objects are expired, so assigning an attribute does not
+    record the value it replaces. Those values are selected by primary key
+    before the flush overwrites them.
+    """
+    old_values = session.info.setdefault("audit_old_values", {})
+    for obj in session.dirty:
+        if obj.__tablename__ in AUDIT_EXCLUDED_TABLES:
+            continue
+        state = inspect(obj)
+        if state.key is None:
+            continue
+        unknown = {}
+        for attr in state.mapper.column_attrs:
+            history = state.attrs[attr.key].history
+            if history.added and not history.deleted:
+                unknown[attr.key] = attr.columns[0]
+        if not unknown:
+            continue
+        primary_key = [
+            column == value for column, value in zip(state.mapper.primary_key, state.key[1])
+        ]
+        row = session.connection().execute(select(*unknown.values()).where(*primary_key)).first()
+        if row is not None:
+            old_values[id(obj)] = dict(zip(unknown, row))
+
+def current_user_id() -> Optional[int]:
+    """
+    Return the id of the logged in user without loading it from the database.
+
+    Flask-Login caches the user in `g` when it is first accessed; audited
+    requests always access it through `login_required`.
+    """
+    if not has_request_context():
+        return None
+    user = g.get("_login_user")
+    return user.id if user is not None and user.is_authenticated else None
+
+def audit_entry(obj: Any, action: str, before: Optional[dict], after: Optional[dict], now: datetime) -> dict[str, Any]:
+    """Build an audit_log row for a changed object."""
+    identity = inspect(obj).mapper.primary_key_from_instance(obj)
+    return {
+        "user_id": current_user_id(),
+        "action": action,
+        "entity_type": obj.__tablename__,
+        "entity_id": identity[0] if len(identity) == 1 else None,
+        "before": before,
+        "after": after,
+        "created_at": now,
+    }
+
+def record_change(entity_type: str, entity_id: int, action: str, before: Optional[dict], after: Optional[dict]) -> None:
+    """
+    Audit a change made with a bulk UPDATE or DELETE, which bypasses the flush.
+
+    The entry is committed or discarded together with the current transaction.
+
+    Args:
+        entity_type: Table name of the changed row.
+        entity_id: Primary key of the changed row.
+        action: "create", "update" or "delete".
+        before: Old column values.
+        after: New column values.
+    """
+    db.session.info.setdefault("audit_pending", []).append({
+        "user_id": current_user_id(),
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "before": before,
+        "after": after,
+        "created_at": datetime.now(),
+    })
+
+@event.listens_for(db.session, "after_flush")
+def collect_changes(session: Session, flush_context: Any) -> None:
+    """
+    Record the rows inserted, updated and deleted by a flush.
+
+    The entries wait in `session.info` until the transaction commits, so
+    rolled back changes are never audited.
+    """
+    now = datetime.now()
+    pending = session.info.setdefault("audit_pending", [])
+
+    for obj in session.new:
+        if obj.__tablename__ not in AUDIT_EXCLUDED_TABLES:
+            pending.append(audit_entry(obj, "create", None, column_values(obj), now))
+
+    for obj in session.dirty:
+        if obj.__tablename__ in AUDIT_EXCLUDED_TABLES or not session.is_modified(obj):
+            continue
+        before, after = changed_values(obj, session.info.get("audit_old_values", {}).get(id(obj), {}))
+        if after:
+            pending.append(audit_entry(obj, "update", before, after, now))
+
+    for obj in session.deleted:
+        if obj.__tablename__ not in AUDIT_EXCLUDED_TABLES:
+            pending.append(audit_entry(obj, "delete", column_values(obj), None, now))
+
+    session.info.pop("audit_old_values", None)
+
+@event.listens_for(db.session, "after_commit")
+def commit_changes(session: Session) -> None:
+    """
+    Move committed entries to the request buffer, or write them right away
+    when there is no request (scripts, background workers).
+    """
+    entries = session.info.pop("audit_pending", [])
+    if not entries:
+        return
+    if has_request_context():
+        g.setdefault("audit_entries", []).extend(entries)
+    else:
+        write_entries(entries)
+
+@event.listens_for(db.session, "after_rollback")
+def discard_changes(session: Session) -> None:
+    """Forget entries of a rolled back transaction."""
+    session.info.pop("audit_pending", None)
+
+def write_entries(entries: list[dict[str, Any]]) -> None:
+    """
+    Insert audit entries with one executemany statement in its own transaction.
+
+    Runs after the audited transaction has committed, so errors are logged
+    instead of raised; a locked database is retried like other writers.
+
+    Args:
+        entries: Rows built by `audit_entry`.
+    """
+    for attempt in range(LOCK_RETRIES + 1):
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(AuditEntry.__table__.insert(), entries)
+            return
+        except Exception as error:
+            if isinstance(error, OperationalError) and is_database_locked(error) and attempt < LOCK_RETRIES:
+                time.sleep(lock_retry_delay(attempt))
+                continue
+            log_user_action("System", "Audit", f"Failed to write {len(entries)} entries: {error}", level="error")
+            return
+
+@app.teardown_request
+def write_request_entries(error: Optional[BaseException]) -> None:
+    """Write the audit entries committed during the request in one batch."""
+    entries = g.pop("audit_entries", None)
+    if entries:
+        write_entries(entries)
+
+def format_cursor(entry: AuditEntry) -> str:
+    """Return the pagination cursor of an audit entry."""
+    return f"{entry.created_at.isoformat()}_{entry.id}"
+
+def parse_cursor(value: Optional[str]) -> Optional[tuple[datetime, int]]:
+    """
+    Parse a cursor made by `format_cursor`.
+
+    Returns:
+        tuple | None: (created_at, id), or None if the value is missing or invalid.
+    """
+    if not value:
+        return None
+    created_at, _, entry_id = value.rpartition("_")
+    try:
+        return (datetime.fromisoformat(created_at), int(entry_id))
+    except ValueError:
+        return None
+
+def audit_page(
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    after: Optional[Sequence[Any]] = None,
+    before: Optional[Sequence[Any]] = None,
+    per_page: int = AUDIT_PER_PAGE
+) -> Page:
+    """
+    Fetch one page of audit entries, newest first.
+
+    Every filter combination is served by an index on the filter columns
+    followed by created_at, so a page costs an index seek however long the
+    history is.
+
+    Args:
+        entity_type: Table name of the changed rows.
+        entity_id: Primary key of the changed row (requires entity_type).
+        user_id: User who made the changes.
+        after: (created_at, id) of the last entry on the previous page.
+        before: (created_at, id) of the first entry on the next page.
+        per_page: Number of entries per page.
+
+    Returns:
+        Page: Audit entries with their users loaded.
+    """
+    query = AuditEntry.query.options(joinedload(AuditEntry.user))
+    if entity_type:
+        query = query.filter(AuditEntry.entity_type == entity_type)
+        if entity_id is not None:
+            query = query.filter(AuditEntry.entity_id == entity_id)
+    if user_id is not None:
+        query = query.filter(AuditEntry.user_id == user_id)
+
+    return keyset_page(
+        query, [AuditEntry.created_at, AuditEntry.id], per_page,
+        after=after, before=before, descending=True
+    )
@@ -0,0 +1,136 @@
+import os
+import io
+import hashlib
+import tempfile
+from typing import Optional
+from . import app
+
+CHART_FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+
+class ChartCache:
+    """
+    On-disk cache of rendered chart images with a total size limit.
+
+    Files are evicted least recently used first; a cache hit refreshes the
+    file's modification time.
+    """
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return cached chart bytes, or None on a miss.
+
+        Args:
+            key: Cache key returned by `chart_key`.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Store chart bytes atomically and evict old files over the size limit.
+
+        Args:
+            key: Cache key returned by `chart_key`.
+            data: Rendered chart.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, self._path(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Delete least recently used files until the cache fits in `max_bytes`.
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.startswith('.tmp-'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+chart_cache = ChartCache(app.config['CHART_CACHE_DIR'], app.config['CHART_CACHE_MAX_BYTES'])
+
+def chart_key(report: str, year: int, month: int, lang: str, data_version: str, fmt: str) -> str:
+    """
+    Build the cache key (and ETag) of a chart.
+
+    Args:
+        report: Report name.
+        year: Report year.
+        month: Report month.
+        lang: Language of the chart labels.
+        data_version: Digest of the data drawn on the chart.
+        fmt: Image format ('png' or 'svg').
+
+    Returns:
+        str: File name safe key.
+    """
+    digest = hashlib.sha256(
+        f"{report}|{year}|{month}|{lang}|{data_version}".encode('utf-8')
+    ).hexdigest()[:32]
+    return f"{report}-{year}-{month:02}-{lang}-{digest}.{fmt}"
+
+def data_version(labels: list[str], values: list[int]) -> str:
+    """
+    Return a digest identifying the data drawn on a chart.
+
+    Args:
+        labels: Slice labels.
+        values: Slice values.
+    """
+    return hashlib.sha256(repr(list(zip(labels, values))).encode('utf-8')).hexdigest()
+
+def render_pie_chart(labels: list[str], values: list[int], fmt: str = 'png') -> bytes:
+    """
+    Render a pie chart to image bytes.
+
+    Matplotlib is imported on first use; it dominates the package import time
+    otherwise.
+
+    Args:
+        labels: Slice labels.
+        values: Slice values.
+        fmt: Image format ('png' or 'svg').
+
+    Returns:
+        bytes: Encoded image.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    ax = fig.subplots()
+    ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
+    ax.axis('equal')
+
+    img_bytes = io.BytesIO()
+    fig.savefig(img_bytes, format=fmt, bbox_inches='tight')
+    return img_bytes.getvalue()
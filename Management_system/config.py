@@ -8,3 +8,47 @@ class Config:
     MAIL_DEFAULT_SENDER = "your_email@example.com"
     MAIL_USERNAME = "your_email_username"
     MAIL_PASSWORD = "your_email_password"
+    MAIL_WORKER = True
+    MAIL_WORKER_INTERVAL = 30
+
+    CHART_CACHE_DIR = "cache/charts"
+    CHART_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+    REPORT_SNAPSHOT = False
+    REPORT_SNAPSHOT_PATH = "snapshots/reports.db"
+    REPORT_SNAPSHOT_INTERVAL = 300
+
+    SERVICE_INTERVAL_BANKNOTES = 2_000_000
+    SCHEDULER = True
+    SCHEDULER_INTERVAL = 3600
+    SCHEDULER_HORIZON_DAYS = 30
+    SCHEDULER_HISTORY_DAYS = 365
+
+
+class ProductionConfig(Config):
+    """
+    SQLite tuned for concurrent engineers: WAL lets reports read while
+    services are written, and writers wait for the lock instead of failing.
+    """
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "connect_args": {"timeout": 15, "check_same_thread": False},
+        "pool_size": 10,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+    }
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 15000,
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    }
+    REPORT_SNAPSHOT = True
+
+
+config_profiles = {
+    "default": Config,
+    "production": ProductionConfig,
+}
@@ -0,0 +1,22 @@
+from typing import Any
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def configure_sqlite(engine: Engine, pragmas: dict[str, Any]) -> None:
+    """
+    Run PRAGMA statements on every new connection of a SQLite engine.
+
+    Args:
+        engine: SQLite engine.
+        pragmas: Pragma names and values, e.g. {"journal_mode": "WAL"}.
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
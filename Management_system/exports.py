@@ -0,0 +1,208 @@
+import csv
+import io
+import zipfile
+from datetime import date
+from itertools import chain
+from typing import Any, Iterable, Iterator, Optional
+from xml.sax.saxutils import escape
+from flask import Response, stream_with_context
+from sqlalchemy import Select, select
+from .models import Client, Machine, Part, PartsReplaced
+from .snapshot import report_session
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+EXPORT_BATCH_SIZE = 1000
+CSV_ROWS_PER_CHUNK = 500
+
+XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+XLSX_SHEET_END = '</sheetData></worksheet>'
+
+
+class ChunkBuffer(io.RawIOBase):
+    """Write-only stream collecting bytes until they are taken with `take`."""
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        """Return and forget everything written so far."""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def csv_stream(header: list[str], rows: Iterable[tuple]) -> Iterator[str]:
+    """
+    Write rows as CSV text, yielding one chunk per CSV_ROWS_PER_CHUNK rows.
+
+    Args:
+        header: Column titles.
+        rows: Row values.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for number, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if number % CSV_ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def xlsx_cell(value: Any) -> str:
+    """Return the XML of one cell; numbers stay numbers, everything else is text."""
+    if value is None:
+        return '<c/>'
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c><v>{value}</v></c>'
+    if isinstance(value, date):
+        value = value.isoformat()
+    return f'<c t="inlineStr"><is><t>{escape(str(value))}</t></is></c>'
+
+def xlsx_stream(header: list[str], rows: Iterable[tuple], sheet_name: str) -> Iterator[bytes]:
+    """
+    Write rows as a single-sheet XLSX workbook, yielding the file as it grows.
+
+    Cells are inline strings and plain numbers, so the workbook needs no
+    shared string table or styles and memory use does not depend on the
+    number of rows.
+
+    Args:
+        header: Column titles.
+        rows: Row values.
+        sheet_name: Worksheet name.
+    """
+    output = ChunkBuffer()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as workbook:
+        workbook.writestr("[Content_Types].xml", XLSX_CONTENT_TYPES)
+        workbook.writestr("_rels/.rels", XLSX_ROOT_RELS)
+        workbook.writestr("xl/workbook.xml", XLSX_WORKBOOK.format(name=escape(sheet_name)))
+        workbook.writestr("xl/_rels/workbook.xml.rels", XLSX_WORKBOOK_RELS)
+
+        with workbook.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(XLSX_SHEET_START.encode())
+            for number, row in enumerate(chain([header], rows)):
+                sheet.write(f'<row>{"".join(xlsx_cell(value) for value in row)}</row>'.encode())
+                if number % CSV_ROWS_PER_CHUNK == 0:
+                    yield output.take()
+            sheet.write(XLSX_SHEET_END.encode())
+    yield output.take()
+
+def export_response(filename: str, fmt: str, header: list[str], rows: Iterable[tuple]) -> Response:
+    """
+    Stream rows to the client as a CSV or XLSX download.
+
+    The rows are produced while the response is sent, inside the request
+    context, so report queries keep their session until the download ends.
+
+    Args:
+        filename: Download name without extension.
+        fmt: "csv" or "xlsx".
+        header: Column titles.
+        rows: Row values, typically a `yield_per` query result.
+
+    Returns:
+        Response: Streaming attachment response.
+    """
+    if fmt == "csv":
+        body = (chunk.encode("utf-8") for chunk in chain(["\ufeff"], csv_stream(header, rows)))
+    else:
+        body = xlsx_stream(header, rows, filename[:31])
+
+    response = Response(stream_with_context(body), mimetype=EXPORT_FORMATS[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
+
+def stream_rows(statement: Select) -> Iterator[tuple]:
+    """Run a report query and yield its rows in batches of EXPORT_BATCH_SIZE."""
+    result = report_session().execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    try:
+        for row in result:
+            yield tuple(row)
+    finally:
+        result.close()
+
+def replaced_parts_query(client_id: Optional[int], date_from: date, date_to: date, lang: str) -> Select:
+    """
+    Select replaced parts in a date range as flat rows for invoicing.
+
+    Args:
+        client_id: Client to export, or None for all clients.
+        date_from: First day.
+        date_to: Last day.
+        lang: Language of the part names.
+
+    Returns:
+        Select: Date, client, city, serial number, part number, part name,
+        quantity, unit price and warranty flag, ordered by date.
+    """
+    statement = (
+        select(
+            PartsReplaced.date,
+            Client.company,
+            Client.city,
+            Machine.serial_number,
+            Part.part_number,
+            Part.name_en if lang == "en" else Part.name_lt,
+            PartsReplaced.quantity,
+            Part.price,
+            PartsReplaced.warranty,
+        )
+        .join(Machine, PartsReplaced.machine_id == Machine.id)
+        .join(Client, Machine.client_id == Client.id)
+        .join(Part, PartsReplaced.part_id == Part.id)
+        .where(PartsReplaced.date.between(date_from, date_to))
+        .order_by(PartsReplaced.date, PartsReplaced.id)
+    )
+    if client_id:
+        statement = statement.where(Machine.client_id == client_id)
+    return statement
@@ -1,11 +1,28 @@
+from datetime import date
 from flask_wtf import FlaskForm
 from wtforms import (StringField, PasswordField, SubmitField, TelField, EmailField,
                      DateField, IntegerField, SelectField, DecimalField, TextAreaField,
-                     HiddenField, SelectMultipleField, FormField, FieldList)
-from wtforms.validators import DataRequired, Optional, EqualTo
-from wtforms.widgets.core import CheckboxInput, ListWidget
+                     HiddenField, SelectMultipleField, FormField, FieldList, BooleanField)
+from wtforms.validators import DataRequired, Optional, EqualTo, NumberRange
+from wtforms.widgets.core import CheckboxInput, ListWidget, HiddenInput
+from flask_wtf.file import FileField, FileRequired, FileAllowed
 
-from .models import Client, MachineType, Location
+from . import db
+from .models import Client
+from .refdata import locations, machine_types
+
+class ClientField(IntegerField):
+    """Hidden client id filled in by the client typeahead picker."""
+    widget = HiddenInput()
+
+    @property
+    def selected(self) -> Client | None:
+        """
+        Return the currently selected client, used to prefill the picker.
+        """
+        if not isinstance(self.data, int):
+            return None
+        return db.session.get(Client, self.data)
 
 class UserSettingsForm(FlaskForm):
     """Form for updating user account settings, such as password and contact info."""
@@ -48,21 +65,17 @@ class MachineForm(FlaskForm):
     type = SelectField("Machine Type", coerce=int, validators=[DataRequired()])
     start_of_operation = DateField("Start of Operation",validators=[DataRequired()])
     warranty = IntegerField("Years of Warranty", validators=[DataRequired()])
-    client = SelectField("Client", coerce=int, validators=[DataRequired()])
+    client = ClientField("Client", validators=[DataRequired()])
     submit = SubmitField("Submit")
 
     def __init__(self, *args, **kwargs):
         """
-        Initialize MachineForm and populate client and type dropdown with current clients and types.
+        Initialize MachineForm and populate type dropdown with current types.
         """
         super(MachineForm, self).__init__(*args, **kwargs)
         self.type.choices = [
             (type.id, f"{type.name}")
-            for type in MachineType.query.all()]
-
-        self.client.choices = [
-            (client.id, f"{client.company} - {client.city}")
-            for client in Client.query.all()]
+            for type in machine_types()]
 
 class ClientForm(FlaskForm):
     """Form for creating or editing client information."""
@@ -113,54 +126,64 @@ class PartForm(FlaskForm):
         """
         super(PartForm, self).__init__(*args, **kwargs)
         self.machine_types.choices = [(machine_type.id, machine_type.name) for
-                                      machine_type in MachineType.query.all()]
+                                      machine_type in machine_types()]
 
-        locations = Location.query.all()
         if not self.inventory_entries.data:
-            for location in locations:
+            for location in locations():
                 self.inventory_entries.append_entry({
                     'location_id': location.id,
                     'quantity': 0
                 })
 
+class StockTakeForm(FlaskForm):
+    """Form for uploading a stock-take CSV of part quantities per location."""
+    file = FileField("CSV File", validators=[FileRequired(), FileAllowed(["csv"])])
+    submit = SubmitField("Import")
+
+class DataImportForm(FlaskForm):
+    """Form for uploading a CSV of clients, machines or parts."""
+    kind = SelectField("Data", choices=[("clients", "Clients"), ("machines", "Machines"), ("parts", "Parts")])
+    file = FileField("CSV File", validators=[FileRequired(), FileAllowed(["csv"])])
+    dry_run = BooleanField("Dry Run", default=True)
+    submit = SubmitField("Import")
+
 class ReplacedPartForm(FlaskForm):
     """Form for adding a part replacement in a machine."""
     date = DateField("Date", validators=[DataRequired()])
     part_number = StringField("Part Number", validators=[DataRequired()])
-    quantity = IntegerField("Quantity", validators=[DataRequired()])
+    quantity = IntegerField("Quantity", validators=[DataRequired(), NumberRange(min=1)])
     serial_number = StringField("Serial Number", validators=[DataRequired()])
     location = SelectField('Location', validators=[DataRequired()], choices=[])
     submit = SubmitField("Submit")
 
 class PartsReportForm(FlaskForm):
     """Form for generating a report of replaced parts by client and date range."""
-    client = SelectField('Client', coerce=int, validators=[DataRequired()])
+    client = ClientField('Client', validators=[DataRequired()])
     date_from = DateField("Date From", validators=[DataRequired()])
     date_to = DateField("Date To", validators=[DataRequired()])
     submit = SubmitField("Submit")
 
-    def __init__(self, *args, **kwargs):
-        """
-        Initialize PartsReportForm and populate the client dropdown with current clients.
-        """
-        super(PartsReportForm, self).__init__(*args, **kwargs)
-        self.client.choices = [
-            (client.id, f"{client.company} - {client.city}")
-            for client in Client.query.all()]
-
 class ServiceReportForm(FlaskForm):
-    """Form for generating a quaterly service report by client."""
-    client = SelectField('Client', coerce=int, validators=[DataRequired()])
+    """Form for generating a quaterly service report by client and machine type."""
+    client = ClientField('Client', validators=[DataRequired()])
+    machine_type = SelectField("Machine Type", coerce=int, validators=[DataRequired()])
+    year = IntegerField("Year", default=lambda: date.today().year,
+                        validators=[DataRequired(), NumberRange(2000, 2100)])
+    quarter = SelectField("Quarter", coerce=int, choices=[(quarter, str(quarter)) for quarter in range(1, 5)],
+                          default=lambda: (date.today().month - 1) // 3 + 1)
     submit = SubmitField("Submit")
 
     def __init__(self, *args, **kwargs):
         """
-        Initialize ServiceReportForm and populate the client dropdown with current clients.
+        Initialize ServiceReportForm with the current machine types,
+        preselecting BPS C1 when it exists.
         """
         super(ServiceReportForm, self).__init__(*args, **kwargs)
-        self.client.choices = [
-            (client.id, f"{client.company} - {client.city}")
-            for client in Client.query.all()]
+        self.machine_type.choices = [(type.id, type.name) for type in machine_types()]
+        if self.machine_type.data is None:
+            self.machine_type.data = next(
+                (id for id, name in self.machine_type.choices if name == "BPS C1"), None
+            )
 
 class TaskForm(FlaskForm):
     """Form for creating a new task."""
@@ -169,17 +192,7 @@ class TaskForm(FlaskForm):
 
 class VisitForm(FlaskForm):
     """Form for creating or editing visit to a client."""
-    client = SelectField('Client', coerce=int, validators=[DataRequired()])
+    client = ClientField('Client', validators=[DataRequired()])
     date = DateField('Visit Date', validators=[DataRequired()])
     purpose = TextAreaField('Purpose')
     submit = SubmitField('Save')
-
-    def __init__(self, *args, **kwargs):
-        """
-        Initialize VisitForm and populate the client dropdown with current clients.
-        """
-        super(VisitForm, self).__init__(*args, **kwargs)
-        self.client.choices = [
-            (client.id, f"{client.company} - {client.city}")
-            for client in Client.query.all()]
-
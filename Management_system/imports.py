@@ -0,0 +1,422 @@
+import csv
+from datetime import date
+from typing import IO, Any, Callable, Iterable, Iterator, NamedTuple
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import Table, func, select
+from . import db
+from .audit import json_value, record_change
+from .models import Client, Machine, Part, part_machine_types
+from .refdata import locations, machine_types
+from .stock import StockChange, set_stock_levels, stock_changes, stock_levels
+from .utils import retry_on_lock
+
+STOCK_TAKE_COLUMNS = ("part_number", "location", "quantity")
+STOCK_TAKE_BATCH_SIZE = 500
+CLIENT_COLUMNS = ("company", "address", "city", "contact_person", "phone_number", "email")
+MACHINE_COLUMNS = ("serial_number", "machine_type", "client_email", "start_of_operation", "warranty")
+PART_COLUMNS = ("part_number", "name_en", "name_lt", "price", "machine_types")
+INSERT_BATCH_SIZE = 500
+
+
+class ImportIssue(NamedTuple):
+    """Problem found in one line of an imported file."""
+    line: int
+    message: str
+    value: str
+
+
+class StockTakeRow(NamedTuple):
+    """Validated stock-take line."""
+    line: int
+    part_id: int
+    location_id: int
+    quantity: int
+
+
+class DataImport(NamedTuple):
+    """Result of validating, and possibly applying, a client, machine or part file."""
+    rows: list[dict[str, Any]]
+    issues: list[ImportIssue]
+    created: int
+
+
+class StockTake(NamedTuple):
+    """Result of validating, and possibly applying, a stock-take file."""
+    rows: list[StockTakeRow]
+    issues: list[ImportIssue]
+    changes: list[StockChange]
+
+
+def read_csv(stream: IO[str], columns: Iterable[str]) -> Iterator[tuple[int, dict[str, str]]]:
+    """
+    Read CSV records one by one, with header names in lower case.
+
+    Args:
+        stream: Text stream of the uploaded file.
+        columns: Columns the header must contain.
+
+    Yields:
+        tuple: Line number and the record's stripped values by column name.
+
+    Raises:
+        ValueError: If a required column is missing from the header.
+    """
+    reader = csv.reader(stream)
+    header = [name.strip().lower() for name in next(reader, [])]
+    missing = [column for column in columns if column not in header]
+    if missing:
+        raise ValueError(", ".join(missing))
+
+    for record in reader:
+        if not any(value.strip() for value in record):
+            continue
+        yield reader.line_num, {name: value.strip() for name, value in zip(header, record)}
+
+def read_records(stream: IO[str], columns: Iterable[str], issues: list[ImportIssue]) -> Iterator[tuple[int, dict[str, str]]]:
+    """
+    Read CSV records like `read_csv`, reporting an unusable file as an issue.
+
+    Args:
+        stream: Text stream of the uploaded file.
+        columns: Columns the header must contain.
+        issues: List the header or decoding problem is appended to.
+
+    Yields:
+        tuple: Line number and the record's values by column name.
+    """
+    line = 1
+    try:
+        for line, record in read_csv(stream, columns):
+            yield line, record
+    except ValueError as error:
+        issues.append(ImportIssue(1, "import_missing_columns", str(error)))
+    except (csv.Error, UnicodeDecodeError) as error:
+        issues.append(ImportIssue(line + 1, "import_unreadable_file", str(error)))
+
+def location_index() -> dict[str, int]:
+    """Return location ids by id, English and Lithuanian name (case insensitive)."""
+    index = {}
+    for location in locations():
+        index[str(location.id)] = location.id
+        index[location.location_en.casefold()] = location.id
+        index[location.location_lt.casefold()] = location.id
+    return index
+
+def validate_stock_take(stream: IO[str]) -> StockTake:
+    """
+    Validate a stock-take CSV with `part_number`, `location` and `quantity` columns.
+
+    The file is streamed line by line. Part numbers and locations are
+    resolved from in-memory indexes built with one query each, so validation
+    does not query the database per line.
+
+    Args:
+        stream: Text stream of the CSV file.
+
+    Returns:
+        StockTake: Valid rows and the issues found; no changes yet.
+    """
+    parts = dict(db.session.execute(select(Part.part_number, Part.id)).all())
+    places = location_index()
+    rows = []
+    issues = []
+    seen = {}
+
+    for line, record in read_records(stream, STOCK_TAKE_COLUMNS, issues):
+        part_id = parts.get(record["part_number"])
+        location_id = places.get(record["location"].casefold())
+        quantity = record["quantity"]
+
+        if part_id is None:
+            issues.append(ImportIssue(line, "import_unknown_part", record["part_number"]))
+        if location_id is None:
+            issues.append(ImportIssue(line, "import_unknown_location", record["location"]))
+        if not quantity.isdecimal():
+            issues.append(ImportIssue(line, "import_invalid_quantity", quantity))
+        if part_id is None or location_id is None or not quantity.isdecimal():
+            continue
+
+        key = (part_id, location_id)
+        if key in seen:
+            issues.append(ImportIssue(line, "import_duplicate_row", str(seen[key])))
+            continue
+        seen[key] = line
+        rows.append(StockTakeRow(line, part_id, location_id, int(quantity)))
+
+    return StockTake(rows, issues, [])
+
+@retry_on_lock
+def apply_stock_batch(rows: list[StockTakeRow]) -> list[StockChange]:
+    """
+    Write one batch of stock-take rows in its own transaction.
+
+    Args:
+        rows: Validated rows.
+
+    Returns:
+        list: Quantities that changed.
+    """
+    current = stock_levels({row.part_id for row in rows})
+    changes = stock_changes(current, {(row.part_id, row.location_id): row.quantity for row in rows})
+    set_stock_levels(changes)
+    db.session.commit()
+    return changes
+
+def import_stock_take(stream: IO[str], batch_size: int = STOCK_TAKE_BATCH_SIZE) -> StockTake:
+    """
+    Validate a stock-take CSV and, if every line is valid, apply it.
+
+    Rows are written in transactions of `batch_size` rows, each reading the
+    stored quantities with one query and writing the changes with one upsert.
+    Nothing is written when any line has an issue.
+
+    Args:
+        stream: Text stream of the CSV file.
+        batch_size: Rows per transaction.
+
+    Returns:
+        StockTake: Rows, issues and the applied changes.
+    """
+    result = validate_stock_take(stream)
+    if result.issues:
+        return result
+
+    changes = []
+    for start in range(0, len(result.rows), batch_size):
+        changes.extend(apply_stock_batch(result.rows[start:start + batch_size]))
+    return result._replace(changes=changes)
+
+def missing_values(line: int, record: dict[str, str], columns: Iterable[str]) -> list[ImportIssue]:
+    """Return an issue for every required column left empty."""
+    return [ImportIssue(line, "import_missing_value", column) for column in columns if not record.get(column)]
+
+def validate_clients(stream: IO[str]) -> DataImport:
+    """
+    Validate a client CSV against the stored clients and itself.
+
+    Phone numbers and emails (case insensitive) must be unique; both are
+    checked against key sets loaded with one query.
+
+    Args:
+        stream: Text stream of the CSV file.
+
+    Returns:
+        DataImport: Client rows ready to insert and the issues found.
+    """
+    # Line where each key was first seen; 0 marks keys already stored.
+    phones = {phone: 0 for phone, in db.session.execute(select(Client.phone_number))}
+    emails = {email: 0 for email, in db.session.execute(select(func.lower(Client.email)))}
+    rows = []
+    issues = []
+
+    for line, record in read_records(stream, CLIENT_COLUMNS, issues):
+        problems = missing_values(line, record, CLIENT_COLUMNS)
+        for value, taken in ((record["phone_number"], phones), (record["email"].lower(), emails)):
+            if not value:
+                continue
+            if value in taken:
+                message = "import_duplicate_value" if taken[value] else "import_client_exists"
+                problems.append(ImportIssue(line, message, value))
+            else:
+                taken[value] = line
+
+        issues.extend(problems)
+        if not problems:
+            rows.append({column: record[column] for column in CLIENT_COLUMNS})
+
+    return DataImport(rows, issues, 0)
+
+def validate_machines(stream: IO[str]) -> DataImport:
+    """
+    Validate a machine CSV.
+
+    Machines are linked to an existing client by `client_email` and to a
+    machine type by name. Serial numbers must be new. `start_of_operation`
+    is an ISO date and `warranty` the years of warranty.
+
+    Args:
+        stream: Text stream of the CSV file.
+
+    Returns:
+        DataImport: Machine rows ready to insert and the issues found.
+    """
+    serials = {serial: 0 for serial, in db.session.execute(select(Machine.serial_number))}
+    clients = dict(db.session.execute(select(func.lower(Client.email), Client.id)).all())
+    types = {machine_type.name.casefold(): machine_type.id for machine_type in machine_types()}
+    rows = []
+    issues = []
+
+    for line, record in read_records(stream, MACHINE_COLUMNS, issues):
+        problems = missing_values(line, record, MACHINE_COLUMNS)
+        serial_number = record["serial_number"]
+        client_id = clients.get(record["client_email"].lower())
+        machine_type_id = types.get(record["machine_type"].casefold())
+
+        if serial_number in serials:
+            message = "import_duplicate_value" if serials[serial_number] else "import_machine_exists"
+            problems.append(ImportIssue(line, message, serial_number))
+        elif serial_number:
+            serials[serial_number] = line
+        if record["client_email"] and client_id is None:
+            problems.append(ImportIssue(line, "import_unknown_client", record["client_email"]))
+        if record["machine_type"] and machine_type_id is None:
+            problems.append(ImportIssue(line, "import_unknown_machine_type", record["machine_type"]))
+        try:
+            start_of_operation = date.fromisoformat(record["start_of_operation"])
+        except ValueError:
+            if record["start_of_operation"]:
+                problems.append(ImportIssue(line, "import_invalid_date", record["start_of_operation"]))
+        if record["warranty"] and not record["warranty"].isdecimal():
+            problems.append(ImportIssue(line, "import_invalid_number", record["warranty"]))
+
+        issues.extend(problems)
+        if not problems:
+            rows.append({
+                "serial_number": serial_number,
+                "machine_type_id": machine_type_id,
+                "client_id": client_id,
+                "start_of_operation": start_of_operation,
+                "end_of_warranty": start_of_operation + relativedelta(years=int(record["warranty"])),
+                "is_active": True,
+            })
+
+    return DataImport(rows, issues, 0)
+
+def validate_parts(stream: IO[str]) -> DataImport:
+    """
+    Validate a part CSV.
+
+    `machine_types` lists the compatible machine type names separated by
+    semicolons. Part numbers must be new and prices 0 or more.
+
+    Args:
+        stream: Text stream of the CSV file.
+
+    Returns:
+        DataImport: Part rows ready to insert, with a `machine_type_ids`
+        list each, and the issues found.
+    """
+    numbers = {number: 0 for number, in db.session.execute(select(Part.part_number))}
+    types = {machine_type.name.casefold(): machine_type.id for machine_type in machine_types()}
+    rows = []
+    issues = []
+
+    for line, record in read_records(stream, PART_COLUMNS, issues):
+        problems = missing_values(line, record, PART_COLUMNS)
+        part_number = record["part_number"]
+
+        if part_number in numbers:
+            message = "import_duplicate_value" if numbers[part_number] else "import_part_exists"
+            problems.append(ImportIssue(line, message, part_number))
+        elif part_number:
+            numbers[part_number] = line
+        try:
+            price = float(record["price"])
+            if not price >= 0:
+                raise ValueError
+        except ValueError:
+            if record["price"]:
+                problems.append(ImportIssue(line, "import_invalid_number", record["price"]))
+
+        type_ids = []
+        for name in filter(None, (name.strip() for name in record["machine_types"].split(";"))):
+            if name.casefold() in types:
+                type_ids.append(types[name.casefold()])
+            else:
+                problems.append(ImportIssue(line, "import_unknown_machine_type", name))
+
+        issues.extend(problems)
+        if not problems:
+            rows.append({
+                "part_number": part_number,
+                "name_en": record["name_en"],
+                "name_lt": record["name_lt"],
+                "price": price,
+                "machine_type_ids": type_ids,
+            })
+
+    return DataImport(rows, issues, 0)
+
+def insert_rows(table: Table, rows: list[dict[str, Any]], key: str, batch_size: int = INSERT_BATCH_SIZE) -> dict[Any, int]:
+    """
+    Insert rows with executemany batches and audit each created row.
+
+    Args:
+        table: Table to insert into.
+        rows: Column values.
+        key: Unique column identifying the rows.
+        batch_size: Rows per INSERT execution.
+
+    Returns:
+        dict: New primary keys by `key` value.
+    """
+    ids = {}
+    statement = table.insert().returning(table.c.id, table.c[key])
+    for start in range(0, len(rows), batch_size):
+        ids.update((value, row_id) for row_id, value in db.session.execute(statement, rows[start:start + batch_size]))
+
+    for row in rows:
+        record_change(
+            table.name, ids[row[key]], "create", None,
+            {"id": ids[row[key]], **{column: json_value(value) for column, value in row.items()}}
+        )
+    return ids
+
+def insert_clients(rows: list[dict[str, Any]]) -> None:
+    """Insert validated client rows."""
+    insert_rows(Client.__table__, rows, "phone_number")
+
+def insert_machines(rows: list[dict[str, Any]]) -> None:
+    """Insert validated machine rows."""
+    insert_rows(Machine.__table__, rows, "serial_number")
+
+def insert_parts(rows: list[dict[str, Any]]) -> None:
+    """Insert validated part rows and their machine type compatibility."""
+    ids = insert_rows(
+        Part.__table__,
+        [{key: value for key, value in row.items() if key != "machine_type_ids"} for row in rows],
+        "part_number"
+    )
+    links = [
+        {"part_id": ids[row["part_number"]], "machine_type_id": machine_type_id}
+        for row in rows
+        for machine_type_id in row["machine_type_ids"]
+    ]
+    for start in range(0, len(links), INSERT_BATCH_SIZE):
+        db.session.execute(part_machine_types.insert(), links[start:start + INSERT_BATCH_SIZE])
+
+IMPORTERS: dict[str, tuple[Callable[[IO[str]], DataImport], Callable[[list[dict[str, Any]]], None]]] = {
+    "clients": (validate_clients, insert_clients),
+    "machines": (validate_machines, insert_machines),
+    "parts": (validate_parts, insert_parts),
+}
+
+@retry_on_lock
+def write_import(kind: str, rows: list[dict[str, Any]]) -> None:
+    """Insert validated rows of one kind in a single transaction."""
+    IMPORTERS[kind][1](rows)
+    db.session.commit()
+
+def import_data(kind: str, stream: IO[str], dry_run: bool = False) -> DataImport:
+    """
+    Validate a client, machine or part CSV and, unless it is a dry run, import it.
+
+    The file is imported all or nothing: any issue, including a conflict with
+    stored data, leaves the database untouched. A dry run only reports what
+    would be created and the conflicts found.
+
+    Args:
+        kind: "clients", "machines" or "parts".
+        stream: Text stream of the CSV file.
+        dry_run: Validate without writing.
+
+    Returns:
+        DataImport: Valid rows, issues and the number of created rows.
+    """
+    validate, _ = IMPORTERS[kind]
+    result = validate(stream)
+    if result.issues or dry_run or not result.rows:
+        return result
+
+    write_import(kind, result.rows)
+    return result._replace(created=len(result.rows))
@@ -1,19 +1,71 @@
 import json, os
-from typing import Dict
+from threading import Lock
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
-def get_translations(lang: str = 'en') -> Dict[str, str]:
+TRANSLATIONS_PATH = os.path.join(os.path.dirname(__file__), 'locales', 'translations.json')
+
+
+class TranslationCatalog:
+    """
+    Process-wide cache of the translations file compiled into per-language mappings.
+
+    The file is parsed once and re-read only when its modification time changes.
     """
-    Load translations for the specified language from a JSON file.
+    def __init__(self, path: str = TRANSLATIONS_PATH) -> None:
+        self.path = path
+        self._lock = Lock()
+        self._mtime: Optional[float] = None
+        self._languages: Dict[str, Mapping[str, str]] = {}
+        self._fallback: Mapping[str, str] = MappingProxyType({})
+
+    def _compile(self) -> None:
+        """
+        Parse the translations file and build an immutable mapping for every language in it.
+        """
+        mtime = os.stat(self.path).st_mtime
+        with open(self.path, encoding='utf-8') as f:
+            full_dict: Dict[str, Dict[str, str]] = json.load(f)
+
+        languages = {lang for value in full_dict.values() for lang in value}
+        self._languages = {
+            lang: MappingProxyType({key: value.get(lang, key) for key, value in full_dict.items()})
+            for lang in languages
+        }
+        self._fallback = MappingProxyType({key: key for key in full_dict})
+        self._mtime = mtime
+
+    def get(self, lang: str = 'en') -> Mapping[str, str]:
+        """
+        Return the translations for a language, recompiling the catalog if the file changed.
+
+        Args:
+            lang (str): Language code (e.g., 'en', 'lt').
+
+        Returns:
+            Mapping[str, str]: Read-only mapping of translation keys to localized strings.
+                               Unknown languages map every key to itself.
+        """
+        mtime = os.stat(self.path).st_mtime
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._compile()
+
+        return self._languages.get(lang, self._fallback)
+
+
+catalog = TranslationCatalog()
+
+def get_translations(lang: str = 'en') -> Mapping[str, str]:
+    """
+    Load translations for the specified language from the compiled catalog.
 
     Args:
         lang (str): Language code to load (e.g., 'en', 'lt'). Defaults to 'en'.
 
     Returns:
-        Dict[str, str]: A dictionary mapping translation keys to localized strings.
-                        Falls back to the key itself if no translation is found.
+        Mapping[str, str]: A read-only mapping of translation keys to localized strings.
+                           Falls back to the key itself if no translation is found.
     """
-    path = os.path.join(os.path.dirname(__file__),'locales', 'translations.json')
-    with open(path, encoding='utf-8') as f:
-        full_dict: Dict[str, Dict[str, str]] = json.load(f)
-
-    return {key: value.get(lang, key) for key, value in full_dict.items()}
+    return catalog.get(lang)
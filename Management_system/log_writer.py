@@ -0,0 +1,221 @@
+import atexit
+import glob
+import gzip
+import logging
+import os
+import shutil
+from datetime import datetime
+from logging.handlers import QueueHandler
+from queue import Empty, SimpleQueue
+from threading import Lock, Thread
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, single process only
+    fcntl = None
+
+BATCH_SIZE = 1000
+
+
+class RotatingLogFile:
+    """
+    Log file shared by all processes on a node.
+
+    Every batch is appended with one write while holding an exclusive lock on
+    `<path>.lock`, so lines from different processes never interleave. The file
+    is rotated when it would exceed `max_bytes` or was last written on an
+    earlier day; rotated files are gzip-compressed and only the newest
+    `backup_count` are kept.
+    """
+    def __init__(self, path: str, max_bytes: int, backup_count: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+    def append(self, lines: list[str]) -> None:
+        """
+        Append lines to the file, rotating it first when needed.
+
+        Args:
+            lines: Formatted log lines without trailing newlines.
+        """
+        data = "".join(f"{line}\n" for line in lines).encode("utf-8")
+        rotated = None
+
+        with open(f"{self.path}.lock", "a") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            if self.should_rotate(len(data)):
+                rotated = self.rotate()
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+        if rotated:
+            self.compress(rotated)
+            self.prune()
+
+    def should_rotate(self, incoming: int) -> bool:
+        """Return True if the file is too big or was last written before today."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        if stat.st_size == 0:
+            return False
+        if stat.st_size + incoming > self.max_bytes:
+            return True
+        return datetime.fromtimestamp(stat.st_mtime).date() < datetime.now().date()
+
+    def rotate(self) -> str:
+        """Rename the current file aside and return the new name."""
+        rotated = f"{self.path}.{datetime.now():%Y%m%d-%H%M%S-%f}"
+        os.replace(self.path, rotated)
+        return rotated
+
+    def compress(self, path: str) -> None:
+        """Gzip a rotated file and remove the uncompressed copy."""
+        with open(path, "rb") as source, gzip.open(f"{path}.gz.tmp", "wb") as target:
+            shutil.copyfileobj(source, target)
+        os.replace(f"{path}.gz.tmp", f"{path}.gz")
+        os.remove(path)
+
+    def prune(self) -> None:
+        """Delete the oldest compressed files beyond `backup_count`."""
+        backups = sorted(glob.glob(f"{glob.escape(self.path)}.*.gz"))
+        for path in backups[:max(len(backups) - self.backup_count, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class QueueFileHandler(QueueHandler):
+    """
+    Queue handler that puts only the logger name and the formatted line on the
+    queue, avoiding the record copy made by QueueHandler.
+    """
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.enqueue((record.name, self.format(record)))
+        except Exception:
+            self.handleError(record)
+
+
+class LogWriter:
+    """
+    Background writer for file logs.
+
+    Loggers get a QueueHandler, so logging on a request thread only formats the
+    record and puts it on a queue. One writer thread per process drains the
+    queue and appends each file's records as a single batch.
+    """
+    def __init__(self, max_bytes: int, backup_count: int) -> None:
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.queue: SimpleQueue = SimpleQueue()
+        self.files: dict[str, RotatingLogFile] = {}
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+
+    def add_logger(self, logger: logging.Logger, path: str, formatter: logging.Formatter) -> None:
+        """
+        Route a logger's records to a file through the queue.
+
+        Args:
+            logger: Logger to attach the queue handler to.
+            path: Log file path.
+            formatter: Formatter applied on the logging thread.
+        """
+        self.files[logger.name] = RotatingLogFile(path, self.max_bytes, self.backup_count)
+        handler = QueueFileHandler(self.queue)
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+    def start(self) -> None:
+        """Start the writer thread if it is not running."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        """Write all queued records and stop the writer thread."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self.queue.put(None)
+                self._thread.join()
+            self._thread = None
+
+    def flush(self) -> None:
+        """Write all queued records."""
+        self.stop()
+        self.start()
+
+    def after_fork(self) -> None:
+        """
+        Start a fresh writer in a forked child; threads do not survive fork.
+
+        Records queued before the fork are dropped, the parent writes them.
+        """
+        while True:
+            try:
+                self.queue.get_nowait()
+            except Empty:
+                break
+        self._lock = Lock()
+        self._thread = None
+        self.start()
+
+    def write(self, records: list[tuple[str, str]]) -> None:
+        """
+        Append records to their files, one write per file.
+
+        Args:
+            records: (logger name, formatted line) pairs from the queue handlers.
+        """
+        batches: dict[str, list[str]] = {}
+        for name, line in records:
+            batches.setdefault(name, []).append(line)
+
+        for name, lines in batches.items():
+            try:
+                self.files[name].append(lines)
+            except Exception:
+                logging.lastResort.handle(logging.makeLogRecord(
+                    {"msg": f"Log writer failed for {name}", "levelno": logging.ERROR}
+                ))
+
+    def _run(self) -> None:
+        while True:
+            record = self.queue.get()
+            records = []
+            while record is not None:
+                records.append(record)
+                if len(records) >= BATCH_SIZE:
+                    break
+                try:
+                    record = self.queue.get_nowait()
+                except Empty:
+                    break
+
+            if records:
+                self.write(records)
+            if record is None:
+                return
+
+
+def start_log_writer(writer: LogWriter) -> None:
+    """
+    Start the writer and keep it running across process forks and exit.
+
+    Args:
+        writer: The writer to start.
+    """
+    writer.start()
+    atexit.register(writer.stop)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=writer.after_fork)
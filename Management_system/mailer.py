@@ -0,0 +1,224 @@
+from datetime import datetime, timedelta
+from smtplib import SMTPServerDisconnected
+from threading import Event, Lock, Thread
+from typing import Optional
+from flask import Flask
+from flask_mail import Message
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from . import app, db, mail
+from .models import OutboxMessage
+from .utils import log_mail_sender, mail_logger
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 60
+CLAIM_SECONDS = 300
+
+
+def enqueue_email(subject: str, recipients: list[str], html: str) -> OutboxMessage:
+    """
+    Add an email to the outbox for background delivery.
+
+    The message is only added to the session, so it is committed together
+    with the caller's changes; the mail worker is woken up once it is.
+
+    Args:
+        subject: Email subject.
+        recipients: Email addresses.
+        html: HTML content of the email.
+
+    Returns:
+        OutboxMessage: The pending outbox row.
+    """
+    now = datetime.now()
+    message = OutboxMessage(
+        subject=subject,
+        recipients=",".join(recipients),
+        html=html,
+        created_at=now,
+        next_attempt_at=now
+    )
+    db.session.add(message)
+    db.session.info["mail_queued"] = True
+    return message
+
+def retry_delay(attempts: int) -> timedelta:
+    """
+    Return the exponential backoff before the next delivery attempt.
+
+    Args:
+        attempts: Failed attempts so far (at least 1).
+    """
+    return timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+def claim_messages(now: datetime, limit: int) -> list[OutboxMessage]:
+    """
+    Claim due outbox messages for delivery by this process.
+
+    A message is claimed by moving its next attempt time forward with a
+    conditional update, so concurrent workers never send the same message. If
+    the worker dies mid-batch, the claim expires after CLAIM_SECONDS.
+
+    Args:
+        now: Current time.
+        limit: Maximum number of messages.
+
+    Returns:
+        list: Claimed messages, oldest first.
+    """
+    due = (
+        db.session.query(OutboxMessage.id, OutboxMessage.next_attempt_at)
+        .filter(OutboxMessage.status == "pending", OutboxMessage.next_attempt_at <= now)
+        .order_by(OutboxMessage.next_attempt_at, OutboxMessage.id)
+        .limit(limit)
+        .all()
+    )
+
+    lease = now + timedelta(seconds=CLAIM_SECONDS)
+    claimed = []
+    for message_id, next_attempt_at in due:
+        result = db.session.execute(
+            update(OutboxMessage)
+            .where(
+                OutboxMessage.id == message_id,
+                OutboxMessage.status == "pending",
+                OutboxMessage.next_attempt_at == next_attempt_at
+            )
+            .values(next_attempt_at=lease)
+        )
+        if result.rowcount:
+            claimed.append(message_id)
+    db.session.commit()
+
+    if not claimed:
+        return []
+    return OutboxMessage.query.filter(OutboxMessage.id.in_(claimed)).order_by(OutboxMessage.id).all()
+
+def mark_sent(message: OutboxMessage, now: datetime) -> None:
+    """Record a successful delivery."""
+    message.status = "sent"
+    message.sent_at = now
+    message.attempts += 1
+    message.last_error = None
+    log_mail_sender(message.recipient_list, message.subject, "Sent")
+
+def mark_failed(message: OutboxMessage, error: Exception, now: datetime) -> None:
+    """Record a failed delivery attempt and schedule a retry or give up."""
+    message.attempts += 1
+    message.last_error = str(error)
+    if message.attempts >= MAX_ATTEMPTS:
+        message.status = "failed"
+        status = f"Failed to send after {message.attempts} attempts: {error}"
+    else:
+        message.next_attempt_at = now + retry_delay(message.attempts)
+        status = f"Attempt {message.attempts} failed, retrying at {message.next_attempt_at:%Y-%m-%d %H:%M:%S}: {error}"
+    log_mail_sender(message.recipient_list, message.subject, status)
+
+def deliver_pending(limit: int = BATCH_SIZE, now: Optional[datetime] = None) -> int:
+    """
+    Send one batch of due outbox messages over a single SMTP connection.
+
+    A message that fails is rescheduled with exponential backoff and marked
+    failed after MAX_ATTEMPTS. If the connection cannot be opened or drops,
+    the rest of the batch is rescheduled the same way.
+
+    Args:
+        limit: Maximum number of messages in the batch.
+        now: Current time, defaults to now.
+
+    Returns:
+        int: Number of messages processed (sent or rescheduled).
+    """
+    now = now or datetime.now()
+    messages = claim_messages(now, limit)
+    if not messages:
+        return 0
+
+    remaining = list(messages)
+    try:
+        with mail.connect() as connection:
+            while remaining:
+                message = remaining[0]
+                email = Message(subject=message.subject, recipients=message.recipient_list)
+                email.html = message.html
+                try:
+                    connection.send(email)
+                    mark_sent(message, now)
+                except SMTPServerDisconnected:
+                    raise
+                except Exception as error:
+                    mark_failed(message, error, now)
+                remaining.pop(0)
+                db.session.commit()
+    except Exception as error:
+        for message in remaining:
+            mark_failed(message, error, now)
+        db.session.commit()
+
+    return len(messages)
+
+
+class MailWorker:
+    """
+    Background thread delivering the mail outbox.
+
+    The thread wakes up when a message is queued and otherwise polls every
+    `MAIL_WORKER_INTERVAL` seconds to pick up retries. It only runs when the
+    `MAIL_WORKER` setting is enabled.
+    """
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self._wake = Event()
+        self._stop = Event()
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> None:
+        """Start the worker thread if it is enabled and not running."""
+        if not self.app.config["MAIL_WORKER"]:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = Thread(target=self._run, name="mail-worker", daemon=True)
+                self._thread.start()
+
+    def notify(self) -> None:
+        """Wake the worker up to deliver newly queued messages."""
+        self.start()
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker thread and wait for it to finish."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                with self.app.app_context():
+                    while not self._stop.is_set() and deliver_pending() == BATCH_SIZE:
+                        pass
+            except Exception:
+                mail_logger.exception("Mail worker error")
+            self._wake.wait(self.app.config["MAIL_WORKER_INTERVAL"])
+
+
+mail_worker = MailWorker(app)
+
+@event.listens_for(db.session, "after_commit")
+def wake_mail_worker(session: Session) -> None:
+    """Let the mail worker deliver messages once they are committed."""
+    if session.info.pop("mail_queued", False):
+        mail_worker.notify()
+
+@event.listens_for(db.session, "after_rollback")
+def forget_queued_mail(session: Session) -> None:
+    """Drop the pending wake-up of a rolled back transaction."""
+    session.info.pop("mail_queued", None)
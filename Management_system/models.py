@@ -1,16 +1,15 @@
-from flask import redirect, Response
-from flask_admin import BaseView, expose
-from flask_login import UserMixin, current_user
+from flask_login import UserMixin
 from typing import Optional
-from . import db, login_manager, admin, lang_url_for
-from sqlalchemy.orm import configure_mappers
-from flask_admin.contrib.sqla import ModelView
+from . import db, login_manager
 from datetime import datetime
 
 
 class Client(db.Model):
     """Represents a client company with associated machines and visits."""
     __tablename__ = "clients"
+    __table_args__ = (
+        db.Index("ix_clients_company", "company"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, index=True)
     company = db.Column(db.String, nullable=False)
@@ -29,6 +28,10 @@ class Client(db.Model):
 class Machine(db.Model):
     """Represents a machine owned by a client."""
     __tablename__ = "machines"
+    __table_args__ = (
+        db.Index("ix_machines_client_id", "client_id"),
+        db.Index("ix_machines_machine_type_id", "machine_type_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, index=True)
     serial_number = db.Column(db.String, unique=True, nullable=False)
@@ -43,6 +46,7 @@ class Machine(db.Model):
     services = db.relationship("Service", back_populates="machine")
     parts_replaced = db.relationship("PartsReplaced", back_populates="machine")
     debts = db.relationship("Debt", back_populates="machine")
+    summary = db.relationship("MachineSummary", uselist=False, viewonly=True)
 
     def __str__(self) -> str:
         return self.serial_number
@@ -50,6 +54,10 @@ class Machine(db.Model):
 class Service(db.Model):
     """Represents a service record for a machine."""
     __tablename__ = "services"
+    __table_args__ = (
+        db.Index("ix_services_machine_id_date", "machine_id", "date"),
+        db.Index("ix_services_date_user_id", "date", "user_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, index=True)
     date = db.Column(db.Date, nullable=False)
@@ -85,6 +93,10 @@ class User(UserMixin, db.Model):
 class PartsReplaced(db.Model):
     """Tracks parts replaced during service of a machine."""
     __tablename__ = "parts_replaced"
+    __table_args__ = (
+        db.Index("ix_parts_replaced_machine_id_date", "machine_id", "date"),
+        db.Index("ix_parts_replaced_date", "date"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, index=True)
     date = db.Column(db.Date, nullable=False)
@@ -128,6 +140,9 @@ class Part(db.Model):
 class Inventory(db.Model):
     """Tracks the quantity of parts stored at specific locations."""
     __tablename__ = "inventory"
+    __table_args__ = (
+        db.Index("uq_inventory_part_id_location_id", "part_id", "location_id", unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True, index=True)
     part_id = db.Column(db.Integer, db.ForeignKey("parts.id"), nullable=False)
@@ -181,6 +196,9 @@ class MachineType(db.Model):
 class Task(db.Model):
     """Represents a task assigned by a user."""
     __tablename__ = "tasks"
+    __table_args__ = (
+        db.Index("ix_tasks_is_completed_created_at", "is_completed", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     task = db.Column(db.String, nullable=False)
@@ -196,6 +214,9 @@ class Task(db.Model):
 class Visit(db.Model):
     """Represents a client visit record."""
     __tablename__ = "visits"
+    __table_args__ = (
+        db.Index("ix_visits_client_id_date", "client_id", "date"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     client_id = db.Column(db.Integer, db.ForeignKey("clients.id"), nullable=False)
@@ -216,105 +237,111 @@ class OneTimeLink(db.Model):
     expires_at = db.Column(db.DateTime, nullable=True)
     email = db.Column(db.Integer, nullable=False)
 
+class OutboxMessage(db.Model):
+    """Stores an email waiting for, or done with, background delivery."""
+    __tablename__ = "mail_outbox"
+    __table_args__ = (
+        db.Index("ix_mail_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String, nullable=False)
+    recipients = db.Column(db.Text, nullable=False)
+    html = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String, nullable=False, default="pending")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, nullable=False)
+    sent_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+
+    @property
+    def recipient_list(self) -> list[str]:
+        return self.recipients.split(",")
+
+class AuditEntry(db.Model):
+    """Append-only record of one change to a database row."""
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        db.Index("ix_audit_log_entity_type_entity_id_created_at", "entity_type", "entity_id", "created_at"),
+        db.Index("ix_audit_log_entity_type_created_at", "entity_type", "created_at"),
+        db.Index("ix_audit_log_created_at", "created_at"),
+        db.Index("ix_audit_log_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    action = db.Column(db.String, nullable=False)
+    entity_type = db.Column(db.String, nullable=False)
+    entity_id = db.Column(db.Integer, nullable=True)
+    before = db.Column(db.JSON, nullable=True)
+    after = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+
+    user = db.relationship("User")
+
+class DataVersion(db.Model):
+    """Counter bumped whenever a group of cached tables changes."""
+    __tablename__ = "data_versions"
+
+    name = db.Column(db.String, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class MachineSummary(db.Model):
+    """
+    Denormalized service and parts totals of a machine.
+
+    Kept up to date in the same transaction as the services and part
+    replacements it summarizes; machines without either have no row.
+    """
+    __tablename__ = "machine_summary"
+
+    machine_id = db.Column(db.Integer, db.ForeignKey("machines.id", ondelete="CASCADE"), primary_key=True)
+    last_service_id = db.Column(db.Integer, db.ForeignKey("services.id", ondelete="SET NULL"), nullable=True)
+    last_service_date = db.Column(db.Date, nullable=True)
+    last_bn_count = db.Column(db.Integer, nullable=True)
+    service_count = db.Column(db.Integer, nullable=False, default=0)
+    parts_cost = db.Column(db.Float, nullable=False, default=0)
+
+class MonthlyUserServices(db.Model):
+    """Services done per engineer and month; user_id 0 counts services without an engineer."""
+    __tablename__ = "monthly_user_services"
+
+    month = db.Column(db.Date, primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True)
+    services = db.Column(db.Integer, nullable=False, default=0)
+
+class MonthlyMachineTypeActivity(db.Model):
+    """Services and replaced parts per machine type and month."""
+    __tablename__ = "monthly_machine_type_activity"
+
+    month = db.Column(db.Date, primary_key=True)
+    machine_type_id = db.Column(db.Integer, primary_key=True)
+    services = db.Column(db.Integer, nullable=False, default=0)
+    parts_quantity = db.Column(db.Integer, nullable=False, default=0)
+    parts_cost = db.Column(db.Float, nullable=False, default=0)
+
+class MonthlyClientActivity(db.Model):
+    """Services and replaced parts per client and month."""
+    __tablename__ = "monthly_client_activity"
+
+    month = db.Column(db.Date, primary_key=True)
+    client_id = db.Column(db.Integer, primary_key=True)
+    services = db.Column(db.Integer, nullable=False, default=0)
+    parts_quantity = db.Column(db.Integer, nullable=False, default=0)
+    parts_cost = db.Column(db.Float, nullable=False, default=0)
+
+class MonthlyPartUsage(db.Model):
+    """Replaced quantity and cost per part, warranty flag and month."""
+    __tablename__ = "monthly_part_usage"
+
+    month = db.Column(db.Date, primary_key=True)
+    part_id = db.Column(db.Integer, primary_key=True)
+    warranty = db.Column(db.Boolean, primary_key=True)
+    quantity = db.Column(db.Integer, nullable=False, default=0)
+    cost = db.Column(db.Float, nullable=False, default=0)
+
 @login_manager.user_loader
 def load_user(user_id: str) -> Optional[User]:
     """Loads a user from the database using the user ID stored in session."""
     return db.session.get(User, int(user_id))
-
-class AdminModelView(ModelView):
-    """Base admin view that restricts access not authenticated users."""
-    def is_accessible(self) -> bool:
-        """
-        Determine if the current user has access to the admin view.
-
-        Returns:
-            bool: True if user is authenticated and an admin, False otherwise.
-        """
-        user = current_user
-        return user.is_authenticated and user.is_admin
-
-class RedirectHomeView(BaseView):
-    """Custom admin view that redirects to the index page."""
-    @expose('/')
-    def index(self) -> Response:
-        """
-        Redirect to the localized index route.
-
-        Returns:
-            Response: A Flask redirect response to the index page.
-        """
-        return redirect(lang_url_for('index'))
-
-    def is_accessible(self) -> bool:
-        """
-        Determine if the current user can access the redirect view.
-
-        Returns:
-            bool: True if user is authenticated and an admin, False otherwise.
-        """
-        user = current_user
-        return user.is_authenticated and user.is_admin
-    
-class UserAdminView(AdminModelView):
-    """Admin view configuration of fields"""
-    form_columns = [
-        'name',
-        'surname',
-        'phone_number',
-        'email',
-        'password',
-        'is_admin',
-        'is_active',
-        'is_verified'
-    ]
-
-class MachineAdminView(AdminModelView):
-    """Admin view configuration of fields"""
-    form_columns = [
-        'client',
-        'machine_type',
-        'serial_number',
-        'start_of_operation',
-        'end_of_warranty',
-        'is_active'
-    ]
-
-class ClientAdminView(AdminModelView):
-    """Admin view configuration of fields"""
-    form_columns = [
-        'company',
-        'address',
-        'city',
-        'contact_person',
-        'phone_number',
-        'email'
-    ]
-
-class PartAdminView(AdminModelView):
-    """Admin view configuration of fields"""
-    form_columns = [
-        'part_number',
-        'name_en',
-        'name_lt',
-        'price'
-    ]
-
-class LocationAdminView(AdminModelView):
-    """Admin view configuration of fields"""
-    form_columns = [
-        'location_en',
-        'location_lt'
-    ]
-
-
-configure_mappers()
-admin.add_view(RedirectHomeView(name='Index'))
-admin.add_view(UserAdminView(User, db.session))
-admin.add_view(MachineAdminView(Machine, db.session))
-admin.add_view(ClientAdminView(Client, db.session))
-admin.add_view(PartAdminView(Part, db.session))
-admin.add_view(LocationAdminView(Location, db.session))
-
-tables = [Service, PartsReplaced, MachineType, OneTimeLink, Task, Visit]
-for table in tables:
-    admin.add_view(AdminModelView(table, db.session))
@@ -0,0 +1,63 @@
+from typing import Any, NamedTuple, Optional, Sequence
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+
+class Page(NamedTuple):
+    """One page of keyset-paginated rows in display order."""
+    items: list[Any]
+    has_next: bool
+    has_prev: bool
+
+
+def keyset_page(
+    query: Query,
+    columns: Sequence[ColumnElement],
+    per_page: int,
+    after: Optional[Sequence[Any]] = None,
+    before: Optional[Sequence[Any]] = None,
+    descending: bool = False
+) -> Page:
+    """
+    Fetch the page of rows directly after or before a cursor.
+
+    Instead of OFFSET, the page is located with a range condition on the sort
+    columns, so every page costs an index seek regardless of how deep it is.
+    The sort columns must identify a row uniquely.
+
+    Args:
+        query: Filtered query without ordering.
+        columns: Sort columns, most significant first.
+        per_page: Number of rows per page.
+        after: Sort column values of the last row of the previous page.
+        before: Sort column values of the first row of the next page.
+        descending: Display rows in descending order.
+
+    Returns:
+        Page: Rows in display order and whether neighbouring pages exist.
+    """
+    key = tuple_(*columns) if len(columns) > 1 else columns[0]
+
+    def cursor(values: Sequence[Any]) -> Any:
+        return tuple_(*values) if len(values) > 1 else values[0]
+
+    forward = before is None
+    if after is not None:
+        query = query.filter(key < cursor(after) if descending else key > cursor(after))
+    if before is not None:
+        query = query.filter(key > cursor(before) if descending else key < cursor(before))
+
+    ascending = forward != descending
+    rows = query.order_by(
+        *[column.asc() if ascending else column.desc() for column in columns]
+    ).limit(per_page + 1).all()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if forward:
+        return Page(rows, has_next=has_more, has_prev=after is not None)
+
+    rows.reverse()
+    return Page(rows, has_next=True, has_prev=has_more)
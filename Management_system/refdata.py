@@ -0,0 +1,117 @@
+from itertools import chain
+from threading import Lock
+from typing import Any, Callable, NamedTuple, Optional
+from flask import g, has_app_context
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from . import db
+from .models import DataVersion, Location, MachineType
+
+REFERENCE_VERSION = "reference"
+REFERENCE_MODELS = (MachineType, Location)
+
+
+class MachineTypeRef(NamedTuple):
+    """Cached machine type."""
+    id: int
+    name: str
+
+
+class LocationRef(NamedTuple):
+    """Cached stock location."""
+    id: int
+    location_en: str
+    location_lt: str
+
+
+class ReferenceCache:
+    """
+    In-process cache of tables that change maybe once a year.
+
+    Entries are tagged with the `reference` row of `data_versions`. Every
+    write to a cached table bumps that counter in the same transaction, so
+    each worker process notices the change on its next lookup and reloads.
+    The counter is read at most once per application context.
+    """
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._version: Optional[int] = None
+        self._data: dict[str, Any] = {}
+
+    def current_version(self) -> int:
+        """Return the stored version of the reference tables."""
+        if "reference_version" not in g:
+            g.reference_version = db.session.execute(
+                select(DataVersion.version).where(DataVersion.name == REFERENCE_VERSION)
+            ).scalar() or 0
+        return g.reference_version
+
+    def get(self, name: str, loader: Callable[[], Any]) -> Any:
+        """
+        Return a cached value, loading it when missing or out of date.
+
+        Args:
+            name: Cache entry name.
+            loader: Function querying the value.
+        """
+        version = self.current_version()
+        with self._lock:
+            if version != self._version:
+                self._data = {}
+                self._version = version
+            if name in self._data:
+                return self._data[name]
+
+        value = loader()
+        with self._lock:
+            if self._version == version:
+                self._data[name] = value
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached value."""
+        with self._lock:
+            self._data = {}
+            self._version = None
+
+
+reference_cache = ReferenceCache()
+
+def machine_types() -> list[MachineTypeRef]:
+    """Return all machine types."""
+    return reference_cache.get("machine_types", lambda: [
+        MachineTypeRef(*row)
+        for row in db.session.execute(select(MachineType.id, MachineType.name).order_by(MachineType.id))
+    ])
+
+def locations() -> list[LocationRef]:
+    """Return all stock locations."""
+    return reference_cache.get("locations", lambda: [
+        LocationRef(*row)
+        for row in db.session.execute(
+            select(Location.id, Location.location_en, Location.location_lt).order_by(Location.id)
+        )
+    ])
+
+def bump_data_version(connection: Connection, name: str) -> None:
+    """Increment a `data_versions` counter, creating it on first use."""
+    result = connection.execute(
+        update(DataVersion)
+        .where(DataVersion.name == name)
+        .values(version=DataVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(DataVersion).values(name=name, version=1))
+
+@event.listens_for(db.session, "after_flush")
+def bump_reference_version(session: Session, flush_context: Any) -> None:
+    """Bump the reference version when a flush writes a cached table."""
+    changed = chain(session.new, session.dirty, session.deleted)
+    if not any(isinstance(obj, REFERENCE_MODELS) for obj in changed):
+        return
+
+    bump_data_version(session.connection(), REFERENCE_VERSION)
+    reference_cache.clear()
+    if has_app_context():
+        g.pop("reference_version", None)
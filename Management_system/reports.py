@@ -0,0 +1,261 @@
+from datetime import date
+from typing import Any, NamedTuple
+from sqlalchemy import Select, case, func, or_, select
+from sqlalchemy.orm import joinedload
+from .models import (
+    Machine, MachineSummary, MachineType, MonthlyClientActivity, MonthlyMachineTypeActivity, MonthlyPartUsage,
+    MonthlyUserServices, Part, Service, User
+)
+from .snapshot import report_session
+from .utils import get_month_range
+
+
+class UsersReport(NamedTuple):
+    """Services done per user for a month, with a trend over the preceding months."""
+    rows: list[dict[str, Any]]
+    trend: list[dict[str, Any]]
+    periods: list[tuple[int, int]]
+    totals: list[int]
+
+
+class ActivityReport(NamedTuple):
+    """Yearly services and parts per machine type, with the most replaced parts."""
+    years: list[int]
+    machine_types: list[dict[str, Any]]
+    parts: list[dict[str, Any]]
+
+
+def month_sequence(year: int, month: int, count: int) -> list[tuple[int, int]]:
+    """
+    Return `count` consecutive (year, month) pairs ending with the given month.
+
+    Args:
+        year: Year of the last month.
+        month: Last month.
+        count: Number of months.
+
+    Returns:
+        list: (year, month) pairs, oldest first.
+    """
+    index = year * 12 + month - 1
+    return [(i // 12, i % 12 + 1) for i in range(index - count + 1, index + 1)]
+
+def users_services_report(year: int, month: int, months: int = 12) -> UsersReport:
+    """
+    Count services per user and month from the monthly user rollup.
+
+    Percentages are relative to all services of the selected month, including
+    services without an engineer.
+
+    Args:
+        year: Selected year.
+        month: Selected month.
+        months: Number of months in the trend, ending with the selected month.
+
+    Returns:
+        UsersReport: Rows for the selected month and the per-user trend matrix.
+    """
+    periods = month_sequence(year, month, months)
+    start_date, _ = get_month_range(*periods[0])
+    end_date, _ = get_month_range(year, month)
+
+    session = report_session()
+    rows = (
+        session.query(MonthlyUserServices.user_id, MonthlyUserServices.month, MonthlyUserServices.services)
+        .filter(MonthlyUserServices.month.between(start_date, end_date))
+        .all()
+    )
+
+    counts = {}
+    period_totals = dict.fromkeys(periods, 0)
+    for user_id, service_month, services in rows:
+        period = (service_month.year, service_month.month)
+        counts[(user_id, *period)] = services
+        period_totals[period] += services
+
+    totals = list(period_totals.values())
+    total_services = period_totals[(year, month)]
+
+    users = session.query(User).filter(User.name != 'Admin').all()
+
+    report = []
+    trend = []
+    for user in users:
+        user_services = counts.get((user.id, year, month), 0)
+        report.append({
+            "user": user.name,
+            "services_done": user_services,
+            "services_percent": f"{(user_services / total_services * 100):.2f}%" if total_services else "0%"
+        })
+        trend.append({
+            "user": user.name,
+            "services": [counts.get((user.id, *period), 0) for period in periods]
+        })
+
+    return UsersReport(report, trend, periods, totals)
+
+def quarter_range(year: int, quarter: int) -> tuple[date, date]:
+    """Return the first and last day of a quarter (1-4)."""
+    start, _ = get_month_range(year, quarter * 3 - 2)
+    _, end = get_month_range(year, quarter * 3)
+    return start, end
+
+def quarter_services_query(client_id: int, machine_type_id: int, year: int, quarter: int) -> Select:
+    """
+    Select a client's machines of one type with their last service in a quarter.
+
+    The last service date comes from a subquery grouped by machine over the
+    quarter's services only, so each machine is one flat row however long its
+    service history is. Inactive machines are only included when they were
+    serviced in the quarter.
+
+    Args:
+        client_id: Client of the machines.
+        machine_type_id: Machine type to report on.
+        year: Year of the quarter.
+        quarter: Quarter, 1-4.
+
+    Returns:
+        Select: Rows of `machine_type`, `serial_number` and `last_service`
+        (None when not serviced), ordered by serial number.
+    """
+    date_from, date_to = quarter_range(year, quarter)
+    last_services = (
+        select(Service.machine_id, func.max(Service.date).label("last_service"))
+        .where(Service.date.between(date_from, date_to))
+        .group_by(Service.machine_id)
+        .subquery()
+    )
+    return (
+        select(
+            MachineType.name.label("machine_type"),
+            Machine.serial_number,
+            last_services.c.last_service,
+        )
+        .join(MachineType, Machine.machine_type_id == MachineType.id)
+        .outerjoin(last_services, last_services.c.machine_id == Machine.id)
+        .where(
+            Machine.client_id == client_id,
+            Machine.machine_type_id == machine_type_id,
+            or_(Machine.is_active == True, last_services.c.last_service.is_not(None)),
+        )
+        .order_by(Machine.serial_number)
+    )
+
+def quarter_services_report(client_id: int, machine_type_id: int, year: int, quarter: int) -> list:
+    """Return the rows of `quarter_services_query` from the report session."""
+    return report_session().execute(quarter_services_query(client_id, machine_type_id, year, quarter)).all()
+
+def last_services_query(client_id: int) -> Select:
+    """
+    Select a client's active machines with their latest service.
+
+    The latest service is read by primary key from `machine_summary`, so the
+    cost grows with the client's machines rather than with their services.
+
+    Args:
+        client_id: Client of the machines.
+
+    Returns:
+        Select: (Machine, Service) rows ordered by serial number; Service is
+        None for machines that were never serviced.
+    """
+    return (
+        select(Machine, Service)
+        .outerjoin(MachineSummary, MachineSummary.machine_id == Machine.id)
+        .outerjoin(Service, Service.id == MachineSummary.last_service_id)
+        .where(Machine.client_id == client_id, Machine.is_active == True)
+        .options(joinedload(Machine.machine_type))
+        .order_by(Machine.serial_number)
+    )
+
+def client_activity(client_id: int, date_from: date, date_to: date) -> list:
+    """
+    Return a client's monthly services and replaced parts from the client rollup.
+
+    Months are whole, so the first and last month may include days outside
+    the range.
+
+    Returns:
+        list: Rows of `month`, `services`, `parts_quantity` and `parts_cost`.
+    """
+    return report_session().execute(
+        select(
+            MonthlyClientActivity.month, MonthlyClientActivity.services,
+            MonthlyClientActivity.parts_quantity, MonthlyClientActivity.parts_cost,
+        )
+        .where(
+            MonthlyClientActivity.client_id == client_id,
+            MonthlyClientActivity.month.between(date_from.replace(day=1), date_to),
+        )
+        .order_by(MonthlyClientActivity.month)
+    ).all()
+
+def yearly_activity_report(year_from: int, year_to: int, lang: str, top_parts: int = 20) -> ActivityReport:
+    """
+    Summarize services and replaced parts per year from the monthly rollups.
+
+    Reads at most one row per machine type and year, plus `top_parts` part
+    rows, however many years of history there are.
+
+    Args:
+        year_from: First year.
+        year_to: Last year.
+        lang: Language of the part names.
+        top_parts: Number of most replaced parts to list.
+
+    Returns:
+        ActivityReport: Per machine type services, parts quantity and cost by
+        year, and the most replaced parts split by warranty.
+    """
+    years = list(range(year_from, year_to + 1))
+    start_date, end_date = date(year_from, 1, 1), date(year_to, 12, 1)
+    session = report_session()
+
+    year = func.strftime("%Y", MonthlyMachineTypeActivity.month)
+    rows = session.execute(
+        select(
+            MachineType.name, year, func.sum(MonthlyMachineTypeActivity.services),
+            func.sum(MonthlyMachineTypeActivity.parts_quantity), func.sum(MonthlyMachineTypeActivity.parts_cost),
+        )
+        .join(MachineType, MonthlyMachineTypeActivity.machine_type_id == MachineType.id)
+        .where(MonthlyMachineTypeActivity.month.between(start_date, end_date))
+        .group_by(MachineType.name, year)
+        .order_by(MachineType.name)
+    ).all()
+
+    machine_types = {}
+    for name, row_year, services, parts_quantity, parts_cost in rows:
+        entry = machine_types.setdefault(name, {
+            "machine_type": name,
+            "services": [0] * len(years),
+            "parts_quantity": [0] * len(years),
+            "parts_cost": [0.0] * len(years),
+        })
+        index = int(row_year) - year_from
+        entry["services"][index] = services
+        entry["parts_quantity"][index] = parts_quantity
+        entry["parts_cost"][index] = parts_cost
+
+    quantity = func.sum(MonthlyPartUsage.quantity)
+    parts = session.execute(
+        select(
+            Part.part_number, Part.name_en if lang == "en" else Part.name_lt, quantity,
+            func.sum(case((MonthlyPartUsage.warranty == True, MonthlyPartUsage.quantity), else_=0)),
+            func.sum(MonthlyPartUsage.cost),
+        )
+        .join(Part, MonthlyPartUsage.part_id == Part.id)
+        .where(MonthlyPartUsage.month.between(start_date, end_date))
+        .group_by(Part.id)
+        .order_by(quantity.desc(), Part.part_number)
+        .limit(top_parts)
+    ).all()
+
+    return ActivityReport(
+        years,
+        list(machine_types.values()),
+        [
+            {"part_number": part_number, "name": name, "quantity": total, "warranty": warranty, "cost": cost}
+            for part_number, name, total, warranty, cost in parts
+        ],
+    )
@@ -0,0 +1,297 @@
+import click
+from collections import defaultdict
+from datetime import date
+from itertools import chain
+from typing import Any, Callable, Collection, NamedTuple, Optional
+from sqlalchemy import ColumnElement, Select, and_, delete, event, func, inspect, literal, select, true, type_coerce, union_all
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from . import app, db
+from .models import (
+    Machine, MonthlyClientActivity, MonthlyMachineTypeActivity, MonthlyPartUsage, MonthlyUserServices,
+    Part, PartsReplaced, Service
+)
+from .utils import get_month_range
+
+NO_USER = 0
+
+
+class Rollup(NamedTuple):
+    """A monthly rollup table and the query computing it from the raw rows."""
+    model: Any
+    keys: tuple[str, ...]
+    measures: tuple[str, ...]
+    source: Callable[[Optional[Collection[date]]], Select]
+
+
+def month_of(column: Any) -> ColumnElement:
+    """Return the first day of the month of a date column."""
+    return type_coerce(func.date(column, "start of month"), db.Date)
+
+def in_months(column: Any, months: Optional[Collection[date]]) -> ColumnElement:
+    """
+    Filter a date column to some months, or to all of them when None.
+
+    The range condition lets SQLite use the date indexes; the month list
+    drops the months in between that are not requested.
+    """
+    if months is None:
+        return true()
+    _, last_day = get_month_range(max(months).year, max(months).month)
+    return and_(column.between(min(months), last_day), month_of(column).in_(sorted(months)))
+
+def user_services_source(months: Optional[Collection[date]]) -> Select:
+    month = month_of(Service.date)
+    user_id = func.coalesce(Service.user_id, NO_USER)
+    return (
+        select(month, user_id, func.count(Service.id))
+        .where(in_months(Service.date, months))
+        .group_by(month, user_id)
+    )
+
+def activity_source(key: Any) -> Callable[[Optional[Collection[date]]], Select]:
+    """Build the source of an activity rollup keyed by a machine column."""
+    def source(months: Optional[Collection[date]]) -> Select:
+        service_month = month_of(Service.date)
+        services = (
+            select(
+                service_month.label("month"), key.label("key"), func.count(Service.id).label("services"),
+                literal(0).label("parts_quantity"), literal(0.0).label("parts_cost"),
+            )
+            .join(Machine, Service.machine_id == Machine.id)
+            .where(in_months(Service.date, months))
+            .group_by(service_month, key)
+        )
+        parts_month = month_of(PartsReplaced.date)
+        parts = (
+            select(
+                parts_month, key, literal(0),
+                func.sum(PartsReplaced.quantity), func.sum(PartsReplaced.quantity * Part.price),
+            )
+            .join(Machine, PartsReplaced.machine_id == Machine.id)
+            .join(Part, PartsReplaced.part_id == Part.id)
+            .where(in_months(PartsReplaced.date, months))
+            .group_by(parts_month, key)
+        )
+        activity = union_all(services, parts).subquery()
+        return (
+            select(
+                type_coerce(activity.c.month, db.Date), activity.c.key, func.sum(activity.c.services),
+                func.sum(activity.c.parts_quantity), func.sum(activity.c.parts_cost),
+            )
+            .group_by(activity.c.month, activity.c.key)
+        )
+    return source
+
+def part_usage_source(months: Optional[Collection[date]]) -> Select:
+    month = month_of(PartsReplaced.date)
+    return (
+        select(
+            month, PartsReplaced.part_id, PartsReplaced.warranty,
+            func.sum(PartsReplaced.quantity), func.sum(PartsReplaced.quantity * Part.price),
+        )
+        .join(Part, PartsReplaced.part_id == Part.id)
+        .where(in_months(PartsReplaced.date, months))
+        .group_by(month, PartsReplaced.part_id, PartsReplaced.warranty)
+    )
+
+ROLLUPS = (
+    Rollup(MonthlyUserServices, ("month", "user_id"), ("services",), user_services_source),
+    Rollup(
+        MonthlyMachineTypeActivity, ("month", "machine_type_id"), ("services", "parts_quantity", "parts_cost"),
+        activity_source(Machine.machine_type_id)
+    ),
+    Rollup(
+        MonthlyClientActivity, ("month", "client_id"), ("services", "parts_quantity", "parts_cost"),
+        activity_source(Machine.client_id)
+    ),
+    Rollup(MonthlyPartUsage, ("month", "part_id", "warranty"), ("quantity", "cost"), part_usage_source),
+)
+
+def rebuild_rollups(connection: Connection, months: Optional[Collection[date]] = None) -> None:
+    """
+    Replace the rollup rows of some months, or all rollups, with recomputed ones.
+
+    Args:
+        connection: Connection of the current transaction.
+        months: First days of the months to rebuild, or None for everything.
+    """
+    if months is not None and not months:
+        return
+    for rollup in ROLLUPS:
+        cleanup = delete(rollup.model)
+        if months is not None:
+            cleanup = cleanup.where(rollup.model.month.in_(sorted(months)))
+        connection.execute(cleanup)
+        connection.execute(
+            insert(rollup.model).from_select(rollup.keys + rollup.measures, rollup.source(months))
+        )
+
+def stale_rollups(connection: Connection) -> dict[str, list[date]]:
+    """
+    Compare the rollup tables with freshly computed rows.
+
+    Costs are compared to the cent, since adding floats one replacement at
+    a time and in one aggregate may differ in the last digits.
+
+    Returns:
+        dict: Table name to the months whose rows are wrong, missing or extra,
+        for tables that are out of date.
+    """
+    stale = {}
+    for rollup in ROLLUPS:
+        def rows(statement: Select) -> dict[tuple, tuple]:
+            size = len(rollup.keys)
+            return {
+                tuple(row[:size]): tuple(round(value or 0, 2) for value in row[size:])
+                for row in connection.execute(statement)
+            }
+
+        expected = rows(rollup.source(None))
+        stored = rows(select(*(getattr(rollup.model, column) for column in rollup.keys + rollup.measures)))
+        months = sorted({
+            key[0] for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key)
+        })
+        if months:
+            stale[rollup.model.__tablename__] = months
+    return stale
+
+def add_to_rollups(connection: Connection, services: list[Service], replaced_parts: list[PartsReplaced]) -> None:
+    """Add new services and part replacements to the rollup rows of their months."""
+    machine_ids = {obj.machine_id for obj in chain(services, replaced_parts)}
+    machines = {
+        machine_id: (client_id, machine_type_id)
+        for machine_id, client_id, machine_type_id in connection.execute(
+            select(Machine.id, Machine.client_id, Machine.machine_type_id).where(Machine.id.in_(machine_ids))
+        )
+    }
+    prices = dict(connection.execute(
+        select(Part.id, Part.price).where(Part.id.in_({replaced.part_id for replaced in replaced_parts}))
+    ).all()) if replaced_parts else {}
+
+    # Rows whose machine or part is missing are left out, as the joins of
+    # the source queries leave them out of a rebuild.
+    totals = {rollup.model: defaultdict(lambda size=len(rollup.measures): [0] * size) for rollup in ROLLUPS}
+    for service in services:
+        month = service.date.replace(day=1)
+        totals[MonthlyUserServices][(month, service.user_id or NO_USER)][0] += 1
+        if service.machine_id in machines:
+            client_id, machine_type_id = machines[service.machine_id]
+            totals[MonthlyMachineTypeActivity][(month, machine_type_id)][0] += 1
+            totals[MonthlyClientActivity][(month, client_id)][0] += 1
+    for replaced in replaced_parts:
+        if replaced.part_id not in prices:
+            continue
+        month = replaced.date.replace(day=1)
+        cost = replaced.quantity * prices[replaced.part_id]
+        usage = totals[MonthlyPartUsage][(month, replaced.part_id, replaced.warranty)]
+        usage[0] += replaced.quantity
+        usage[1] += cost
+        if replaced.machine_id in machines:
+            client_id, machine_type_id = machines[replaced.machine_id]
+            for model, key in (
+                (MonthlyMachineTypeActivity, (month, machine_type_id)),
+                (MonthlyClientActivity, (month, client_id)),
+            ):
+                totals[model][key][1] += replaced.quantity
+                totals[model][key][2] += cost
+
+    for rollup in ROLLUPS:
+        if not totals[rollup.model]:
+            continue
+        statement = insert(rollup.model)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(rollup.keys),
+            set_={
+                measure: getattr(rollup.model, measure) + getattr(statement.excluded, measure)
+                for measure in rollup.measures
+            },
+        )
+        connection.execute(statement, [
+            {**dict(zip(rollup.keys, key)), **dict(zip(rollup.measures, values))}
+            for key, values in totals[rollup.model].items()
+        ])
+
+def changed_months(session: Session) -> set[date]:
+    """Return the months of edited or deleted services and replacements, before and after the edit."""
+    months = set()
+    for obj in chain(session.dirty, session.deleted):
+        if isinstance(obj, (Service, PartsReplaced)) and (obj in session.deleted or session.is_modified(obj)):
+            dates = [obj.date, *inspect(obj).attrs.date.history.deleted]
+            months.update(value.replace(day=1) for value in dates if value is not None)
+    return months
+
+@event.listens_for(db.session, "before_flush")
+def collect_rollup_changes(session: Session, flush_context: Any, instances: Any) -> None:
+    """
+    Note which months a flush invalidates, while old values can still be loaded.
+
+    Moving a machine to another client or type, and changing a part's price,
+    change every month the machine or part has history in.
+    """
+    session.info["rollup_months"] = changed_months(session)
+    session.info["rollup_machine_ids"] = {
+        obj.id for obj in session.dirty
+        if isinstance(obj, Machine) and any(
+            inspect(obj).attrs[name].history.has_changes() for name in ("client_id", "machine_type_id")
+        )
+    }
+    session.info["rollup_part_ids"] = {
+        obj.id for obj in session.dirty
+        if isinstance(obj, Part) and inspect(obj).attrs.price.history.has_changes()
+    }
+
+@event.listens_for(db.session, "after_flush")
+def update_rollups(session: Session, flush_context: Any) -> None:
+    """Apply a flush's services and part replacements to the monthly rollups."""
+    services = [obj for obj in session.new if isinstance(obj, Service)]
+    replaced_parts = [obj for obj in session.new if isinstance(obj, PartsReplaced)]
+    months = session.info.pop("rollup_months", set())
+    machine_ids = session.info.pop("rollup_machine_ids", set())
+    part_ids = session.info.pop("rollup_part_ids", set())
+    if not (services or replaced_parts or months or machine_ids or part_ids):
+        return
+
+    connection = session.connection()
+    if services or replaced_parts:
+        add_to_rollups(connection, services, replaced_parts)
+    if machine_ids:
+        months.update(connection.execute(
+            select(month_of(Service.date)).where(Service.machine_id.in_(machine_ids)).union(
+                select(month_of(PartsReplaced.date)).where(PartsReplaced.machine_id.in_(machine_ids))
+            )
+        ).scalars())
+    if part_ids:
+        months.update(connection.execute(
+            select(month_of(PartsReplaced.date)).where(PartsReplaced.part_id.in_(part_ids)).distinct()
+        ).scalars())
+    rebuild_rollups(connection, months)
+
+def ensure_rollups() -> None:
+    """Fill the rollup tables on databases that predate them."""
+    if db.session.execute(select(MonthlyUserServices.month).limit(1)).first() is None:
+        rebuild_rollups(db.session.connection())
+        db.session.commit()
+
+@app.cli.command("rebuild-rollups")
+@click.option("--verify", is_flag=True, help="Only report months whose rollups are out of date.")
+def rebuild_rollups_command(verify: bool) -> None:
+    """Recompute the monthly rollup tables from services and part replacements."""
+    for rollup in ROLLUPS:
+        rollup.model.__table__.create(db.engine, checkfirst=True)
+    connection = db.session.connection()
+
+    if verify:
+        stale = stale_rollups(connection)
+        if stale:
+            raise click.ClickException("; ".join(
+                f"{table}: {', '.join(month.strftime('%Y-%m') for month in months)}"
+                for table, months in stale.items()
+            ))
+        click.echo("Monthly rollups are up to date.")
+        return
+
+    rebuild_rollups(connection)
+    db.session.commit()
+    click.echo("Rebuilt monthly rollups.")
@@ -1,34 +1,51 @@
+import io
 import os
 import calendar
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import io
-import base64
 
 from datetime import datetime, date
+from typing import Optional
 
 from flask import (
     render_template, redirect, flash, request, abort,
-    send_from_directory, g, url_for, session, Response
+    send_from_directory, g, url_for, session, Response, jsonify
 )
 from flask_login import (
     login_user, logout_user, login_required, current_user
 )
-from sqlalchemy import extract, or_, and_, func, case
+from sqlalchemy import or_, func, case
+from sqlalchemy.orm import joinedload
+from werkzeug.exceptions import HTTPException
 from dateutil.relativedelta import relativedelta
 
 from . import app, db, bcrypt, lang_url_for
 from .forms import (
     LoginForm, RegistrationForm, MachineForm, ClientForm, ServiceForm,
-    PartForm, ReplacedPartForm, PartsReportForm, ServiceReportForm,
+    PartForm, ReplacedPartForm, PartsReportForm, ServiceReportForm, StockTakeForm,
+    DataImportForm,
     TaskForm, VisitForm, ResetPasswordForm, TokenSendForm, UserSettingsForm
 )
 from .models import (
     User, Machine, Client, Service, Part, PartsReplaced, Inventory,
-    Location, MachineType, Task, Visit, OneTimeLink
+    MachineType, MachineSummary, Task, Visit, OneTimeLink
 )
-from .utils import localization, send_email, generate_link, log_user_action, get_month_range, password_strenght
+from .utils import localization, send_email, generate_link, log_user_action, password_strenght
+from .search import search_limit, search_machines, search_parts, search_clients
+from .pagination import Page, keyset_page
+from .reports import (
+    ActivityReport, UsersReport, client_activity, last_services_query, quarter_services_query,
+    quarter_services_report, users_services_report, yearly_activity_report
+)
+from .snapshot import report_session, report_snapshot
+from .stock import book_replaced_part, set_stock_levels, stock_changes, stock_levels
+from .imports import IMPORTERS, import_data, import_stock_take
+from .exports import export_response, replaced_parts_query, stream_rows
+from .refdata import locations as reference_locations, machine_types as reference_machine_types
+from .charts import CHART_FORMATS, chart_cache, chart_key, data_version, render_pie_chart
+from .usage import UsageReport, usage_report
+from .scheduler import service_scheduler
+
+MACHINES_PER_PAGE = 50
+HISTORY_PER_PAGE = 20
 
 
 @app.route('/<lang>/user_settings', methods=['GET', 'POST'])
@@ -367,6 +384,7 @@ def forgot_password(lang: str) -> Response:
                     html=render_template("emails/reset_password.html", url=reset_url),
                     recipients=form.email.data
                 )
+                db.session.commit()
 
                 log_user_action(user.name,"Forgot_Password")
 
@@ -575,6 +593,7 @@ def invite(lang: str) -> Response:
                 ),
                 recipients=form.email.data
             )
+            db.session.commit()
 
             flash(g.tr["flash_invite_sent"], "success")
             log_user_action(current_user.name,"Invite",f"Email: {email}")
@@ -662,7 +681,7 @@ def new_part(lang: str) -> Response:
     form.price.render_kw = {"placeholder": g.tr["placeholder_price"]}
 
     try:
-        locations = Location.query.all()
+        locations = reference_locations()
 
         translated_location_names = [
             location.location_en if g.lang == 'en' else location.location_lt
@@ -775,11 +794,7 @@ def update_part(lang: str) -> Response:
     if not current_user.is_admin:
         abort(403)
 
-    parts = []
-
     try:
-        parts = Part.query.order_by(Part.part_number).all()
-
         if request.method == "POST":
             part_number = request.form.get('part_number')
             return redirect(lang_url_for('update_part_form', part_number=part_number))
@@ -793,7 +808,7 @@ def update_part(lang: str) -> Response:
         )
         flash(g.tr['flash_unexpected_error'], 'error')
     
-    return render_template('/parts/update_part.html', parts=parts)
+    return render_template('/parts/update_part.html')
 
 @app.route('/<lang>/parts/update_part/<string:part_number>', methods=["GET", "POST"])
 @localization
@@ -802,6 +817,9 @@ def update_part_form(part_number: str, lang: str) -> Response:
     """
     Update inventory quantities for a specific part.
 
+    Stock at all locations is read with one query, and the changed
+    quantities are written with one bulk upsert.
+
     Args:
         part_number (str): The part's unique number.
         lang (str): The active language from the URL.
@@ -809,70 +827,43 @@ def update_part_form(part_number: str, lang: str) -> Response:
     Returns:
         Response: Rendered update form or redirect after saving.
     """
-    parts = []
     part = None
     locations = []
-    changes = []
 
     try:
-        parts = Part.query.order_by(Part.part_number).all()
         part = Part.query.filter_by(part_number=part_number).first()
-        all_locations = Location.query.all()
+        all_locations = reference_locations()
+        current = stock_levels([part.id])
 
         if request.method == "POST":
+            submitted = {}
             for location in all_locations:
-                field_name = f"quantity_{location.id}"
-                quantity_str = request.form.get(field_name)
-
+                quantity_str = request.form.get(f"quantity_{location.id}")
                 if quantity_str is not None:
-                    quantity = int(quantity_str)
-
-                    inventory = Inventory.query.filter_by(
-                        part_id=part.id,
-                        location_id=location.id
-                    ).first()
-
-                    if inventory:
-                        if inventory.quantity != quantity:
-                            changes.append(
-                                f"Part no: {part.part_number}; "
-                                f"Location: {location.location_en}; "
-                                f"Qty: {inventory.quantity} → {quantity}"
-                            )
-                        inventory.quantity = quantity
-
-                    else:
-                        if quantity > 0:
-                            new_inventory = Inventory(
-                                part_id=part.id,
-                                location_id=location.id,
-                                quantity=quantity
-                            )
-                            db.session.add(new_inventory)
-
-                            changes.append(
-                                f"Part no: {part.part_number}; "
-                                f"Location: {location.location_en}; "
-                                f"Qty: 0 → {quantity}"
-                            )
+                    submitted[(part.id, location.id)] = int(quantity_str)
 
+            changes = stock_changes(current, submitted)
+            set_stock_levels(changes)
             db.session.commit()
 
+            location_names = {location.id: location.location_en for location in all_locations}
             for change in changes:
-                log_user_action(current_user.name,"Update_Part", change)
+                log_user_action(
+                    current_user.name,
+                    "Update_Part",
+                    f"Part no: {part.part_number}; "
+                    f"Location: {location_names[change.location_id]}; "
+                    f"Qty: {change.before or 0} → {change.after}"
+                )
 
             flash(g.tr['flash_updated_quantities'], 'success')
             return redirect(lang_url_for('update_part_form', part_number=part.part_number))
 
         for location in all_locations:
-            inventory = Inventory.query.filter_by(part_id=part.id, location_id=location.id).first()
-
-            quantity = inventory.quantity if inventory else 0
-
             locations.append({
                 'location_id': location.id,
                 'location_name': location.location_en if g.lang == 'en' else location.location_lt,
-                'quantity': quantity
+                'quantity': current.get((part.id, location.id), 0)
             })
 
     except Exception as error:
@@ -886,11 +877,132 @@ def update_part_form(part_number: str, lang: str) -> Response:
 
     return render_template(
         '/parts/update_part.html',
-        parts=parts,
         part=part,
         locations=locations
     )
 
+@app.route('/<lang>/parts/stock_take', methods=['GET', 'POST'])
+@localization
+@login_required
+def stock_take(lang: str) -> Response:
+    """
+    Import a stock-take CSV of part quantities per location.
+
+    The whole file is validated first; only a file without issues is applied,
+    in batched transactions. The page then lists every changed quantity.
+
+    Only accessible to admins.
+
+    Args:
+        lang (str): The active language from the URL.
+
+    Returns:
+        Response: Rendered import form with issues or the changes made.
+    """
+    if not current_user.is_admin:
+        abort(403)
+
+    form = StockTakeForm()
+    result = None
+    part_numbers = {}
+    location_names = {}
+
+    try:
+        if form.validate_on_submit():
+            upload = form.file.data
+            result = import_stock_take(io.TextIOWrapper(upload.stream, encoding="utf-8-sig"))
+
+            if result.issues:
+                flash(g.tr['flash_import_issues'], 'error')
+            else:
+                part_ids = {change.part_id for change in result.changes}
+                part_numbers = dict(
+                    db.session.query(Part.id, Part.part_number).filter(Part.id.in_(part_ids)).all()
+                )
+                location_names = {
+                    location.id: location.location_en if g.lang == 'en' else location.location_lt
+                    for location in reference_locations()
+                }
+
+                log_user_action(
+                    current_user.name,
+                    "Stock_Take",
+                    f"File: {upload.filename}; Rows: {len(result.rows)}; Changes: {len(result.changes)}"
+                )
+                flash(g.tr['flash_stock_take_imported'], 'success')
+
+    except Exception as error:
+        log_user_action(
+            current_user.name,
+            "Stock_Take",
+            f"Unexpected error: {str(error)}",
+            level = "error"
+        )
+        flash(g.tr['flash_unexpected_error'], 'error')
+
+    return render_template(
+        '/parts/stock_take.html',
+        form=form,
+        result=result,
+        part_numbers=part_numbers,
+        location_names=location_names
+    )
+
+@app.route('/<lang>/imports', methods=['GET', 'POST'])
+@localization
+@login_required
+def data_import(lang: str) -> Response:
+    """
+    Import clients, machines or parts from a CSV file.
+
+    A dry run only validates the file and lists conflicts with stored data;
+    otherwise a file without issues is imported in one transaction.
+
+    Only accessible to admins.
+
+    Args:
+        lang (str): The active language from the URL.
+
+    Returns:
+        Response: Rendered import form with issues or the import summary.
+    """
+    if not current_user.is_admin:
+        abort(403)
+
+    form = DataImportForm()
+    form.kind.choices = [(kind, g.tr[f"import_kind_{kind}"]) for kind in IMPORTERS]
+    result = None
+
+    try:
+        if form.validate_on_submit():
+            upload = form.file.data
+            result = import_data(
+                form.kind.data,
+                io.TextIOWrapper(upload.stream, encoding="utf-8-sig"),
+                dry_run=form.dry_run.data
+            )
+
+            if result.issues:
+                flash(g.tr['flash_import_issues'], 'error')
+            elif result.created:
+                log_user_action(
+                    current_user.name,
+                    "Data_Import",
+                    f"File: {upload.filename}; Data: {form.kind.data}; Created: {result.created}"
+                )
+                flash(g.tr['flash_data_imported'], 'success')
+
+    except Exception as error:
+        log_user_action(
+            current_user.name,
+            "Data_Import",
+            f"Unexpected error: {str(error)}",
+            level = "error"
+        )
+        flash(g.tr['flash_unexpected_error'], 'error')
+
+    return render_template('/imports/import.html', form=form, result=result)
+
 @app.route('/<lang>/parts/add_replaced_part', methods=['GET', 'POST'])
 @localization
 @login_required
@@ -898,7 +1010,8 @@ def add_replaced_part(lang: str) -> Response:
     """
     Add a record of part replacement for a machine.
 
-    Validates date and inventory before saving.
+    Validates date and inventory before saving. Stock is taken with a
+    conditional update, so concurrent bookings cannot overdraw it.
 
     Args:
         lang (str): The active language from the URL.
@@ -907,8 +1020,6 @@ def add_replaced_part(lang: str) -> Response:
         Response: Rendered replacement form or redirect.
     """
     form = ReplacedPartForm()
-    parts = []
-    machines = []
 
     try:
         serial_from_url = request.args.get('serial_number')
@@ -919,9 +1030,7 @@ def add_replaced_part(lang: str) -> Response:
         form.quantity.render_kw = {"placeholder": g.tr["placeholder_quantity"]}
         form.serial_number.render_kw = {"placeholder": g.tr["placeholder_serial_number"]}
 
-        machines = Machine.query.all()
-        parts = Part.query.order_by(Part.part_number).all()
-        locations = Location.query.all()
+        locations = reference_locations()
 
         form.location.choices = [
             (str(location.id), location.location_en if g.lang == 'en' else location.location_lt)
@@ -938,9 +1047,7 @@ def add_replaced_part(lang: str) -> Response:
                 flash(g.tr['flash_part_not_exist'], 'error')
                 return render_template(
                     '/parts/add_replaced_part.html',
-                    form=form,
-                    parts=parts,
-                    machines=machines
+                    form=form
                 )
 
             quantity = form.quantity.data
@@ -951,18 +1058,14 @@ def add_replaced_part(lang: str) -> Response:
                 flash(g.tr['flash_machine_not_exist'], 'error')
                 return render_template(
                     '/parts/add_replaced_part.html',
-                    form=form,
-                    parts=parts,
-                    machines=machines
+                    form=form
                 )
 
             if date < machine.start_of_operation:
                 flash(g.tr['flash_invalid_date'], 'error')
                 return render_template(
                     '/parts/add_replaced_part.html',
-                    form=form,
-                    parts=parts,
-                    machines=machines
+                    form=form
                 )
 
             warranty = True
@@ -979,9 +1082,7 @@ def add_replaced_part(lang: str) -> Response:
                 flash(g.tr['flash_invalid_quantity'], 'error')
                 return render_template(
                     '/parts/add_replaced_part.html',
-                    form=form,
-                    parts=parts,
-                    machines=machines
+                    form=form
                 )
             
             machine_type_names = [mt.name for mt in part.machine_types]
@@ -990,13 +1091,9 @@ def add_replaced_part(lang: str) -> Response:
                 flash(g.tr['flash_invalid_type'], "error")
                 return render_template(
                     '/parts/add_replaced_part.html',
-                    form=form,
-                    parts=parts,
-                    machines=machines
+                    form=form
                 )
 
-            inventory.quantity -= quantity
-
             replaced_part = PartsReplaced(
                 date=date,
                 part_id=part.id,
@@ -1008,8 +1105,12 @@ def add_replaced_part(lang: str) -> Response:
                 inventory_id=inventory.id
             )
 
-            db.session.add(replaced_part)
-            db.session.commit()
+            if not book_replaced_part(replaced_part):
+                flash(g.tr['flash_invalid_quantity'], 'error')
+                return render_template(
+                    '/parts/add_replaced_part.html',
+                    form=form
+                )
 
             log_user_action(
                 current_user.name,
@@ -1031,9 +1132,7 @@ def add_replaced_part(lang: str) -> Response:
 
     return render_template(
         '/parts/add_replaced_part.html',
-        form=form,
-        parts=parts,
-        machines=machines
+        form=form
     )
 
 @app.route('/<lang>/machines')
@@ -1088,6 +1187,10 @@ def new_machine(lang: str) -> Response:
                 flash(g.tr['flash_machine_exist'], 'error')
                 return render_template('/machines/add_new.html', form=form)
 
+            if not form.client.selected:
+                flash(g.tr['flash_client_not_exist'], 'error')
+                return render_template('/machines/add_new.html', form=form)
+
             new_machine = Machine(
                 serial_number=serial_number,
                 machine_type_id=type,
@@ -1132,17 +1235,14 @@ def machine_search(lang: str) -> Response:
     Returns:
         Response: Rendered search form or redirect.
     """
-    machines = []
     try:
-        machines = Machine.query.all()
-
         if request.method == 'POST':
             serial_number = request.form.get('serial_number')
             machine = Machine.query.filter_by(serial_number=serial_number).first()
 
             if not machine:
                 flash(g.tr['flash_machine_not_exist'], 'error')
-                return render_template('machines/machine_info.html', machines=machines)
+                return render_template('machines/machine_info.html')
 
             return redirect(lang_url_for('machine_info', serial_number=machine.serial_number))
 
@@ -1155,7 +1255,7 @@ def machine_search(lang: str) -> Response:
         )
         flash(g.tr['flash_unexpected_error'], 'error')
 
-    return render_template('machines/machine_info.html', machines=machines)
+    return render_template('machines/machine_info.html')
 
 @app.route('/<lang>/machines/machine_info/<string:serial_number>', methods=['GET'])
 @localization
@@ -1164,6 +1264,9 @@ def machine_info(serial_number: str, lang: str) -> Response:
     """
     Display detailed information about a machine including services and parts.
 
+    Only the newest page of each history is rendered; older rows are loaded in
+    chunks from `machine_services` and `machine_parts`.
+
     Args:
         serial_number (str): Machine serial number.
         lang (str): The active language from the URL.
@@ -1171,20 +1274,19 @@ def machine_info(serial_number: str, lang: str) -> Response:
     Returns:
         Response: Rendered machine info page.
     """
-    machines = []
     machine = None
-    services = []
-    parts = []
+    services = Page([], has_next=False, has_prev=False)
+    parts = Page([], has_next=False, has_prev=False)
     
     try:
-        machine = Machine.query.filter_by(serial_number=serial_number).first()
-        services = Service.query.filter_by(machine_id=machine.id).order_by(
-            Service.date.desc()
-        ).all()
-        parts = PartsReplaced.query.filter_by(machine_id=machine.id).order_by(
-            PartsReplaced.date.desc()
-        ).all()
-        machines = Machine.query.all()
+        machine = Machine.query.options(
+            joinedload(Machine.client),
+            joinedload(Machine.machine_type),
+            joinedload(Machine.summary)
+        ).filter_by(serial_number=serial_number).first()
+
+        services = service_history(machine.id)
+        parts = parts_history(machine.id)
 
     except Exception as error:
         log_user_action(
@@ -1197,12 +1299,118 @@ def machine_info(serial_number: str, lang: str) -> Response:
 
     return render_template(
         'machines/machine_info.html',
-        machines=machines,
         machine=machine,
         services=services,
         parts=parts
     )
 
+def history_cursor() -> Optional[tuple[date, int]]:
+    """
+    Read a (date, id) history cursor from the request arguments.
+
+    Returns:
+        tuple | None: Date and id of the last row already shown, or None for the first page.
+    """
+    cursor_date = request.args.get('date', type=date.fromisoformat)
+    cursor_id = request.args.get('id', type=int)
+
+    if cursor_date is None or cursor_id is None:
+        return None
+    return (cursor_date, cursor_id)
+
+def service_history(machine_id: int, after: Optional[tuple[date, int]] = None) -> Page:
+    """
+    Fetch a page of a machine's services, newest first, with their engineers.
+
+    Args:
+        machine_id (int): The machine's ID.
+        after (tuple | None): Cursor of the last service already shown.
+
+    Returns:
+        Page: Services and whether older ones exist.
+    """
+    query = Service.query.options(joinedload(Service.user)).filter_by(machine_id=machine_id)
+    return keyset_page(query, [Service.date, Service.id], HISTORY_PER_PAGE, after=after, descending=True)
+
+def parts_history(machine_id: int, after: Optional[tuple[date, int]] = None) -> Page:
+    """
+    Fetch a page of a machine's replaced parts, newest first, with parts and engineers.
+
+    Args:
+        machine_id (int): The machine's ID.
+        after (tuple | None): Cursor of the last replacement already shown.
+
+    Returns:
+        Page: Replaced parts and whether older ones exist.
+    """
+    query = PartsReplaced.query.options(
+        joinedload(PartsReplaced.part),
+        joinedload(PartsReplaced.user)
+    ).filter_by(machine_id=machine_id)
+    return keyset_page(query, [PartsReplaced.date, PartsReplaced.id], HISTORY_PER_PAGE, after=after, descending=True)
+
+@app.route('/<lang>/machines/machine_info/<string:serial_number>/services', methods=['GET'])
+@localization
+@login_required
+def machine_services(serial_number: str, lang: str) -> Response:
+    """
+    Render the next chunk of a machine's service history rows.
+
+    Args:
+        serial_number (str): Machine serial number.
+        lang (str): The active language from the URL.
+
+    Returns:
+        Response: Table rows HTML fragment.
+    """
+    try:
+        machine = Machine.query.filter_by(serial_number=serial_number).first_or_404()
+        services = service_history(machine.id, history_cursor())
+        return render_template('machines/service_rows.html', machine=machine, services=services)
+
+    except HTTPException:
+        raise
+
+    except Exception as error:
+        log_user_action(
+            current_user.name,
+            "Machine_Services",
+            f"Unexpected error: {str(error)}",
+            level = "error"
+        )
+        return "", 500
+
+@app.route('/<lang>/machines/machine_info/<string:serial_number>/parts', methods=['GET'])
+@localization
+@login_required
+def machine_parts(serial_number: str, lang: str) -> Response:
+    """
+    Render the next chunk of a machine's replaced parts rows.
+
+    Args:
+        serial_number (str): Machine serial number.
+        lang (str): The active language from the URL.
+
+    Returns:
+        Response: Table rows HTML fragment.
+    """
+    try:
+        machine = Machine.query.filter_by(serial_number=serial_number).first_or_404()
+        parts = parts_history(machine.id, history_cursor())
+        return render_template('machines/part_rows.html', machine=machine, parts=parts)
+
+    except HTTPException:
+        raise
+
+    except Exception as error:
+        log_user_action(
+            current_user.name,
+            "Machine_Parts",
+            f"Unexpected error: {str(error)}",
+            level = "error"
+        )
+        return "", 500
+
 @app.route('/<lang>/machines/edit_machine', methods=['GET', 'POST'])
 @login_required
 @localization
@@ -1221,14 +1429,7 @@ def edit_machine_select(lang: str) -> Response:
     if not current_user.is_admin:
         abort(403)
 
-    machines = []
-    clients = []
-    selected_machine = None
-
     try:
-        machines = Machine.query.order_by(Machine.serial_number).all()
-        clients = Client.query.order_by(Client.company).all()
-
         if request.method == 'POST':
             serial_number = request.form.get('serial_number')
             return redirect(lang_url_for('edit_machine', serial_number=serial_number))
@@ -1242,12 +1443,7 @@ def edit_machine_select(lang: str) -> Response:
         )
         flash(g.tr['flash_unexpected_error'], 'error')
 
-    return render_template(
-        'machines/edit_machine.html',
-        machines=machines,
-        clients=clients,
-        selected_machine=selected_machine
-    )
+    return render_template('machines/edit_machine.html')
 
 @app.route('/<lang>/machines/edit_machine/<string:serial_number>', methods=['GET', 'POST'])
 @localization
@@ -1267,30 +1463,31 @@ def edit_machine(serial_number: str, lang: str) -> Response:
         abort(403)
 
     changes = []
-    machines = []
-    clients = []
     selected_machine = []
 
     try:
-        machines = Machine.query.order_by(Machine.serial_number).all()
-        clients = Client.query.order_by(Client.company).all()
         selected_machine = Machine.query.filter_by(serial_number=serial_number).first()
 
         if not selected_machine:
             flash(g.tr['flash_machine_not_exist'], 'error')
             return render_template(
                 'machines/edit_machine.html',
-                machines=machines,
-                clients=clients,
                 selected_machine=selected_machine
             )
 
         if request.method == 'POST':
-            client_id = int(request.form.get('client_id'))
+            client_id = request.form.get('client_id', type=int)
             client = Client.query.filter_by(id=client_id).first()
             is_active = request.form.get('is_active') == 'true'
             machine = Machine.query.filter_by(id=selected_machine.id).first()
 
+            if not client:
+                flash(g.tr['flash_client_not_exist'], 'error')
+                return render_template(
+                    'machines/edit_machine.html',
+                    selected_machine=selected_machine
+                )
+
             if selected_machine.client_id != client_id:
                 changes.append(
                     f"Machine s/n: {machine.serial_number}; "
@@ -1325,8 +1522,6 @@ def edit_machine(serial_number: str, lang: str) -> Response:
 
     return render_template(
         'machines/edit_machine.html',
-        machines=machines,
-        clients=clients,
         selected_machine=selected_machine
     )
 
@@ -1369,7 +1564,9 @@ def downloads(lang: str) -> Response:
 @localization
 def machine_list(lang: str) -> Response:
     """
-    Render a full list of machines.
+    Render a page of the machine list, filtered by type, client and city.
+
+    Pages are navigated with `after`/`before` serial number cursors.
 
     Args:
         lang (str): The active language from the URL.
@@ -1377,10 +1574,50 @@ def machine_list(lang: str) -> Response:
     Returns:
         Response: Rendered machine list page.
     """
+    filters = {
+        'type': request.args.get('type', type=int),
+        'client': request.args.get('client', type=int),
+        'city': request.args.get('city') or None
+    }
+    after = request.args.get('after')
+    before = request.args.get('before')
+    page = Page([], has_next=False, has_prev=False)
+    machine_types = []
+    cities = []
+    selected_client = None
+
     try:
-        machines = Machine.query.order_by(Machine.serial_number).all()
-        return render_template('/machines/machines_list.html', machines=machines)
-    
+        machine_types = sorted(reference_machine_types(), key=lambda machine_type: machine_type.name)
+        cities = [city for city, in db.session.query(Client.city).distinct().order_by(Client.city)]
+
+        query = (
+            db.session.query(
+                Machine.serial_number,
+                Machine.start_of_operation,
+                MachineType.name.label('machine_type'),
+                Client.company,
+                Client.city
+            )
+            .join(MachineType, Machine.machine_type_id == MachineType.id)
+            .join(Client, Machine.client_id == Client.id)
+        )
+
+        if filters['type']:
+            query = query.filter(Machine.machine_type_id == filters['type'])
+        if filters['client']:
+            query = query.filter(Machine.client_id == filters['client'])
+            selected_client = db.session.get(Client, filters['client'])
+        if filters['city']:
+            query = query.filter(Client.city == filters['city'])
+
+        page = keyset_page(
+            query,
+            [Machine.serial_number],
+            MACHINES_PER_PAGE,
+            after=(after,) if after else None,
+            before=(before,) if before else None
+        )
+
     except Exception as error:
         log_user_action(
             current_user.name,
@@ -1389,7 +1626,16 @@ def machine_list(lang: str) -> Response:
             level = "error"
         )
         flash(g.tr['flash_unexpected_error'], 'error')
-        return render_template('/machines/machines_list.html', machines=[])
+
+    return render_template(
+        '/machines/machines_list.html',
+        machines=page.items,
+        page=page,
+        filters={key: value for key, value in filters.items() if value},
+        machine_types=machine_types,
+        cities=cities,
+        selected_client=selected_client
+    )
 
 @app.route('/<lang>/machines/downloads/<path:filename>')
 @login_required
@@ -1422,7 +1668,7 @@ def prices(lang: str) -> Response:
         Response: Rendered price selection form.
     """
     try:
-        machine_types = MachineType.query.all()
+        machine_types = reference_machine_types()
 
         if request.method == 'POST':
             machine_type_name = request.form.get('machine_type')
@@ -1464,7 +1710,7 @@ def prices_by_type(machine_type_name: str, lang: str) -> Response:
     try:
         machine_type = MachineType.query.filter_by(name=machine_type_name).first()
         parts = sorted(machine_type.parts, key=lambda part: part.part_number)
-        machine_types = MachineType.query.all()
+        machine_types = reference_machine_types()
   
     except Exception as error:
         log_user_action(
@@ -1551,15 +1797,11 @@ def new_service(lang: str) -> Response:
     form.bn_count.render_kw = {"placeholder": g.tr["placeholder_bn_count"]}
     form.note.render_kw = {"placeholder": g.tr["placeholder_note"]}
 
-    machines = []
-
     try:
         serial_from_url = request.args.get('serial_number')
         if serial_from_url:
             form.serial_number.data = serial_from_url
 
-        machines = Machine.query.all()
-
         if form.validate_on_submit():
             date = form.date.data
             serial_number = form.serial_number.data
@@ -1578,17 +1820,15 @@ def new_service(lang: str) -> Response:
                     created_at=datetime.now()
                 )
 
-                last_service = Service.query.filter_by(
-                    machine_id=machine.id
-                ).order_by(Service.date.desc()).first()
+                summary = db.session.get(MachineSummary, machine.id)
 
-                if last_service and date < last_service.date:
+                if summary and summary.last_service_date and date < summary.last_service_date:
                     flash(g.tr['flash_service_date'], 'error')
-                    return render_template('services/add_new.html', form=form, machines=machines)
+                    return render_template('services/add_new.html', form=form)
 
-                if last_service and bn_count < last_service.bn_count:
+                if summary and summary.last_service_date and bn_count < summary.last_bn_count:
                     flash(g.tr['flash_banknote_count'], 'error')
-                    return render_template('services/add_new.html', form=form, machines=machines)
+                    return render_template('services/add_new.html', form=form)
 
                 db.session.add(new_service)
                 db.session.commit()
@@ -1604,7 +1844,7 @@ def new_service(lang: str) -> Response:
 
             else:
                 flash(g.tr['flash_machine_not_exist'], 'error')
-                return render_template('services/add_new.html', form=form, machines=machines)
+                return render_template('services/add_new.html', form=form)
             
     except Exception as error:
         log_user_action(
@@ -1615,7 +1855,7 @@ def new_service(lang: str) -> Response:
         )
         flash(g.tr['flash_unexpected_error'], 'error')
 
-    return render_template('services/add_new.html', form=form, machines=machines)
+    return render_template('services/add_new.html', form=form)
 
 @app.route('/<lang>/reports')
 @login_required
@@ -1632,6 +1872,39 @@ def reports(lang: str) -> Response:
     """
     return render_template('reports/reports.html')
 
+@app.route('/<lang>/reports/snapshot', methods=['POST'])
+@localization
+@login_required
+def refresh_report_snapshot(lang: str) -> Response:
+    """
+    Copy the live database into the report snapshot on demand.
+
+    Only accessible to admins.
+
+    Args:
+        lang (str): The active language from the URL.
+
+    Returns:
+        Response: Redirect back to the report.
+    """
+    if not current_user.is_admin:
+        abort(403)
+
+    try:
+        report_snapshot.refresh()
+        flash(g.tr['flash_snapshot_refreshed'], 'success')
+
+    except Exception as error:
+        log_user_action(
+            current_user.name,
+            "Report_Snapshot",
+            f"Unexpected error: {str(error)}",
+            level="error"
+        )
+        flash(g.tr['flash_unexpected_error'], 'error')
+
+    return redirect(request.referrer or lang_url_for('reports'))
+
 @app.route('/<lang>/reports/parts.html', methods=["GET", "POST"])
 @localization
 @login_required
@@ -1647,6 +1920,7 @@ def parts_report(lang: str) -> Response:
     """
     form = PartsReportForm()
     results = []
+    activity = []
 
     try:
         if form.validate_on_submit():
@@ -1654,17 +1928,22 @@ def parts_report(lang: str) -> Response:
             date_from = form.date_from.data
             date_to = form.date_to.data
 
-            results = db.session.query(PartsReplaced).join(Machine).filter(
+            results = report_session().query(PartsReplaced).join(Machine).filter(
                 Machine.client_id == client_id,
                 PartsReplaced.date.between(date_from, date_to)
+            ).options(
+                joinedload(PartsReplaced.part),
+                joinedload(PartsReplaced.machine)
             ).order_by(PartsReplaced.part_id).all()
+            activity = client_activity(client_id, date_from, date_to)
 
             if not results:
                 flash(g.tr['flash_no_replaced_parts'], 'warning')
                 return render_template(
                     'reports/parts.html',
                     form=form,
-                    results=results
+                    results=results,
+                    activity=activity
                 )
     
     except Exception as error:
@@ -1679,15 +1958,54 @@ def parts_report(lang: str) -> Response:
     return render_template(
         'reports/parts.html',
         form=form,
-        results=results
+        results=results,
+        activity=activity
     )
 
+@app.route('/<lang>/reports/parts.<any(csv, xlsx):fmt>')
+@localization
+@login_required
+def parts_report_export(lang: str, fmt: str) -> Response:
+    """
+    Download replaced parts in a date range as CSV or XLSX.
+
+    Rows are streamed from the database in batches while the file is sent,
+    so memory use does not grow with the date range.
+
+    Args:
+        lang (str): The active language from the URL.
+        fmt (str): "csv" or "xlsx".
+
+    Returns:
+        Response: Streaming file download.
+    """
+    client_id = request.args.get("client", type=int)
+    date_from = request.args.get("date_from", type=date.fromisoformat)
+    date_to = request.args.get("date_to", type=date.fromisoformat)
+
+    if not date_from or not date_to:
+        abort(400)
+
+    log_user_action(
+        current_user.name,
+        "Parts_Report_Export",
+        f"Client: {client_id or 'all'}; From: {date_from}; To: {date_to}; Format: {fmt}"
+    )
+
+    header = [
+        g.tr['date'], g.tr['client'], g.tr['city'], g.tr['serial_number'], g.tr['part_number'],
+        g.tr['part_name'], g.tr['quantity'], g.tr['price'], g.tr['warranty']
+    ]
+    rows = stream_rows(replaced_parts_query(client_id, date_from, date_to, g.lang))
+    return export_response(f"replaced_parts_{date_from}_{date_to}", fmt, header, rows)
+
 @app.route('/<lang>/reports/services.html', methods=["GET", "POST"])
 @localization
 @login_required
 def services_report(lang: str) -> Response:
     """
-    Generate a service report for BPS C1 machines within the current quarter.
+    Generate a report of a client's machines of one type with their last
+    service in a selected quarter.
 
     Args:
         lang (str): The active language from the URL.
@@ -1695,45 +2013,15 @@ def services_report(lang: str) -> Response:
     Returns:
         Response: Rendered services report page.
     """
-    current_quarter = (datetime.now().month - 1) // 3 + 1
     form = ServiceReportForm()
     results = []
     client = None
 
     if form.validate_on_submit():
         try:
-            client_id = form.client.data
-            client = Client.query.filter_by(id=client_id).first()
-            now = datetime.now()
-            quarter_now = (now.month - 1) // 3 + 1
-
-            quarter_months = {
-                1: (1, 3),
-                2: (4, 6),
-                3: (7, 9),
-                4: (10, 12)
-            }
-
-            start_month, end_month = quarter_months[quarter_now]
-
-            results = (
-                db.session.query(Machine)
-                .outerjoin(Service)
-                .join(MachineType, Machine.machine_type_id == MachineType.id)
-                .filter(
-                    Machine.client_id == client_id,
-                    MachineType.name == 'BPS C1',
-                    or_(
-                        Machine.is_active == True,
-                        and_(
-                            Machine.is_active == False,
-                            extract('year', Service.date) == now.year,
-                            extract('month', Service.date).between(start_month, end_month)
-                        )
-                    )
-                )
-                .order_by(Machine.serial_number)
-                .all()
+            client = report_session().get(Client, form.client.data)
+            results = quarter_services_report(
+                form.client.data, form.machine_type.data, form.year.data, form.quarter.data
             )
 
             if not results:
@@ -1741,7 +2029,6 @@ def services_report(lang: str) -> Response:
                 return render_template(
                     'reports/services.html',
                     form=form,
-                    current_quarter=current_quarter,
                     results=results
                 )
             
@@ -1757,18 +2044,49 @@ def services_report(lang: str) -> Response:
     return render_template(
         'reports/services.html',
         form=form,
-        current_quarter=current_quarter,
         results=results,
-        client=client,
-        now=datetime.now()
+        client=client
     )
 
+@app.route('/<lang>/reports/services.<any(csv, xlsx):fmt>')
+@localization
+@login_required
+def services_report_export(lang: str, fmt: str) -> Response:
+    """
+    Download a client's quarterly services of one machine type as CSV or XLSX.
+
+    The query arguments are checked by the same form as the report page.
+
+    Args:
+        lang (str): The active language from the URL.
+        fmt (str): "csv" or "xlsx".
+
+    Returns:
+        Response: Streaming file download.
+    """
+    form = ServiceReportForm(request.args, meta={"csrf": False})
+    if not form.validate():
+        abort(400)
+    client_id, machine_type_id = form.client.data, form.machine_type.data
+    year, quarter = form.year.data, form.quarter.data
+
+    log_user_action(
+        current_user.name,
+        "Services_Report_Export",
+        f"Client: {client_id}; Machine type: {machine_type_id}; Year: {year}; Quarter: {quarter}; Format: {fmt}"
+    )
+
+    header = [g.tr['machine_type'], g.tr['serial_number'], g.tr['date']]
+    rows = stream_rows(quarter_services_query(client_id, machine_type_id, year, quarter))
+    return export_response(f"services_{year}_Q{quarter}_{client_id}", fmt, header, rows)
+
 @app.route('/<lang>/reports/users.html')
 @login_required
 @localization
 def users_report(lang: str) -> Response:
     """
-    Generate a pie chart report of services completed by users in a selected month.
+    Generate a pie chart report of services completed by users in a selected month,
+    with a 12-month trend of services per user.
 
     Args:
         lang (str): The active language from the URL.
@@ -1779,42 +2097,19 @@ def users_report(lang: str) -> Response:
     now = datetime.now()
     year = int(request.args.get("year", now.year))
     month = int(request.args.get("month", now.month))
-    start_date, end_date = get_month_range(year, month)
     month_options = [(i, g.tr[f"month_{i}"]) for i in range(1, 13)]
     selected_month_name = g.tr[f"month_{month}"]
 
     report = []
-    chart_base64 = None
+    users_data = UsersReport([], [], [], [])
+    chart_url = None
 
     try:
-        users = User.query.filter(User.name != 'Admin').all()
-        total_services = Service.query.filter(Service.date.between(start_date, end_date)).count()
-
-        report = []
-        for user in users:
-            user_services = Service.query.filter_by(user_id=user.id)\
-                .filter(Service.date.between(start_date, end_date)).count()
-
-            report.append({
-                "user": user.name,
-                "services_done": user_services,
-                "services_percent": f"{(user_services / total_services * 100):.2f}%" if total_services else "0%"
-            })
+        users_data = users_services_report(year, month)
+        report = users_data.rows
 
-        services = [entry['services_done'] for entry in report if int(entry['services_done']) > 0]
-        labels = [entry['user'] for entry in report if int(entry['services_done']) > 0]
-
-        chart_base64 = None
-        if services:
-            fig, ax = plt.subplots()
-            ax.pie(services, labels=labels, autopct='%1.1f%%', startangle=90)
-            ax.axis('equal')
-
-            img_bytes = io.BytesIO()
-            plt.savefig(img_bytes, format='png', bbox_inches='tight')
-            img_bytes.seek(0)
-            chart_base64 = base64.b64encode(img_bytes.read()).decode('utf-8')
-            plt.close()
+        if any(entry['services_done'] > 0 for entry in report):
+            chart_url = lang_url_for('users_report_chart', year=year, month=month)
     
     except Exception as error:
         log_user_action(
@@ -1832,9 +2127,187 @@ def users_report(lang: str) -> Response:
         selected_year=year,
         month_options=month_options,
         selected_month_name=selected_month_name,
-        chart_base64=chart_base64
+        chart_url=chart_url,
+        users_data=users_data
+    )
+
+@app.route('/<lang>/reports/activity.html')
+@login_required
+@localization
+def activity_report(lang: str) -> Response:
+    """
+    Show services and replaced parts per machine type and year, with the
+    most replaced parts, over a range of years.
+
+    Args:
+        lang (str): The active language from the URL.
+
+    Returns:
+        Response: Rendered activity report.
+    """
+    this_year = datetime.now().year
+    year_to = request.args.get("year_to", this_year, type=int)
+    year_from = min(request.args.get("year_from", year_to - 2, type=int), year_to)
+    report = ActivityReport([], [], [])
+
+    try:
+        report = yearly_activity_report(year_from, year_to, g.lang)
+
+    except Exception as error:
+        log_user_action(
+            current_user.name,
+            "Activity_Report",
+            f"Unexpected error: {str(error)}",
+            level = "error"
+        )
+        flash(g.tr['flash_unexpected_error'], 'error')
+
+    return render_template(
+        'reports/activity.html',
+        report=report,
+        year_from=year_from,
+        year_to=year_to,
+        year_options=range(2021, this_year + 1)
+    )
+
+def usage_range() -> tuple[date, date]:
+    """Return the usage report date range from the query string, the last year by default."""
+    date_to = request.args.get("date_to", date.today(), type=date.fromisoformat)
+    date_from = request.args.get("date_from", date_to - relativedelta(years=1), type=date.fromisoformat)
+    return date_from, date_to
+
+@app.route('/<lang>/reports/usage.html')
+@login_required
+@localization
+def usage_report_page(lang: str) -> Response:
+    """
+    Show banknote counter throughput over a date range: fleet totals, the
+    busiest machines and intervals with counter resets or unusual rates.
+
+    Args:
+        lang (str): The active language from the URL.
+
+    Returns:
+        Response: Rendered usage report.
+    """
+    date_from, date_to = usage_range()
+    report = UsageReport({}, [], [])
+
+    try:
+        report = usage_report(date_from, date_to, request.args.get("client", type=int), top=50)
+
+    except Exception as error:
+        log_user_action(
+            current_user.name,
+            "Usage_Report",
+            f"Unexpected error: {str(error)}",
+            level = "error"
+        )
+        flash(g.tr['flash_unexpected_error'], 'error')
+
+    return render_template(
+        'reports/usage.html',
+        report=report,
+        date_from=date_from,
+        date_to=date_to
     )
 
+@app.route('/<lang>/reports/usage.json')
+@login_required
+@localization
+def usage_report_api(lang: str) -> Response:
+    """
+    Return the usage report for all machines as JSON.
+
+    Accepts `date_from`, `date_to` and `client` like the report page.
+
+    Args:
+        lang (str): The active language from the URL.
+
+    Returns:
+        Response: JSON object with `fleet`, `machines` and `outliers`.
+    """
+    date_from, date_to = usage_range()
+
+    try:
+        report = usage_report(date_from, date_to, request.args.get("client", type=int))
+        return jsonify({
+            "date_from": date_from.isoformat(),
+            "date_to": date_to.isoformat(),
+            **report._asdict()
+        })
+
+    except Exception as error:
+        log_user_action(
+            current_user.name,
+            "Usage_Report_API",
+            f"Unexpected error: {str(error)}",
+            level="error"
+        )
+        return jsonify({}), 500
+
+@app.route('/<lang>/reports/users_chart')
+@login_required
+@localization
+def users_report_chart(lang: str) -> Response:
+    """
+    Serve the users report pie chart for a month from the chart cache.
+
+    The chart is rendered only when no cached image exists for the report data.
+    Responses carry an ETag so repeated views are answered with 304.
+
+    Args:
+        lang (str): The active language from the URL.
+
+    Returns:
+        Response: PNG or SVG image (`format` argument), or 304 Not Modified.
+    """
+    now = datetime.now()
+    year = request.args.get("year", now.year, type=int)
+    month = request.args.get("month", now.month, type=int)
+    fmt = request.args.get("format", "png")
+
+    if fmt not in CHART_FORMATS:
+        abort(404)
+
+    try:
+        entries = [
+            entry for entry in users_services_report(year, month, months=1).rows
+            if entry['services_done'] > 0
+        ]
+        if not entries:
+            abort(404)
+
+        labels = [entry['user'] for entry in entries]
+        services = [entry['services_done'] for entry in entries]
+        key = chart_key('users', year, month, g.lang, data_version(labels, services), fmt)
+
+        if request.if_none_match.contains(key):
+            response = Response(status=304)
+        else:
+            chart = chart_cache.get(key)
+            if chart is None:
+                chart = render_pie_chart(labels, services, fmt)
+                chart_cache.put(key, chart)
+            response = Response(chart, mimetype=CHART_FORMATS[fmt])
+
+        response.set_etag(key)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+
+    except HTTPException:
+        raise
+
+    except Exception as error:
+        log_user_action(
+            current_user.name,
+            "Users_Report_Chart",
+            f"Unexpected error: {str(error)}",
+            level = "error"
+        )
+        return "", 500
+
 @app.route('/<lang>/clients')
 @login_required
 @localization
@@ -2088,7 +2561,6 @@ def new_task(lang: str) -> Response:
             )
 
             db.session.add(new_task)
-            db.session.commit()
 
             users = User.query.filter_by(is_active=True, is_verified=True).all()
             recipients = [user.email for user in users if user.email]
@@ -2102,6 +2574,7 @@ def new_task(lang: str) -> Response:
                 ),
                 recipients=recipients
             )
+            db.session.commit()
 
             log_user_action(current_user.name,"New_Task",f"Task: {task}")
 
@@ -2169,9 +2642,11 @@ def calendar(lang: str) -> Response:
         Response: Rendered calendar with visits.
     """
     visits = []
+    proposals = []
 
     try:
         visits = Visit.query.all()
+        proposals = service_scheduler.forecast().proposals
     
     except Exception as error:
         log_user_action(
@@ -2182,7 +2657,41 @@ def calendar(lang: str) -> Response:
         )
         flash(g.tr['flash_unexpected_error'], 'error')
     
-    return render_template('/calendar/calendar.html', visits=visits)
+    return render_template('/calendar/calendar.html', visits=visits, proposals=proposals)
+
+@app.route('/<lang>/visit/proposals')
+@login_required
+@localization
+def visit_proposals(lang: str) -> Response:
+    """
+    List the visits proposed by the service scheduler, by city, with the
+    machines falling due and their expected due dates.
+
+    Args:
+        lang (str): The active language from the URL.
+
+    Returns:
+        Response: Rendered list of proposed visits.
+    """
+    forecast = None
+
+    try:
+        forecast = service_scheduler.forecast()
+
+    except Exception as error:
+        log_user_action(
+            current_user.name,
+            "Visit_Proposals",
+            f"Unexpected error: {str(error)}",
+            level = "error"
+        )
+        flash(g.tr['flash_unexpected_error'], 'error')
+
+    return render_template(
+        'calendar/proposals.html',
+        forecast=forecast,
+        threshold=app.config['SERVICE_INTERVAL_BANKNOTES']
+    )
 
 @app.route('/<lang>/visit/new', methods=['GET', 'POST'])
 @localization
@@ -2191,7 +2700,8 @@ def new_visit(lang: str) -> Response:
     """
     Allow user to schedule a new client visit.
 
-    Only accessible to admins.
+    Only accessible to admins. The `client`, `date` and `purpose` query
+    arguments prefill the form, as proposed visits do.
 
     Args:
         lang (str): The active language from the URL.
@@ -2202,7 +2712,11 @@ def new_visit(lang: str) -> Response:
     if not current_user.is_admin:
         abort(403)
 
-    form = VisitForm()
+    form = VisitForm(
+        client=request.args.get('client', type=int),
+        date=request.args.get('date', type=date.fromisoformat),
+        purpose=request.args.get('purpose')
+    )
     form.purpose.render_kw = {"placeholder": g.tr["placeholder_purpose"]}
 
     if form.validate_on_submit():
@@ -2215,6 +2729,10 @@ def new_visit(lang: str) -> Response:
 
             client = Client.query.filter_by(id=form.client.data).first()
 
+            if not client:
+                flash(g.tr['flash_client_not_exist'], 'error')
+                return render_template('calendar/visit_form.html', form=form)
+
             existing_visit = Visit.query.filter_by(
                 client_id=form.client.data,
                 date=form.date.data
@@ -2225,15 +2743,6 @@ def new_visit(lang: str) -> Response:
                 return render_template('calendar/visit_form.html', form=form)
 
             db.session.add(visit)
-            db.session.commit()
-
-            log_user_action(
-                current_user.name,
-                "New_Visit",
-                f"Date: {form.date.data}; "
-                f"Client: {client.company} {client.city}; "
-                f"Purpose: {form.purpose.data}"
-            )
 
             users = User.query.filter_by(is_active=True, is_verified=True).all()
             recipients = [user.email for user in users if user.email]
@@ -2248,6 +2757,15 @@ def new_visit(lang: str) -> Response:
                 ),
                 recipients=recipients
             )
+            db.session.commit()
+
+            log_user_action(
+                current_user.name,
+                "New_Visit",
+                f"Date: {form.date.data}; "
+                f"Client: {client.company} {client.city}; "
+                f"Purpose: {form.purpose.data}"
+            )
 
             flash(g.tr['flash_visit_added'], 'success')
             return redirect(lang_url_for('calendar'))
@@ -2268,7 +2786,8 @@ def new_visit(lang: str) -> Response:
 @localization
 def visit_detail(visit_id: int, lang: str) -> Response:
     """
-    Show details about a specific visit, including latest service notes.
+    Show details about a specific visit, with the latest service of every
+    active machine of the client: its date, banknote count and note.
 
     Args:
         visit_id (int): The visit's ID.
@@ -2282,35 +2801,7 @@ def visit_detail(visit_id: int, lang: str) -> Response:
 
     try:
         visit = Visit.query.get(visit_id)
-
-        latest_service = (
-            db.session.query(
-                Service.machine_id,
-                func.max(Service.date).label("last_date")
-            )
-            .group_by(Service.machine_id)
-            .subquery()
-        )
-
-        services = (
-            db.session.query(Machine, Service)
-            .join(Service, Machine.id == Service.machine_id)
-            .join(
-                latest_service,
-                and_(
-                    Service.machine_id == latest_service.c.machine_id,
-                    Service.date == latest_service.c.last_date
-                )
-            )
-            .filter(
-                Machine.client_id == visit.client_id,
-                Machine.is_active == True,
-                Service.note != None,
-                Service.note != ""
-            )
-            .order_by(Machine.serial_number)
-            .all()
-        )
+        services = db.session.execute(last_services_query(visit.client_id)).all()
 
     except Exception as error:
         log_user_action(
@@ -2324,7 +2815,8 @@ def visit_detail(visit_id: int, lang: str) -> Response:
     return render_template(
         'calendar/visit_detail.html',
         visit=visit,
-        services=services
+        services=services,
+        today=date.today()
     )
 
 @app.route('/<lang>/visit/<int:visit_id>/edit', methods=['GET', 'POST'])
@@ -2457,6 +2949,91 @@ def delete_visit(visit_id: int, lang: str) -> Response:
     
     return redirect(lang_url_for('calendar'))
 
+@app.route('/<lang>/search/machines')
+@login_required
+@localization
+def search_machines_api(lang: str) -> Response:
+    """
+    Return machines matching the typed serial number for typeahead pickers.
+
+    Args:
+        lang (str): The active language from the URL.
+
+    Returns:
+        Response: JSON list of matching machines.
+    """
+    try:
+        return jsonify(search_machines(
+            request.args.get('q', ''),
+            search_limit(request.args.get('limit'))
+        ))
+
+    except Exception as error:
+        log_user_action(
+            current_user.name,
+            "Search_Machines",
+            f"Unexpected error: {str(error)}",
+            level="error"
+        )
+        return jsonify([]), 500
+
+@app.route('/<lang>/search/parts')
+@login_required
+@localization
+def search_parts_api(lang: str) -> Response:
+    """
+    Return parts matching the typed part number for typeahead pickers.
+
+    Args:
+        lang (str): The active language from the URL.
+
+    Returns:
+        Response: JSON list of matching parts.
+    """
+    try:
+        return jsonify(search_parts(
+            request.args.get('q', ''),
+            g.lang,
+            search_limit(request.args.get('limit'))
+        ))
+
+    except Exception as error:
+        log_user_action(
+            current_user.name,
+            "Search_Parts",
+            f"Unexpected error: {str(error)}",
+            level="error"
+        )
+        return jsonify([]), 500
+
+@app.route('/<lang>/search/clients')
+@login_required
+@localization
+def search_clients_api(lang: str) -> Response:
+    """
+    Return clients matching the typed company name for typeahead pickers.
+
+    Args:
+        lang (str): The active language from the URL.
+
+    Returns:
+        Response: JSON list of matching clients.
+    """
+    try:
+        return jsonify(search_clients(
+            request.args.get('q', ''),
+            search_limit(request.args.get('limit'))
+        ))
+
+    except Exception as error:
+        log_user_action(
+            current_user.name,
+            "Search_Clients",
+            f"Unexpected error: {str(error)}",
+            level="error"
+        )
+        return jsonify([]), 500
+
 @app.errorhandler(404)
 @localization
 def page_not_found(error: Exception) -> tuple[str, int]:
@@ -0,0 +1,257 @@
+import logging
+from datetime import date, datetime, timedelta
+from itertools import chain
+from threading import Event, Lock, Thread
+from typing import Any, NamedTuple, Optional
+from flask import Flask
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from . import app, db
+from .models import Client, DataVersion, Machine, MachineSummary, Service, Visit
+from .refdata import bump_data_version
+from .usage import JULIAN_ORDINAL_OFFSET, counter_intervals, load_counter_series, machine_usage
+
+scheduler_logger = logging.getLogger(__name__)
+
+SCHEDULE_VERSION = "schedule"
+SCHEDULE_MODELS = (Service, Machine, Visit)
+
+
+class DueMachine(NamedTuple):
+    """Machine expected to count its service interval of banknotes by `due_date`."""
+    serial_number: str
+    due_date: date
+    daily_rate: float
+
+
+class VisitProposal(NamedTuple):
+    """Visit suggested for a client, on the earliest due date of its machines."""
+    client_id: int
+    company: str
+    city: str
+    date: date
+    machines: list[DueMachine]
+
+    def purpose(self, label: str) -> str:
+        """Return the visit purpose listing the due machines after `label`."""
+        return f"{label}: " + ", ".join(
+            f"{machine.serial_number} ({machine.due_date.isoformat()})" for machine in self.machines
+        )
+
+
+class Forecast(NamedTuple):
+    """Visit proposals and the data version and day they were computed for."""
+    version: int
+    today: date
+    computed_at: datetime
+    proposals: list[VisitProposal]
+
+
+def forecast_due_dates(session: Session, today: date, threshold: int, history_days: int) -> tuple[Any, Any, Any]:
+    """
+    Estimate when each active machine counts `threshold` banknotes after its last service.
+
+    Every machine's daily rate over the last `history_days` days is computed
+    at once by the usage analysis; the due day is the last service day plus
+    the days needed at that rate. Machines without a rate (fewer than two
+    readings in the period, or no banknotes counted) are left out.
+
+    Args:
+        session: Session to read from.
+        today: Day the forecast is made on.
+        threshold: Banknotes counted between services.
+        history_days: Days of readings the rates are computed from.
+
+    Returns:
+        tuple: Arrays of machine ids, due days (date ordinals) and daily rates.
+    """
+    import numpy as np
+
+    rows = session.connection().execute(
+        select(Machine.id, func.julianday(MachineSummary.last_service_date) - JULIAN_ORDINAL_OFFSET)
+        .join(MachineSummary, MachineSummary.machine_id == Machine.id)
+        .where(Machine.is_active.is_(True), MachineSummary.last_service_date.is_not(None))
+        .order_by(Machine.id)
+    ).all()
+    machine_ids, last_days = (
+        np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=len(rows) * 2)
+        .reshape(-1, 2).astype(np.int64).T
+    )
+
+    usage = machine_usage(counter_intervals(
+        load_counter_series(today - timedelta(days=history_days), today, session=session)
+    ))
+    rates = np.zeros(len(machine_ids))
+    if len(usage.machine_ids):
+        position = np.minimum(np.searchsorted(usage.machine_ids, machine_ids), len(usage.machine_ids) - 1)
+        found = usage.machine_ids[position] == machine_ids
+        rates[found] = usage.daily_rates[position[found]]
+    known = rates > 0
+
+    due_days = last_days[known] + np.ceil(threshold / rates[known]).astype(np.int64)
+    return machine_ids[known], due_days, rates[known]
+
+def propose_visits(
+    session: Session, today: date, threshold: int, horizon_days: int, history_days: int
+) -> list[VisitProposal]:
+    """
+    Propose one visit per client with machines falling due within the horizon.
+
+    Clients that already have a visit planned between today and the end of
+    the horizon are left out. Overdue machines are proposed for today.
+
+    Args:
+        session: Session to read from.
+        today: Day the proposals are made on.
+        threshold: Banknotes counted between services.
+        horizon_days: How many days ahead to look for due machines.
+        history_days: Days of readings the rates are computed from.
+
+    Returns:
+        list: Proposals ordered by city, date and company.
+    """
+    horizon = today + timedelta(days=horizon_days)
+    machine_ids, due_days, rates = forecast_due_dates(session, today, threshold, history_days)
+    due = due_days <= horizon.toordinal()
+    machine_ids, due_days, rates = machine_ids[due].tolist(), due_days[due].tolist(), rates[due].tolist()
+    if not machine_ids:
+        return []
+
+    details = {
+        machine_id: rest for machine_id, *rest in session.execute(
+            select(Machine.id, Machine.serial_number, Client.id, Client.company, Client.city)
+            .join(Client, Machine.client_id == Client.id)
+            .where(Machine.id.in_(machine_ids))
+        )
+    }
+    planned = set(session.scalars(select(Visit.client_id).where(Visit.date.between(today, horizon))))
+
+    clients = {}
+    for machine_id, due_day, rate in zip(machine_ids, due_days, rates):
+        serial_number, client_id, company, city = details[machine_id]
+        if client_id in planned:
+            continue
+        clients.setdefault(client_id, (company, city, []))[2].append(
+            DueMachine(serial_number, date.fromordinal(due_day), round(rate, 1))
+        )
+
+    return sorted(
+        (
+            VisitProposal(
+                client_id, company, city,
+                max(today, min(machine.due_date for machine in machines)),
+                sorted(machines, key=lambda machine: (machine.due_date, machine.serial_number)),
+            )
+            for client_id, (company, city, machines) in clients.items()
+        ),
+        key=lambda proposal: (proposal.city, proposal.date, proposal.company)
+    )
+
+
+class ServiceScheduler:
+    """
+    Background job keeping the visit proposals up to date.
+
+    Proposals are cached with the `schedule` data version they were computed
+    from, which every write to services, machines or visits bumps, and with
+    the day they were made on. The thread recomputes them when woken up by
+    such a commit and otherwise every `SCHEDULER_INTERVAL` seconds, which
+    rolls them over to a new day. It only runs when the `SCHEDULER` setting
+    is enabled; without it proposals are computed when first requested.
+    """
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self._wake = Event()
+        self._stop = Event()
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+        self._forecast: Optional[Forecast] = None
+
+    def current_version(self) -> int:
+        """Return the stored version of the scheduling data."""
+        return db.session.execute(
+            select(DataVersion.version).where(DataVersion.name == SCHEDULE_VERSION)
+        ).scalar() or 0
+
+    def forecast(self) -> Forecast:
+        """
+        Return the visit proposals, recomputing them if the cache is out of date.
+
+        Must run inside an application context.
+        """
+        version, today = self.current_version(), date.today()
+        cached = self._forecast
+        if cached is not None and cached.version == version and cached.today == today:
+            return cached
+
+        config = self.app.config
+        forecast = Forecast(version, today, datetime.now(), propose_visits(
+            db.session, today, config["SERVICE_INTERVAL_BANKNOTES"],
+            config["SCHEDULER_HORIZON_DAYS"], config["SCHEDULER_HISTORY_DAYS"]
+        ))
+        with self._lock:
+            if self._forecast is None or (self._forecast.version, self._forecast.today) <= (version, today):
+                self._forecast = forecast
+        return forecast
+
+    def clear(self) -> None:
+        """Drop the cached proposals."""
+        with self._lock:
+            self._forecast = None
+
+    def start(self) -> None:
+        """Start the scheduler thread if it is enabled and not running."""
+        if not self.app.config["SCHEDULER"]:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = Thread(target=self._run, name="service-scheduler", daemon=True)
+                self._thread.start()
+
+    def notify(self) -> None:
+        """Wake the thread up to recompute the proposals after new data arrived."""
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the scheduler thread and wait for it to finish."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                with self.app.app_context():
+                    self.forecast()
+            except Exception:
+                scheduler_logger.exception("Service scheduler error")
+            self._wake.wait(self.app.config["SCHEDULER_INTERVAL"])
+
+
+service_scheduler = ServiceScheduler(app)
+
+@event.listens_for(db.session, "after_flush")
+def bump_schedule_version(session: Session, flush_context: Any) -> None:
+    """Bump the schedule version when a flush writes services, machines or visits."""
+    changed = chain(session.new, session.dirty, session.deleted)
+    if not any(isinstance(obj, SCHEDULE_MODELS) for obj in changed):
+        return
+
+    bump_data_version(session.connection(), SCHEDULE_VERSION)
+    session.info["schedule_changed"] = True
+
+@event.listens_for(db.session, "after_commit")
+def wake_scheduler(session: Session) -> None:
+    """Let the scheduler recompute proposals once the new data is committed."""
+    if session.info.pop("schedule_changed", False):
+        service_scheduler.notify()
+
+@event.listens_for(db.session, "after_rollback")
+def forget_schedule_changes(session: Session) -> None:
+    """Drop the pending wake-up of a rolled back transaction."""
+    session.info.pop("schedule_changed", None)
@@ -0,0 +1,117 @@
+from typing import Any
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+from . import db
+from .models import Machine, MachineType, Client, Part
+
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+
+
+def search_limit(value: Any) -> int:
+    """
+    Parse a requested result limit and clamp it to the allowed range.
+
+    Args:
+        value: Raw limit value from the request.
+
+    Returns:
+        int: Limit between 1 and MAX_SEARCH_LIMIT.
+    """
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return SEARCH_LIMIT
+    return max(1, min(limit, MAX_SEARCH_LIMIT))
+
+def match(query: Query, column: ColumnElement, text: str, limit: int) -> list[Any]:
+    """
+    Return rows whose column starts with the text, topped up with substring matches.
+
+    Prefix matches are a range scan on the column's index. The case-insensitive
+    substring search only runs when there are fewer prefix matches than the limit.
+    The first element of every row must be the primary key.
+
+    Args:
+        query: Base query selecting the row columns.
+        column: Column to match against.
+        text: Text typed by the user.
+        limit: Maximum number of rows.
+
+    Returns:
+        list: Up to `limit` rows ordered by the column.
+    """
+    text = text.strip()
+    if not text:
+        return query.order_by(column).limit(limit).all()
+
+    upper_bound = text[:-1] + chr(ord(text[-1]) + 1)
+    rows = query.filter(column >= text, column < upper_bound).order_by(column).limit(limit).all()
+
+    if len(rows) < limit:
+        found = {row[0] for row in rows}
+        substring_rows = query.filter(
+            func.lower(column).contains(text.lower(), autoescape=True)
+        ).order_by(column).limit(limit).all()
+
+        rows += [row for row in substring_rows if row[0] not in found][:limit - len(rows)]
+
+    return rows
+
+def search_machines(text: str, limit: int = SEARCH_LIMIT) -> list[dict[str, Any]]:
+    """
+    Find machines by serial number.
+
+    Args:
+        text: Serial number or part of it.
+        limit: Maximum number of results.
+
+    Returns:
+        list: Dictionaries with id, value (serial number) and label.
+    """
+    query = db.session.query(
+        Machine.id, Machine.serial_number, MachineType.name
+    ).join(MachineType, Machine.machine_type_id == MachineType.id)
+
+    return [
+        {"id": id, "value": serial_number, "label": f"{serial_number} - {type_name}"}
+        for id, serial_number, type_name in match(query, Machine.serial_number, text, limit)
+    ]
+
+def search_parts(text: str, lang: str, limit: int = SEARCH_LIMIT) -> list[dict[str, Any]]:
+    """
+    Find parts by part number.
+
+    Args:
+        text: Part number or part of it.
+        lang: Language of the part name in the label.
+        limit: Maximum number of results.
+
+    Returns:
+        list: Dictionaries with id, value (part number) and label.
+    """
+    query = db.session.query(Part.id, Part.part_number, Part.name_en, Part.name_lt)
+
+    return [
+        {"id": id, "value": part_number, "label": f"{part_number} - {name_en if lang == 'en' else name_lt}"}
+        for id, part_number, name_en, name_lt in match(query, Part.part_number, text, limit)
+    ]
+
+def search_clients(text: str, limit: int = SEARCH_LIMIT) -> list[dict[str, Any]]:
+    """
+    Find clients by company name.
+
+    Args:
+        text: Company name or part of it.
+        limit: Maximum number of results.
+
+    Returns:
+        list: Dictionaries with id, value and label ("company - city").
+    """
+    query = db.session.query(Client.id, Client.company, Client.city)
+
+    return [
+        {"id": id, "value": f"{company} - {city}", "label": f"{company} - {city}"}
+        for id, company, city in match(query, Client.company, text, limit)
+    ]
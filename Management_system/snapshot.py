@@ -0,0 +1,172 @@
+import os
+import sqlite3
+import logging
+import tempfile
+from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Optional
+from flask import Flask, g
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from . import app, db
+
+snapshot_logger = logging.getLogger(__name__)
+
+
+class ReportSnapshot:
+    """
+    Read-only copy of the live database for report queries.
+
+    The copy is taken with SQLite's online backup API into a temporary file
+    and swapped in with an atomic rename, so report scans never hold locks on
+    the database engineers are writing to. When `REPORT_SNAPSHOT` is enabled a
+    background thread refreshes the copy every `REPORT_SNAPSHOT_INTERVAL`
+    seconds; `refresh` can also be called on demand.
+    """
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self._lock = Lock()
+        self._engine: Optional[Engine] = None
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def path(self) -> str:
+        """Snapshot file, relative paths resolved against the instance folder."""
+        return os.path.join(self.app.instance_path, self.app.config["REPORT_SNAPSHOT_PATH"])
+
+    @property
+    def enabled(self) -> bool:
+        return self.app.config["REPORT_SNAPSHOT"]
+
+    def taken_at(self) -> Optional[datetime]:
+        """Return when the current snapshot was taken, or None without one."""
+        try:
+            return datetime.fromtimestamp(os.path.getmtime(self.path))
+        except OSError:
+            return None
+
+    def age(self) -> Optional[float]:
+        """Return the snapshot age in seconds, or None without one."""
+        taken_at = self.taken_at()
+        if taken_at is None:
+            return None
+        return max((datetime.now() - taken_at).total_seconds(), 0.0)
+
+    def refresh(self) -> datetime:
+        """
+        Copy the live database into a new snapshot.
+
+        Must run inside an application context. Connections already reading
+        the previous snapshot keep it until they are returned to the pool.
+
+        Returns:
+            datetime: When the new snapshot was taken.
+        """
+        path = self.path
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Each refresh, also in other worker processes, writes its own file.
+            fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+            os.close(fd)
+            try:
+                source = db.engine.raw_connection()
+                try:
+                    target = sqlite3.connect(temporary)
+                    try:
+                        source.driver_connection.backup(target)
+                        target.execute("PRAGMA journal_mode=DELETE")
+                    finally:
+                        target.close()
+                finally:
+                    source.close()
+                os.replace(temporary, path)
+            except BaseException:
+                os.remove(temporary)
+                raise
+
+            if self._engine is not None:
+                self._engine.dispose()
+
+        return self.taken_at()
+
+    def engine(self) -> Engine:
+        """Return the read-only engine of the snapshot, taking one if missing."""
+        if self.taken_at() is None:
+            self.refresh()
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    self._engine = create_engine(
+                        f"sqlite:///file:{self.path}?mode=ro&uri=true",
+                        connect_args={"check_same_thread": False}
+                    )
+        return self._engine
+
+    def dispose(self) -> None:
+        """Close the snapshot engine; the next report opens a new one."""
+        with self._lock:
+            if self._engine is not None:
+                self._engine.dispose()
+                self._engine = None
+
+    def start(self) -> None:
+        """Start the refresh thread if snapshots are enabled and it is not running."""
+        if not self.enabled:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = Thread(target=self._run, name="report-snapshot", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the refresh thread and wait for it to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        interval = self.app.config["REPORT_SNAPSHOT_INTERVAL"]
+        while not self._stop.is_set():
+            age = self.age()
+            if age is None or age >= interval:
+                try:
+                    with self.app.app_context():
+                        self.refresh()
+                except Exception:
+                    snapshot_logger.exception("Report snapshot refresh failed")
+                age = 0
+            self._stop.wait(interval - age)
+
+
+report_snapshot = ReportSnapshot(app)
+
+def report_session() -> Session:
+    """
+    Return the session report queries should run in.
+
+    With `REPORT_SNAPSHOT` enabled this is a session on the read-only
+    snapshot, kept for the rest of the request so templates can lazy-load
+    relationships; otherwise it is the regular `db.session`.
+    """
+    if not report_snapshot.enabled:
+        return db.session
+    if "report_session" not in g:
+        g.report_session = Session(bind=report_snapshot.engine())
+    return g.report_session
+
+@app.context_processor
+def inject_report_snapshot() -> dict[str, ReportSnapshot]:
+    """Make the snapshot available to report templates for showing its age."""
+    return dict(report_snapshot=report_snapshot)
+
+@app.teardown_appcontext
+def close_report_session(exception: Optional[BaseException]) -> None:
+    """Close the snapshot session opened during the request."""
+    session = g.pop("report_session", None)
+    if session is not None:
+        session.close()
@@ -59,25 +59,42 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 });
 
-function toggleDropdown(inputEl) {
-  const dropdown = inputEl.nextElementSibling;
-  dropdown.style.display = "block";
-}
-
 function selectOption(inputEl, value) {
   inputEl.value = value;
   inputEl.nextElementSibling.style.display = "none";
 }
 
-function filterFunction(inputEl) {
-  const filter = inputEl.value.toUpperCase();
+function searchOptions(inputEl, clearTarget = false) {
   const dropdown = inputEl.nextElementSibling;
-  const options = dropdown.getElementsByTagName("div");
+  const target = inputEl.dataset.target
+    ? document.getElementById(inputEl.dataset.target)
+    : null;
 
-  for (let i = 0; i < options.length; i++) {
-    const txtValue = options[i].textContent || options[i].innerText;
-    options[i].style.display = txtValue.toUpperCase().includes(filter) ? "" : "none";
+  if (target && clearTarget) {
+    target.value = "";
   }
+
+  clearTimeout(inputEl.searchTimer);
+  inputEl.searchTimer = setTimeout(function () {
+    const url = `${inputEl.dataset.searchUrl}?q=${encodeURIComponent(inputEl.value)}`;
+
+    fetch(url)
+      .then(response => response.json())
+      .then(items => {
+        dropdown.replaceChildren(...items.map(item => {
+          const option = document.createElement("div");
+          option.textContent = item.label;
+          option.addEventListener("click", function () {
+            selectOption(inputEl, item.value);
+            if (target) {
+              target.value = item.id;
+            }
+          });
+          return option;
+        }));
+        dropdown.style.display = items.length ? "block" : "none";
+      });
+  }, 200);
 }
 
 document.addEventListener("click", function (event) {
@@ -86,4 +103,24 @@ document.addEventListener("click", function (event) {
       dropdown.querySelector(".dropdown-content").style.display = "none";
     }
   });
-});
\ No newline at end of file
+});
+
+function loadMoreRows(button) {
+  const row = button.closest("tr");
+  button.disabled = true;
+
+  fetch(button.dataset.url)
+    .then(response => {
+      if (!response.ok) {
+        throw new Error(response.statusText);
+      }
+      return response.text();
+    })
+    .then(html => {
+      row.insertAdjacentHTML("afterend", html);
+      row.remove();
+    })
+    .catch(() => {
+      button.disabled = false;
+    });
+}
@@ -0,0 +1,149 @@
+from typing import Iterable, NamedTuple, Optional
+from sqlalchemy import select, update
+from sqlalchemy.dialects.sqlite import insert
+from . import db
+from .audit import record_change
+from .models import Inventory, PartsReplaced
+from .utils import retry_on_lock
+
+
+class StockChange(NamedTuple):
+    """Quantity change of a part at one location."""
+    part_id: int
+    location_id: int
+    before: Optional[int]
+    after: int
+
+
+def stock_levels(part_ids: Iterable[int]) -> dict[tuple[int, int], int]:
+    """
+    Read the quantities of parts at every location with one query.
+
+    Args:
+        part_ids: Parts to read.
+
+    Returns:
+        dict: Quantity by (part id, location id); locations without a row are missing.
+    """
+    rows = db.session.execute(
+        select(Inventory.part_id, Inventory.location_id, Inventory.quantity)
+        .where(Inventory.part_id.in_(list(part_ids)))
+    )
+    return {(part_id, location_id): quantity for part_id, location_id, quantity in rows}
+
+def stock_changes(current: dict[tuple[int, int], int], submitted: dict[tuple[int, int], int]) -> list[StockChange]:
+    """
+    Compare submitted quantities with the stored ones.
+
+    A location without an inventory row only counts as changed when a
+    positive quantity is submitted for it.
+
+    Args:
+        current: Stored quantities, as returned by `stock_levels`.
+        submitted: New quantity by (part id, location id).
+
+    Returns:
+        list: Changes in submitted order; `before` is None for new rows.
+    """
+    changes = []
+    for (part_id, location_id), quantity in submitted.items():
+        before = current.get((part_id, location_id))
+        if (before is None and quantity <= 0) or before == quantity:
+            continue
+        changes.append(StockChange(part_id, location_id, before, quantity))
+    return changes
+
+def set_stock_levels(changes: list[StockChange]) -> None:
+    """
+    Write changed quantities with one bulk upsert.
+
+    Rows are matched on the unique (part_id, location_id) index. The upsert
+    bypasses the flush, so the changes are audited here.
+
+    Args:
+        changes: Changes from `stock_changes`.
+    """
+    if not changes:
+        return
+
+    statement = insert(Inventory).values([
+        {"part_id": change.part_id, "location_id": change.location_id, "quantity": change.after}
+        for change in changes
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[Inventory.part_id, Inventory.location_id],
+        set_={"quantity": statement.excluded.quantity}
+    ).returning(Inventory.id, Inventory.part_id, Inventory.location_id)
+    ids = {
+        (part_id, location_id): inventory_id
+        for inventory_id, part_id, location_id in db.session.execute(statement)
+    }
+
+    for change in changes:
+        inventory_id = ids[(change.part_id, change.location_id)]
+        if change.before is None:
+            record_change(
+                "inventory", inventory_id, "create", None,
+                {"part_id": change.part_id, "location_id": change.location_id, "quantity": change.after}
+            )
+        else:
+            record_change(
+                "inventory", inventory_id, "update",
+                {"quantity": change.before}, {"quantity": change.after}
+            )
+
+def consume_stock(inventory_id: int, quantity: int) -> bool:
+    """
+    Take parts out of stock with one conditional UPDATE.
+
+    The check and the decrement happen in the same statement, so concurrent
+    bookings can never take the quantity below zero.
+
+    Args:
+        inventory_id: Inventory row to take from.
+        quantity: Number of parts.
+
+    Returns:
+        bool: False if the quantity is not positive or the row has fewer
+        parts than requested.
+    """
+    if quantity <= 0:
+        return False
+
+    result = db.session.execute(
+        update(Inventory)
+        .where(Inventory.id == inventory_id, Inventory.quantity >= quantity)
+        .values(quantity=Inventory.quantity - quantity)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return False
+
+    remaining = db.session.execute(
+        select(Inventory.quantity).where(Inventory.id == inventory_id)
+    ).scalar_one()
+    record_change(
+        "inventory", inventory_id, "update",
+        {"quantity": remaining + quantity}, {"quantity": remaining}
+    )
+    return True
+
+@retry_on_lock
+def book_replaced_part(replaced_part: PartsReplaced) -> bool:
+    """
+    Save a part replacement and take its parts out of stock in one transaction.
+
+    Args:
+        replaced_part: New replacement with `inventory_id` and `quantity` set.
+
+    Returns:
+        bool: False (nothing saved) if the quantity is not positive or there
+        is not enough stock.
+    """
+    if not consume_stock(replaced_part.inventory_id, replaced_part.quantity):
+        db.session.rollback()
+        return False
+
+    db.session.add(replaced_part)
+    db.session.commit()
+    return True
@@ -0,0 +1,233 @@
+import click
+from itertools import chain
+from typing import Any, Collection, Optional, Union
+from sqlalchemy import Select, and_, case, delete, event, func, inspect, or_, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from . import app, db
+from .models import Machine, MachineSummary, Part, PartsReplaced, Service
+
+SUMMARY_COLUMNS = (
+    "machine_id", "last_service_id", "last_service_date", "last_bn_count", "service_count", "parts_cost"
+)
+SUMMARY_MODELS = (Service, PartsReplaced, Machine)
+
+MachineIds = Union[Collection[int], Select]
+
+
+def summary_query(machine_ids: Optional[MachineIds] = None) -> Select:
+    """
+    Compute machine_summary rows from the services and part replacements.
+
+    Args:
+        machine_ids: Machines to compute, or None for all of them.
+
+    Returns:
+        Select: Rows with the SUMMARY_COLUMNS, one per machine with at least
+        one service or replaced part, ordered by machine id.
+    """
+    service_counts = select(
+        Service.machine_id, func.count(Service.id).label("service_count")
+    ).group_by(Service.machine_id)
+    parts_costs = select(
+        PartsReplaced.machine_id, func.sum(PartsReplaced.quantity * Part.price).label("parts_cost")
+    ).join(Part, PartsReplaced.part_id == Part.id).group_by(PartsReplaced.machine_id)
+    if machine_ids is not None:
+        service_counts = service_counts.where(Service.machine_id.in_(machine_ids))
+        parts_costs = parts_costs.where(PartsReplaced.machine_id.in_(machine_ids))
+    service_counts = service_counts.subquery()
+    parts_costs = parts_costs.subquery()
+
+    last_service_id = (
+        select(Service.id)
+        .where(Service.machine_id == Machine.id)
+        .order_by(Service.date.desc(), Service.id.desc())
+        .limit(1)
+        .correlate(Machine)
+        .scalar_subquery()
+    )
+    statement = (
+        select(
+            Machine.id,
+            Service.id,
+            Service.date,
+            Service.bn_count,
+            func.coalesce(service_counts.c.service_count, 0),
+            func.coalesce(parts_costs.c.parts_cost, 0.0),
+        )
+        .outerjoin(service_counts, service_counts.c.machine_id == Machine.id)
+        .outerjoin(parts_costs, parts_costs.c.machine_id == Machine.id)
+        .outerjoin(Service, Service.id == last_service_id)
+        .where(or_(service_counts.c.machine_id.is_not(None), parts_costs.c.machine_id.is_not(None)))
+        .order_by(Machine.id)
+    )
+    if machine_ids is not None:
+        statement = statement.where(Machine.id.in_(machine_ids))
+    return statement
+
+def rebuild_summaries(connection: Connection, machine_ids: Optional[MachineIds] = None) -> None:
+    """
+    Replace the summary rows of some machines, or of all, with recomputed ones.
+
+    Args:
+        connection: Connection of the current transaction.
+        machine_ids: Machines to rebuild, or None for the whole table.
+    """
+    cleanup = delete(MachineSummary)
+    if machine_ids is not None:
+        cleanup = cleanup.where(MachineSummary.machine_id.in_(machine_ids))
+    connection.execute(cleanup)
+    connection.execute(insert(MachineSummary).from_select(SUMMARY_COLUMNS, summary_query(machine_ids)))
+
+def stale_summaries(connection: Connection) -> list[int]:
+    """
+    Compare machine_summary with freshly computed rows.
+
+    Parts costs are compared to the cent, since summing floats row by row
+    and in one aggregate may differ in the last digits.
+
+    Returns:
+        list: Ids of the machines whose summary is wrong, missing or extra.
+    """
+    def rows(statement: Select) -> dict[int, tuple]:
+        return {
+            row[0]: (*row[1:-1], round(row[-1], 2))
+            for row in connection.execute(statement)
+        }
+
+    expected = rows(summary_query())
+    stored = rows(select(*(getattr(MachineSummary, column) for column in SUMMARY_COLUMNS)))
+    return sorted(
+        machine_id for machine_id in expected.keys() | stored.keys()
+        if expected.get(machine_id) != stored.get(machine_id)
+    )
+
+def add_services(connection: Connection, services: list[Service]) -> None:
+    """Count new services and move each machine's last service forward."""
+    statement = insert(MachineSummary)
+    new = statement.excluded
+    is_newer = or_(
+        MachineSummary.last_service_date.is_(None),
+        new.last_service_date > MachineSummary.last_service_date,
+        and_(
+            new.last_service_date == MachineSummary.last_service_date,
+            new.last_service_id > MachineSummary.last_service_id
+        ),
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[MachineSummary.machine_id],
+        set_={
+            "service_count": MachineSummary.service_count + 1,
+            **{
+                column: case((is_newer, getattr(new, column)), else_=getattr(MachineSummary, column))
+                for column in ("last_service_id", "last_service_date", "last_bn_count")
+            },
+        },
+    )
+    connection.execute(statement, [
+        {
+            "machine_id": service.machine_id, "last_service_id": service.id,
+            "last_service_date": service.date, "last_bn_count": service.bn_count,
+            "service_count": 1, "parts_cost": 0.0,
+        }
+        for service in services
+    ])
+
+def add_replaced_parts(connection: Connection, replaced_parts: list[PartsReplaced]) -> None:
+    """Add the cost of new part replacements at the parts' current prices."""
+    prices = dict(connection.execute(
+        select(Part.id, Part.price).where(Part.id.in_({replaced.part_id for replaced in replaced_parts}))
+    ).all())
+    statement = insert(MachineSummary)
+    statement = statement.on_conflict_do_update(
+        index_elements=[MachineSummary.machine_id],
+        set_={"parts_cost": MachineSummary.parts_cost + statement.excluded.parts_cost},
+    )
+    connection.execute(statement, [
+        {
+            "machine_id": replaced.machine_id, "service_count": 0,
+            "parts_cost": replaced.quantity * prices.get(replaced.part_id, 0.0),
+        }
+        for replaced in replaced_parts
+    ])
+
+def changed_machine_ids(session: Session) -> set[int]:
+    """
+    Return machines whose summary has to be recomputed rather than updated.
+
+    Covers edited or deleted services and replacements (under their old and
+    new machine) and deleted machines.
+    """
+    machine_ids = set()
+    for obj in chain(session.dirty, session.deleted):
+        if isinstance(obj, Machine) and obj in session.deleted:
+            machine_ids.add(obj.id)
+        elif isinstance(obj, (Service, PartsReplaced)):
+            if obj in session.deleted or session.is_modified(obj):
+                machine_ids.add(obj.machine_id)
+                machine_ids.update(inspect(obj).attrs.machine_id.history.deleted)
+    return machine_ids
+
+@event.listens_for(db.session, "before_flush")
+def collect_summary_changes(session: Session, flush_context: Any, instances: Any) -> None:
+    """
+    Note which summaries a flush invalidates, while old values can still be loaded.
+
+    Changing a part's price changes the parts cost of every machine it was
+    fitted to.
+    """
+    session.info["summary_machine_ids"] = changed_machine_ids(session)
+    session.info["summary_part_ids"] = {
+        obj.id for obj in session.dirty
+        if isinstance(obj, Part) and inspect(obj).attrs.price.history.has_changes()
+    }
+
+@event.listens_for(db.session, "after_flush")
+def update_machine_summary(session: Session, flush_context: Any) -> None:
+    """Apply a flush's services and part replacements to machine_summary."""
+    services = [obj for obj in session.new if isinstance(obj, Service)]
+    replaced_parts = [obj for obj in session.new if isinstance(obj, PartsReplaced)]
+    machine_ids = session.info.pop("summary_machine_ids", set())
+    part_ids = session.info.pop("summary_part_ids", set())
+    if not (services or replaced_parts or machine_ids or part_ids):
+        return
+
+    connection = session.connection()
+    if services:
+        add_services(connection, services)
+    if replaced_parts:
+        add_replaced_parts(connection, replaced_parts)
+    if machine_ids:
+        rebuild_summaries(connection, machine_ids)
+    if part_ids:
+        rebuild_summaries(
+            connection,
+            select(PartsReplaced.machine_id).where(PartsReplaced.part_id.in_(part_ids)).distinct()
+        )
+
+def ensure_machine_summary() -> None:
+    """Create and fill machine_summary on databases that predate it."""
+    if db.session.execute(select(MachineSummary.machine_id).limit(1)).first() is None:
+        rebuild_summaries(db.session.connection())
+        db.session.commit()
+
+@app.cli.command("rebuild-machine-summary")
+@click.option("--verify", is_flag=True, help="Only report machines whose summary is out of date.")
+def rebuild_machine_summary_command(verify: bool) -> None:
+    """Recompute machine_summary from services and part replacements."""
+    MachineSummary.__table__.create(db.engine, checkfirst=True)
+    connection = db.session.connection()
+
+    if verify:
+        stale = stale_summaries(connection)
+        if stale:
+            raise click.ClickException(
+                f"{len(stale)} machine summaries out of date: {', '.join(map(str, stale[:20]))}"
+            )
+        click.echo("Machine summaries are up to date.")
+        return
+
+    rebuild_summaries(connection)
+    db.session.commit()
+    click.echo(f"Rebuilt {db.session.query(MachineSummary).count()} machine summaries.")
@@ -0,0 +1,273 @@
+from datetime import date
+from itertools import chain
+from typing import Any, NamedTuple, Optional
+from sqlalchemy import Select, func, literal_column, select
+from sqlalchemy.orm import Session
+from .models import Client, Machine, MachineType, Service
+from .snapshot import report_session
+
+# julianday() of a date minus this offset is the date's proleptic ordinal.
+JULIAN_ORDINAL_OFFSET = 1721424.5
+OUTLIER_FACTOR = 3.0
+MIN_INTERVALS = 3
+
+
+class CounterSeries(NamedTuple):
+    """Banknote counter readings, sorted by machine and date, one array per column."""
+    machine_ids: Any
+    days: Any
+    counts: Any
+
+
+class Intervals(NamedTuple):
+    """
+    Counter increase between consecutive services of the same machine.
+
+    `rates` is the daily rate, NaN for same-day services and counter resets.
+    `outliers` marks resets and rates far above the machine's average.
+    """
+    machine_ids: Any
+    start: Any
+    end: Any
+    banknotes: Any
+    days: Any
+    rates: Any
+    resets: Any
+    outliers: Any
+
+
+class MachineUsage(NamedTuple):
+    """Per machine totals over its intervals, one array per column."""
+    machine_ids: Any
+    intervals: Any
+    banknotes: Any
+    days: Any
+    daily_rates: Any
+    peak_rates: Any
+    outliers: Any
+
+
+class UsageReport(NamedTuple):
+    """Fleet summary, busiest machines and outlier intervals of a usage report."""
+    fleet: dict
+    machines: list
+    outliers: list
+
+
+def counter_series_query(date_from: date, date_to: date, client_id: Optional[int] = None) -> Select:
+    """
+    Select machine id, day number and counter of services in a date range,
+    ordered by machine and date.
+
+    The date condition is marked as likely true so SQLite walks the
+    (machine_id, date) index in order, checking dates inside the index,
+    instead of searching the date index and sorting every row afterwards.
+
+    Args:
+        date_from: First day.
+        date_to: Last day.
+        client_id: Client whose machines to read, or None for the whole fleet.
+    """
+    statement = (
+        select(Service.machine_id, func.julianday(Service.date) - JULIAN_ORDINAL_OFFSET, Service.bn_count)
+        .where(func.likelihood(Service.date.between(date_from, date_to), literal_column("0.9")))
+        .order_by(Service.machine_id, Service.date, Service.id)
+    )
+    if client_id:
+        statement = statement.join(Machine, Service.machine_id == Machine.id).where(Machine.client_id == client_id)
+    return statement
+
+def load_counter_series(
+    date_from: date, date_to: date, client_id: Optional[int] = None, session: Optional[Session] = None
+) -> CounterSeries:
+    """
+    Read the counter readings of services in a date range in one query.
+
+    Dates are read as day numbers computed by SQLite, and the rows are read
+    through the connection and copied into arrays, so no ORM row or Python
+    date is built per service.
+
+    Args:
+        date_from: First day.
+        date_to: Last day.
+        client_id: Client whose machines to read, or None for the whole fleet.
+        session: Session to read from, the report session by default.
+    """
+    import numpy as np
+
+    if session is None:
+        session = report_session()
+    rows = session.connection().execute(counter_series_query(date_from, date_to, client_id)).all()
+    data = np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=len(rows) * 3).reshape(-1, 3)
+    machine_ids, days, counts = data.astype(np.int64).T
+    return CounterSeries(machine_ids, days, counts)
+
+def counter_intervals(series: CounterSeries) -> Intervals:
+    """
+    Compute the intervals between consecutive readings of each machine.
+
+    A counter that went down was reset or replaced; such intervals have no
+    rate and are always outliers. Other intervals are outliers when their rate
+    exceeds OUTLIER_FACTOR times the machine's average rate, for machines with
+    at least MIN_INTERVALS rated intervals.
+    """
+    import numpy as np
+
+    same_machine = series.machine_ids[1:] == series.machine_ids[:-1]
+    machine_ids = series.machine_ids[1:][same_machine]
+    start = series.days[:-1][same_machine]
+    end = series.days[1:][same_machine]
+    banknotes = np.diff(series.counts)[same_machine]
+    days = end - start
+
+    resets = banknotes < 0
+    rated = ~resets & (days > 0)
+    rates = np.full(len(days), np.nan)
+    np.divide(banknotes, days, out=rates, where=rated)
+
+    group = group_index(machine_ids)
+    rated_banknotes = np.bincount(group, weights=np.where(rated, banknotes, 0))
+    rated_days = np.bincount(group, weights=np.where(rated, days, 0))
+    rated_intervals = np.bincount(group, weights=rated)
+    average = np.divide(rated_banknotes, rated_days, out=np.zeros(len(rated_days)), where=rated_days > 0)
+
+    spikes = (
+        rated
+        & (rated_intervals[group] >= MIN_INTERVALS)
+        & (np.where(rated, rates, 0) > OUTLIER_FACTOR * average[group])
+    )
+    return Intervals(machine_ids, start, end, banknotes, days, rates, resets, resets | spikes)
+
+def group_index(machine_ids: Any) -> Any:
+    """Number the runs of equal ids in a sorted id array 0, 1, 2..."""
+    import numpy as np
+
+    if not len(machine_ids):
+        return np.zeros(0, dtype=np.int64)
+    return np.cumsum(np.concatenate(([0], machine_ids[1:] != machine_ids[:-1])))
+
+def machine_usage(intervals: Intervals) -> MachineUsage:
+    """
+    Total the intervals of each machine.
+
+    The daily rate is rated banknotes over rated days, so long intervals
+    weigh more than short ones.
+    """
+    import numpy as np
+
+    group = group_index(intervals.machine_ids)
+    starts = np.flatnonzero(np.concatenate(([True], group[1:] != group[:-1]))) if len(group) else group
+    rated = ~np.isnan(intervals.rates)
+
+    banknotes = np.bincount(group, weights=np.where(rated, intervals.banknotes, 0))
+    days = np.bincount(group, weights=np.where(rated, intervals.days, 0))
+    daily_rates = np.divide(banknotes, days, out=np.zeros(len(days)), where=days > 0)
+    peak_rates = (
+        np.maximum.reduceat(np.where(rated, intervals.rates, 0), starts) if len(group) else np.zeros(0)
+    )
+    return MachineUsage(
+        intervals.machine_ids[starts],
+        np.bincount(group),
+        banknotes.astype(np.int64),
+        days.astype(np.int64),
+        daily_rates,
+        peak_rates,
+        np.bincount(group, weights=intervals.outliers).astype(np.int64),
+    )
+
+def fleet_usage(series: CounterSeries, intervals: Intervals, machines: MachineUsage) -> dict:
+    """Summarize the whole fleet: counts, banknotes and daily rates."""
+    import numpy as np
+
+    rated = ~np.isnan(intervals.rates)
+    days = int(intervals.days[rated].sum())
+    banknotes = int(intervals.banknotes[rated].sum())
+    return {
+        "services": len(series.machine_ids),
+        "machines": len(machines.machine_ids),
+        "intervals": len(intervals.machine_ids),
+        "banknotes": banknotes,
+        "daily_rate": round(banknotes / days, 1) if days else 0.0,
+        "median_daily_rate": round(float(np.median(machines.daily_rates)), 1) if len(machines.machine_ids) else 0.0,
+        "resets": int(intervals.resets.sum()),
+        "outliers": int(intervals.outliers.sum()),
+    }
+
+def machine_details(machine_ids: list[int]) -> dict[int, tuple[str, str, str]]:
+    """Return serial number, client and machine type of each machine id."""
+    if not machine_ids:
+        return {}
+    rows = report_session().execute(
+        select(Machine.id, Machine.serial_number, Client.company, MachineType.name)
+        .outerjoin(Client, Machine.client_id == Client.id)
+        .outerjoin(MachineType, Machine.machine_type_id == MachineType.id)
+        .where(Machine.id.in_(machine_ids))
+    )
+    return {machine_id: details for machine_id, *details in rows}
+
+def usage_report(
+    date_from: date, date_to: date, client_id: Optional[int] = None, top: Optional[int] = None
+) -> UsageReport:
+    """
+    Analyse banknote counter throughput of services in a date range.
+
+    Only intervals with both services inside the range are counted.
+
+    Args:
+        date_from: First day.
+        date_to: Last day.
+        client_id: Client whose machines to analyse, or None for the fleet.
+        top: Number of busiest machines and latest outliers to list, or None
+            for all of them.
+
+    Returns:
+        UsageReport: Fleet summary, machines by daily rate (highest first) and
+        outlier intervals (latest first), as plain values ready for JSON.
+    """
+    import numpy as np
+
+    series = load_counter_series(date_from, date_to, client_id)
+    intervals = counter_intervals(series)
+    machines = machine_usage(intervals)
+    fleet = fleet_usage(series, intervals, machines)
+
+    busiest = np.argsort(-machines.daily_rates, kind="stable")[:top]
+    latest = np.flatnonzero(intervals.outliers)[np.argsort(-intervals.end[intervals.outliers], kind="stable")][:top]
+    details = machine_details(sorted(
+        {int(machine_id) for machine_id in machines.machine_ids[busiest]}
+        | {int(machine_id) for machine_id in intervals.machine_ids[latest]}
+    ))
+
+    def machine_fields(machine_id: int) -> dict:
+        serial_number, client, machine_type = details.get(machine_id, (None, None, None))
+        return {
+            "machine_id": machine_id, "serial_number": serial_number,
+            "client": client, "machine_type": machine_type,
+        }
+
+    return UsageReport(
+        fleet,
+        [
+            {
+                **machine_fields(int(machines.machine_ids[i])),
+                "intervals": int(machines.intervals[i]),
+                "banknotes": int(machines.banknotes[i]),
+                "days": int(machines.days[i]),
+                "daily_rate": round(float(machines.daily_rates[i]), 1),
+                "peak_rate": round(float(machines.peak_rates[i]), 1),
+                "outliers": int(machines.outliers[i]),
+            }
+            for i in busiest
+        ],
+        [
+            {
+                **machine_fields(int(intervals.machine_ids[i])),
+                "date_from": date.fromordinal(int(intervals.start[i])).isoformat(),
+                "date_to": date.fromordinal(int(intervals.end[i])).isoformat(),
+                "banknotes": int(intervals.banknotes[i]),
+                "daily_rate": None if intervals.resets[i] else round(float(intervals.rates[i]), 1),
+                "reset": bool(intervals.resets[i]),
+            }
+            for i in latest
+        ],
+    )
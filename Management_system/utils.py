@@ -1,14 +1,17 @@
 import os
 import uuid
+import time
+import random
 import logging
 from datetime import datetime, timedelta, timezone, date
 from calendar import monthrange
 from functools import wraps
 from flask import request, g
-from flask_mail import Message
-from typing import Callable, Union, Optional, Tuple
+from typing import Any, Callable, Union, Optional, Tuple
+from sqlalchemy.exc import OperationalError
 from Management_system import get_translations, mail, db, models, bcrypt
 from .models import OneTimeLink
+from .log_writer import LogWriter, start_log_writer
 from markupsafe import Markup
 
 def create_default_admin() -> None:
@@ -27,6 +30,31 @@ def create_default_admin() -> None:
         db.session.add(admin)
         db.session.commit()
 
+def upgrade_schema() -> list[str]:
+    """
+    Create indexes declared on the models that are missing from an existing database.
+
+    `db.create_all()` only creates missing tables, so indexes added to tables that
+    already exist have to be created separately.
+
+    Returns:
+        Names of the indexes that were created.
+    """
+    created = []
+    inspector = db.inspect(db.engine)
+
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(db.engine)
+                created.append(index.name)
+
+    return created
+
 def localization(func: Callable) -> Callable:
     """
     Decorator that injects localization data (`lang`, `tr`) into Flask's global `g`.
@@ -60,24 +88,30 @@ def strip_tags(html: str) -> str:
 
 def send_email(subject: str, recipients: Union[str, list[str]], html: str) -> None:
     """
-    Send an HTML email to one or more recipients.
+    Queue an HTML email to one or more recipients.
+
+    The email is added to the mail outbox and delivered by the background
+    mail worker once the caller commits, so the request does not wait for
+    the SMTP server. The caller's session is neither committed nor rolled
+    back here.
 
     Args:
         subject: Email subject.
         recipients: Single email or list of email addresses.
         html: HTML content of the email.
     """
+    from .mailer import enqueue_email
+
     if isinstance(recipients, str):
         recipients = [recipients]
-
-    msg = Message(subject=subject, recipients=recipients)
-    msg.html = html
+    if not recipients:
+        return
 
     try:
-        mail.send(msg)
-        log_mail_sender(recipients, subject, "Sent")
+        enqueue_email(subject, recipients, html)
+        log_mail_sender(recipients, subject, "Queued")
     except Exception as e:
-        log_mail_sender(recipients, subject, f"Failed to send: {e}")
+        log_mail_sender(recipients, subject, f"Failed to queue: {e}")
 
 
 def generate_link(purpose: str, email: str) -> str:
@@ -105,6 +139,8 @@ def generate_link(purpose: str, email: str) -> str:
     return token
 
 LOG_DIR = "logs"
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 30
 os.makedirs(LOG_DIR, exist_ok=True)
 
 formatter = logging.Formatter(
@@ -112,18 +148,18 @@ formatter = logging.Formatter(
     datefmt="%Y-%m-%d %H:%M:%S"
 )
 
+log_writer = LogWriter(max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT)
+
 user_logger = logging.getLogger("user_actions")
-user_handler = logging.FileHandler(os.path.join(LOG_DIR, "user_actions.log"), encoding='utf-8')
-user_handler.setFormatter(formatter)
-user_logger.addHandler(user_handler)
+log_writer.add_logger(user_logger, os.path.join(LOG_DIR, "user_actions.log"), formatter)
 user_logger.setLevel(logging.INFO)
 
 mail_logger = logging.getLogger("mail_sender")
-mail_handler = logging.FileHandler(os.path.join(LOG_DIR, "mail_sender.log"), encoding='utf-8')
-mail_handler.setFormatter(formatter)
-mail_logger.addHandler(mail_handler)
+log_writer.add_logger(mail_logger, os.path.join(LOG_DIR, "mail_sender.log"), formatter)
 mail_logger.setLevel(logging.INFO)
 
+start_log_writer(log_writer)
+
 
 def log_user_action(user: str, action: str, details: str = "", level: str = "info") -> None:
     """
@@ -194,4 +230,35 @@ def password_strenght(password: str) -> bool:
     if not any (character.isdigit() for character in password):
         return False
     return True
-    
\ No newline at end of file
+    
+
+LOCK_RETRIES = 5
+LOCK_RETRY_DELAY = 0.05
+
+
+def is_database_locked(error: OperationalError) -> bool:
+    """Return True if SQLite gave up waiting for another writer."""
+    return "database is locked" in str(error.orig)
+
+def lock_retry_delay(attempt: int) -> float:
+    """Return the backoff in seconds before retry number `attempt` (from 0), with jitter."""
+    return LOCK_RETRY_DELAY * 2 ** attempt * random.uniform(0.5, 1.5)
+
+def retry_on_lock(func: Callable) -> Callable:
+    """
+    Retry a transaction when SQLite reports "database is locked".
+
+    The session is rolled back and the whole function runs again after an
+    exponential backoff with jitter, up to LOCK_RETRIES times.
+    """
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        for attempt in range(LOCK_RETRIES + 1):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as error:
+                db.session.rollback()
+                if attempt == LOCK_RETRIES or not is_database_locked(error):
+                    raise
+                time.sleep(lock_retry_delay(attempt))
+    return wrapper
@@ -0,0 +1,96 @@
+"""
+Benchmark of audit trail lookups over a year of history.
+
+Fills an in-memory audit_log table with a year of changes and times the
+queries behind the admin audit view ("who changed inventory row X", one
+user's changes, everything), first page and a deep page. For comparison it
+also times scanning an equivalent flat user_actions.log for one part.
+
+Usage:
+    python benchmarks/bench_audit.py [--rows 300000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system import app, db
+from Management_system.audit import audit_page
+from Management_system.models import AuditEntry
+
+ENTITY_TYPES = ["inventory", "machines", "services", "parts_replaced", "visits"]
+
+
+def fill(rows: int) -> list[dict]:
+    random.seed(1)
+    start = datetime(2025, 1, 1)
+    step = timedelta(days=365) / rows
+    entries = [
+        {
+            "user_id": random.randint(1, 20),
+            "action": "update",
+            "entity_type": random.choice(ENTITY_TYPES),
+            "entity_id": random.randint(1, 2000),
+            "before": {"quantity": i},
+            "after": {"quantity": i + 1},
+            "created_at": start + step * i,
+        }
+        for i in range(rows)
+    ]
+    for i in range(0, rows, 10000):
+        db.session.execute(AuditEntry.__table__.insert(), entries[i:i + 10000])
+    db.session.commit()
+    return entries
+
+
+def timed(name: str, query, repeat: int = 20) -> None:
+    query()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = query()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{name:<40} {elapsed * 1000:8.2f} ms  ({len(result.items)} rows)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with app.app_context(), patch.dict(db._app_engines[app], {None: engine}):
+        db.create_all()
+        entries = fill(args.rows)
+        middle = entries[args.rows // 2]
+        cursor = (middle["created_at"], args.rows // 2)
+
+        timed("entity history, first page", lambda: audit_page("inventory", 42))
+        timed("entity type, deep page", lambda: audit_page("inventory", after=cursor))
+        timed("user, deep page", lambda: audit_page(user_id=7, after=cursor))
+        timed("all entries, deep page", lambda: audit_page(after=cursor))
+
+    with tempfile.NamedTemporaryFile("w+", suffix=".log") as log:
+        for entry in entries:
+            log.write(
+                f"[{entry['created_at']:%Y-%m-%d %H:%M:%S}] [INFO] USER: User{entry['user_id']} | "
+                f"ACTION: Update_Part | DETAILS: (Part: P-{entry['entity_id']}; Qty: 1)\n"
+            )
+        log.flush()
+
+        start = time.perf_counter()
+        log.seek(0)
+        matches = [line for line in log if "Part: P-42;" in line]
+        print(f"{'flat log scan for one part':<40} {(time.perf_counter() - start) * 1000:8.2f} ms  ({len(matches)} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark of report exports over a year of part replacements.
+
+Fills a file database with replacements, then downloads the replaced parts
+report for the whole year as CSV and XLSX through the export endpoint, and
+for comparison loads the same rows as ORM objects the way the HTML report
+does. Reports time, output size and peak Python memory.
+
+Usage:
+    python benchmarks/bench_exports.py [--rows 200000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import joinedload
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system import app, db
+from Management_system.models import Client, Machine, MachineType, Part, PartsReplaced, User
+
+
+def seed(rows: int) -> None:
+    db.session.add_all([
+        User(name="Admin", surname="A", phone_number="1", email="admin@test.lt", password="x", is_admin=True),
+        Client(company="Bank", address="Street 1", city="Vilnius", contact_person="Jonas",
+               phone_number="100", email="bank@test.lt"),
+        MachineType(name="BPS C1"),
+    ])
+    db.session.flush()
+    db.session.execute(Part.__table__.insert(), [
+        {"part_number": f"P-{i}", "name_en": f"Part {i}", "name_lt": f"Detale {i}", "price": 10 + i}
+        for i in range(500)
+    ])
+    db.session.execute(Machine.__table__.insert(), [
+        {
+            "serial_number": f"S-{i}", "start_of_operation": date(2020, 1, 1), "end_of_warranty": date(2022, 1, 1),
+            "machine_type_id": 1, "client_id": 1, "is_active": True
+        }
+        for i in range(800)
+    ])
+    start = date(2025, 1, 1)
+    for offset in range(0, rows, 10000):
+        db.session.execute(PartsReplaced.__table__.insert(), [
+            {
+                "date": start + timedelta(days=i % 365), "part_id": i % 500 + 1, "quantity": 1,
+                "machine_id": i % 800 + 1, "warranty": i % 3 == 0, "inventory_id": 1
+            }
+            for i in range(offset, min(offset + 10000, rows))
+        ])
+    db.session.commit()
+
+
+def measure(label: str, run) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {elapsed:7.2f} s   {size / 1024 / 1024:7.1f} MB out   peak {peak / 1024 / 1024:7.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        app.config.update(TESTING=True, MAIL_WORKER=False)
+
+        with patch.dict(db._app_engines[app], {None: engine}), \
+             patch("Management_system.routes.log_user_action"):
+            with app.app_context():
+                db.create_all()
+                seed(args.rows)
+
+            def load_orm() -> int:
+                with app.app_context():
+                    rows = PartsReplaced.query.join(Machine).filter(
+                        Machine.client_id == 1,
+                        PartsReplaced.date.between(date(2025, 1, 1), date(2025, 12, 31))
+                    ).options(joinedload(PartsReplaced.part), joinedload(PartsReplaced.machine)).all()
+                    return sum(len(row.part.part_number) for row in rows)
+
+            with app.test_client() as client:
+                with client.session_transaction() as session:
+                    session['_user_id'] = "1"
+
+                def download(fmt: str):
+                    def run() -> int:
+                        response = client.get(
+                            f"/en/reports/parts.{fmt}?client=1&date_from=2025-01-01&date_to=2025-12-31",
+                            buffered=False
+                        )
+                        size = sum(len(chunk) for chunk in response.response)
+                        response.close()
+                        return size
+                    return run
+
+                measure("HTML report ORM load", load_orm)
+                measure("CSV export", download("csv"))
+                measure("XLSX export", download("xlsx"))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark of onboarding a customer's machines from a CSV file.
+
+Creates a file database with existing machines, then adds a bank's machines
+the way the new machine form does it (uniqueness lookup, insert and commit
+per machine) and with the machine import pipeline, timing both and counting
+SQL statements.
+
+Usage:
+    python benchmarks/bench_imports.py [--machines 800] [--existing 20000]
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from unittest.mock import patch
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import create_engine, event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system import app, db
+from Management_system.imports import import_data
+from Management_system.models import Client, Machine, MachineType
+
+
+def seed(existing: int) -> None:
+    db.session.add_all([MachineType(name="BPS C1"), MachineType(name="BPS M7")])
+    db.session.add(Client(company="Bank", address="Street 1", city="Vilnius", contact_person="Jonas",
+                          phone_number="100", email="bank@test.lt"))
+    db.session.flush()
+    db.session.execute(Machine.__table__.insert(), [
+        {
+            "serial_number": f"OLD-{i}", "start_of_operation": date(2020, 1, 1),
+            "end_of_warranty": date(2022, 1, 1), "machine_type_id": 1, "client_id": 1, "is_active": True
+        }
+        for i in range(existing)
+    ])
+    db.session.commit()
+
+
+def one_by_one(rows: list[dict]) -> None:
+    for row in rows:
+        if Machine.query.filter_by(serial_number=row["serial_number"]).first():
+            continue
+        client = Client.query.filter(Client.email == row["client_email"]).first()
+        machine_type = MachineType.query.filter_by(name=row["machine_type"]).first()
+        start = date.fromisoformat(row["start_of_operation"])
+        db.session.add(Machine(
+            serial_number=row["serial_number"], machine_type_id=machine_type.id, client_id=client.id,
+            start_of_operation=start, end_of_warranty=start + relativedelta(years=int(row["warranty"]))
+        ))
+        db.session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--machines", type=int, default=800)
+    parser.add_argument("--existing", type=int, default=20000)
+    args = parser.parse_args()
+
+    for label in ("one by one", "import"):
+        rows = [
+            {
+                "serial_number": f"NEW-{i}", "machine_type": "BPS M7", "client_email": "bank@test.lt",
+                "start_of_operation": "2025-06-01", "warranty": "2"
+            }
+            for i in range(args.machines)
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+            statements = []
+            event.listen(engine, "before_cursor_execute", lambda *_: statements.append(1))
+
+            with app.app_context(), patch.dict(db._app_engines[app], {None: engine}):
+                db.create_all()
+                seed(args.existing)
+                statements.clear()
+
+                start = time.perf_counter()
+                if label == "import":
+                    lines = [",".join(rows[0])] + [",".join(row.values()) for row in rows]
+                    result = import_data("machines", io.StringIO("\n".join(lines)))
+                    assert result.created == args.machines, result.issues[:3]
+                else:
+                    one_by_one(rows)
+                elapsed = time.perf_counter() - start
+
+                assert Machine.query.count() == args.existing + args.machines
+                db.session.remove()
+            engine.dispose()
+
+        print(f"{label:<11} {elapsed:7.2f} s   {len(statements):6} statements   {args.machines} machines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Micro-benchmark of per-request translation lookup cost.
+
+Compares re-reading translations.json on every call (the previous behaviour)
+with the compiled process-wide catalog. A page render looks translations up
+twice (localization decorator and context processor).
+
+Usage:
+    python benchmarks/bench_localization.py
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system.localization import TRANSLATIONS_PATH, get_translations
+
+CALLS_PER_REQUEST = 2
+REQUESTS = 2000
+
+
+def get_translations_uncached(lang: str = 'en') -> dict[str, str]:
+    with open(TRANSLATIONS_PATH, encoding='utf-8') as f:
+        full_dict = json.load(f)
+    return {key: value.get(lang, key) for key, value in full_dict.items()}
+
+
+def request_uncached() -> None:
+    for _ in range(CALLS_PER_REQUEST):
+        get_translations_uncached('lt')
+
+
+def request_cached() -> None:
+    for _ in range(CALLS_PER_REQUEST):
+        get_translations('lt')
+
+
+def main() -> None:
+    get_translations('lt')
+    results = {
+        "before (json.load per call)": timeit.timeit(request_uncached, number=REQUESTS),
+        "after (compiled catalog)": timeit.timeit(request_cached, number=REQUESTS),
+    }
+    for name, total in results.items():
+        print(f"{name:<30} {total / REQUESTS * 1e6:10.1f} us/request")
+
+    before, after = results.values()
+    print(f"{'speedup':<30} {before / after:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Throughput benchmark of the file logging pipeline under concurrent writers.
+
+Compares a plain FileHandler (the previous setup, one synchronous write per
+record on the calling thread) with the queue-based LogWriter. Reports the
+throughput seen by the logging threads, the total time until every record
+is on disk and the p99.9 latency of a single logging call, then runs several processes appending to one file and checks
+that no line is lost or torn.
+
+Usage:
+    python benchmarks/bench_logging.py [--threads 8] [--records 5000] [--processes 4]
+"""
+import argparse
+import gzip
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from threading import Thread
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system.log_writer import LogWriter
+
+FORMATTER = logging.Formatter("[%(asctime)s] [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+MESSAGE = "USER: Jonas | ACTION: Edit_Machine | DETAILS: (Serial number: SN-%d)"
+
+
+def make_logger(name: str) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def log_concurrently(logger: logging.Logger, threads: int, records: int) -> tuple[float, float]:
+    latencies: list[float] = []
+
+    def work() -> None:
+        timings = []
+        for i in range(records):
+            call_start = time.perf_counter()
+            logger.info(MESSAGE, i)
+            timings.append(time.perf_counter() - call_start)
+        latencies.extend(timings)
+
+    workers = [Thread(target=work) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return elapsed, latencies[int(len(latencies) * 0.999)]
+
+
+def bench_file_handler(directory: str, threads: int, records: int) -> tuple[float, float, float]:
+    logger = make_logger("bench.file_handler")
+    handler = logging.FileHandler(os.path.join(directory, "file_handler.log"), encoding="utf-8")
+    handler.setFormatter(FORMATTER)
+    logger.addHandler(handler)
+
+    elapsed, p999 = log_concurrently(logger, threads, records)
+    handler.close()
+    return elapsed, elapsed, p999
+
+
+def bench_log_writer(directory: str, threads: int, records: int) -> tuple[float, float, float]:
+    logger = make_logger("bench.log_writer")
+    writer = LogWriter(max_bytes=10 * 1024 * 1024, backup_count=30)
+    writer.add_logger(logger, os.path.join(directory, "log_writer.log"), FORMATTER)
+    writer.start()
+
+    start = time.perf_counter()
+    blocked, p999 = log_concurrently(logger, threads, records)
+    writer.stop()
+    return blocked, time.perf_counter() - start, p999
+
+
+def process_worker(path: str, records: int) -> None:
+    logger = make_logger("bench.process")
+    writer = LogWriter(max_bytes=1024 * 1024, backup_count=1000)
+    writer.add_logger(logger, path, FORMATTER)
+    writer.start()
+    for i in range(records):
+        logger.info(MESSAGE, i)
+    writer.stop()
+
+
+def bench_processes(directory: str, processes: int, records: int) -> tuple[float, int]:
+    path = os.path.join(directory, "processes.log")
+    workers = [
+        multiprocessing.Process(target=process_worker, args=(path, records))
+        for _ in range(processes)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    lines = 0
+    for name in os.listdir(directory):
+        full_path = os.path.join(directory, name)
+        if name.startswith("processes.log") and name.endswith(".gz"):
+            with gzip.open(full_path, "rt", encoding="utf-8") as f:
+                lines += sum(1 for line in f if line.rstrip().endswith(")"))
+        elif name == "processes.log":
+            with open(full_path, encoding="utf-8") as f:
+                lines += sum(1 for line in f if line.rstrip().endswith(")"))
+    return elapsed, lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+    total = args.threads * args.records
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, bench in [("FileHandler", bench_file_handler), ("LogWriter", bench_log_writer)]:
+            blocked, on_disk, p999 = bench(directory, args.threads, args.records)
+            print(
+                f"{name:<12} {total / blocked:12,.0f} records/s logged"
+                f"   {total / on_disk:12,.0f} records/s on disk"
+                f"   p99.9 call {p999 * 1e6:8.1f} us"
+            )
+
+        elapsed, lines = bench_processes(directory, args.processes, args.records)
+        expected = args.processes * args.records
+        print(
+            f"{args.processes} processes {expected / elapsed:12,.0f} records/s on disk"
+            f"   {lines}/{expected} complete lines"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark of page loads that show machine type and location pickers.
+
+Fills an in-memory database with reference data and requests the part
+forms and price pages, counting SQL statements and timing each page with the
+reference-data cache warm and with it cleared before every request.
+
+Usage:
+    python benchmarks/bench_refdata.py [--requests 300]
+"""
+import argparse
+import os
+import sys
+import time
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system import app, db
+from Management_system.models import Location, MachineType, Part, User
+from Management_system.refdata import reference_cache
+
+PAGES = [
+    "/en/parts/new_part",
+    "/en/parts/add_replaced_part",
+    "/en/parts/update_part/P-1",
+    "/en/prices",
+    "/en/machines/add_new/",
+]
+
+
+def seed() -> None:
+    db.session.add_all([MachineType(name=f"Type {i}") for i in range(30)])
+    db.session.add_all([Location(location_en=f"Location {i}", location_lt=f"Vieta {i}") for i in range(10)])
+    db.session.add(Part(part_number="P-1", name_en="Belt", name_lt="Dirzas", price=10))
+    db.session.add(User(name="Admin", surname="A", phone_number="1", email="admin@test.lt", password="x", is_admin=True))
+    db.session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *_: statements.append(1))
+
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False, MAIL_WORKER=False)
+    with patch.dict(db._app_engines[app], {None: engine}):
+        with app.app_context():
+            db.create_all()
+            seed()
+
+        with app.test_client() as client:
+            with client.session_transaction() as session:
+                session['_user_id'] = "1"
+
+            for url in PAGES:
+                for label, clear in (("uncached", True), ("cached", False)):
+                    client.get(url)
+                    statements.clear()
+                    start = time.perf_counter()
+                    for _ in range(args.requests):
+                        if clear:
+                            reference_cache.clear()
+                        client.get(url)
+                    elapsed = (time.perf_counter() - start) / args.requests
+                    print(
+                        f"{url:<30} {label:<9} {elapsed * 1000:7.2f} ms/request"
+                        f"   {len(statements) / args.requests:5.1f} statements/request"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark of service writes while reports scan the database.
+
+Runs report threads (the 12-month users report) next to writer threads booking
+services on a file database in the default rollback-journal mode, first with
+reports reading the live database and then with reports reading the
+read-only snapshot. Reports write throughput and latency, and how long a
+snapshot refresh takes.
+
+Usage:
+    python benchmarks/bench_report_snapshot.py [--services 200000] [--seconds 5]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from threading import Event, Lock, Thread
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system import app, db
+from Management_system.models import Service, User
+from Management_system.reports import users_services_report
+from Management_system.snapshot import report_snapshot
+
+USERS = 20
+
+
+def seed(services: int) -> None:
+    db.session.add_all([
+        User(name=f"User{i}", surname="S", phone_number=str(i), email=f"user{i}@test.lt", password="x")
+        for i in range(USERS)
+    ])
+    db.session.flush()
+    start = date(2025, 1, 1)
+    rows = [
+        {
+            "date": start + timedelta(days=i % 365), "machine_id": i % 500 + 1,
+            "bn_count": i, "user_id": i % USERS + 1
+        }
+        for i in range(services)
+    ]
+    for i in range(0, services, 10000):
+        db.session.execute(Service.__table__.insert(), rows[i:i + 10000])
+    db.session.commit()
+
+
+def run(label: str, readers: int, writers: int, seconds: float) -> None:
+    stop = Event()
+    lock = Lock()
+    stats = {"reports": 0, "writes": 0, "failed": 0, "latencies": []}
+
+    def reader() -> None:
+        while not stop.is_set():
+            with app.app_context():
+                users_services_report(2025, 12)
+                db.session.remove()
+            with lock:
+                stats["reports"] += 1
+
+    def writer() -> None:
+        with app.app_context():
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    db.session.add(Service(
+                        date=date(2025, 6, 1), machine_id=1, bn_count=1,
+                        user_id=random.randint(1, USERS)
+                    ))
+                    db.session.commit()
+                    key = "writes"
+                except Exception:
+                    db.session.rollback()
+                    key = "failed"
+                with lock:
+                    stats[key] += 1
+                    stats["latencies"].append(time.perf_counter() - start)
+
+    threads = [Thread(target=reader) for _ in range(readers)]
+    threads += [Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies = sorted(stats["latencies"]) or [0]
+    print(
+        f"{label:<9} {stats['reports'] / seconds:6.1f} reports/s {stats['writes'] / seconds:8.1f} writes/s"
+        f"   failed writes {stats['failed']:4}"
+        f"   write p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.1f} ms"
+        f"   max {latencies[-1] * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--services", type=int, default=200000)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        settings = {"REPORT_SNAPSHOT_PATH": os.path.join(directory, "reports.db")}
+
+        with app.app_context(), patch.dict(db._app_engines[app], {None: engine}), \
+             patch.dict(app.config, settings):
+            db.create_all()
+            seed(args.services)
+            db.session.remove()
+
+            run("live", args.readers, args.writers, args.seconds)
+
+            start = time.perf_counter()
+            report_snapshot.refresh()
+            print(f"snapshot refresh {(time.perf_counter() - start) * 1000:.1f} ms")
+
+            with patch.dict(app.config, {"REPORT_SNAPSHOT": True}):
+                run("snapshot", args.readers, args.writers, args.seconds)
+
+        report_snapshot.dispose()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark of report pages over several years of service history.
+
+Fills a file database with years of services and part replacements, then
+opens the users report (12-month trend) and, when available, the activity
+report for the whole history. Reports page time, SQL statements and rows
+read by the report queries.
+
+Usage:
+    python benchmarks/bench_rollups.py [--machines 500] [--years 6]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system import app, db
+from Management_system.models import Client, Machine, MachineType, Part, PartsReplaced, Service, User
+
+REPEATS = 5
+USERS = 10
+
+
+def seed(machines: int, years: int) -> int:
+    db.session.add_all([
+        User(name=f"User{i}", surname="S", phone_number=str(i), email=f"user{i}@test.lt", password="x", is_admin=True)
+        for i in range(USERS)
+    ])
+    db.session.add_all([MachineType(name=f"Type {i}") for i in range(5)])
+    db.session.add_all([
+        Client(company=f"Bank {i}", address="Street 1", city="Vilnius", contact_person="Jonas",
+               phone_number=f"10{i}", email=f"bank{i}@test.lt")
+        for i in range(50)
+    ])
+    db.session.execute(Part.__table__.insert(), [
+        {"part_number": f"P-{i}", "name_en": f"Part {i}", "name_lt": f"Detale {i}", "price": 5 + i % 40}
+        for i in range(300)
+    ])
+    db.session.execute(Machine.__table__.insert(), [
+        {
+            "serial_number": f"S-{i:05}", "start_of_operation": date(2020, 1, 1), "end_of_warranty": date(2022, 1, 1),
+            "machine_type_id": i % 5 + 1, "client_id": i % 50 + 1, "is_active": True
+        }
+        for i in range(machines)
+    ])
+    db.session.commit()
+
+    # Insert through the ORM so the rollups are maintained as in production.
+    last_year = date.today().year
+    rows = 0
+    for year in range(last_year - years + 1, last_year + 1):
+        for month in range(1, 13):
+            db.session.add_all([
+                Service(date=date(year, month, 1 + machine % 28), machine_id=machine + 1, bn_count=month,
+                        user_id=machine % USERS + 1)
+                for machine in range(machines)
+            ])
+            db.session.add_all([
+                PartsReplaced(date=date(year, month, 1 + machine % 28), part_id=machine % 300 + 1,
+                              quantity=machine % 3 + 1, machine_id=machine + 1, warranty=machine % 4 == 0,
+                              inventory_id=1)
+                for machine in range(0, machines, 3)
+            ])
+            db.session.commit()
+            rows += machines + len(range(0, machines, 3))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--machines", type=int, default=500)
+    parser.add_argument("--years", type=int, default=6)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        app.config.update(TESTING=True, MAIL_WORKER=False)
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *_: statements.append(1))
+
+        with patch.dict(db._app_engines[app], {None: engine}):
+            with app.app_context():
+                db.create_all()
+                start = time.perf_counter()
+                rows = seed(args.machines, args.years)
+                print(f"Inserted {rows} services and replacements in {time.perf_counter() - start:.1f} s")
+
+            last_year = date.today().year
+            pages = {
+                "users report": f"/en/reports/users.html?year={last_year}&month=12",
+                "activity report": f"/en/reports/activity.html?year_from={last_year - args.years + 1}&year_to={last_year}",
+            }
+            with app.test_client() as client:
+                with client.session_transaction() as session:
+                    session['_user_id'] = "1"
+                for label, url in pages.items():
+                    if client.get(url).status_code != 200:
+                        continue
+                    statements.clear()
+                    start = time.perf_counter()
+                    for _ in range(REPEATS):
+                        client.get(url)
+                    elapsed = (time.perf_counter() - start) / REPEATS
+                    print(f"{label:<16} {elapsed * 1000:8.1f} ms/page   {len(statements) / REPEATS:5.1f} statements/page")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
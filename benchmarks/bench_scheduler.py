@@ -0,0 +1,118 @@
+"""
+Benchmark of the predictive service scheduler.
+
+Fills a file database with a year of counter readings for a fleet of
+machines, then times computing the visit proposals and opening the
+calendar with the proposals cached and after a new service arrives.
+
+Usage:
+    python benchmarks/bench_scheduler.py [--machines 2000] [--services 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system import app, db
+from Management_system.models import Client, Machine, MachineType, Service, User
+from Management_system.scheduler import service_scheduler
+from Management_system.summary import rebuild_summaries
+
+REPEATS = 5
+
+
+def seed(machines: int, services: int) -> None:
+    db.session.add(User(name="Admin", surname="A", phone_number="1", email="admin@test.lt", password="x",
+                        is_admin=True))
+    db.session.add_all([MachineType(name=f"Type {i}") for i in range(5)])
+    db.session.add_all([
+        Client(company=f"Bank {i}", address="Street 1", city=f"City {i % 10}", contact_person="Jonas",
+               phone_number=f"10{i}", email=f"bank{i}@test.lt")
+        for i in range(200)
+    ])
+    db.session.execute(Machine.__table__.insert(), [
+        {
+            "serial_number": f"S-{i:05}", "start_of_operation": date(2020, 1, 1), "end_of_warranty": date(2022, 1, 1),
+            "machine_type_id": i % 5 + 1, "client_id": i % 200 + 1, "is_active": i % 20 != 0
+        }
+        for i in range(machines)
+    ])
+
+    # Readings every few days over the last year, newest on or before today.
+    randomizer = random.Random(1)
+    per_machine = services // machines
+    today = date.today()
+    rows = []
+    for machine in range(machines):
+        day, count = today - timedelta(days=per_machine * 7), 0
+        rate = randomizer.randint(2000, 150000)
+        for _ in range(per_machine):
+            days = randomizer.randint(1, 13)
+            day = min(day + timedelta(days=days), today)
+            count += days * int(rate * randomizer.uniform(0.8, 1.2))
+            rows.append({"date": day, "machine_id": machine + 1, "bn_count": count})
+    db.session.execute(Service.__table__.insert(), rows)
+    rebuild_summaries(db.session.connection())
+    db.session.commit()
+
+
+def timed(function) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        function()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--machines", type=int, default=2000)
+    parser.add_argument("--services", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        app.config.update(TESTING=True, MAIL_WORKER=False, SCHEDULER=False)
+
+        with patch.dict(db._app_engines[app], {None: engine}):
+            with app.app_context():
+                db.create_all()
+                seed(args.machines, args.services)
+
+                def recompute() -> None:
+                    service_scheduler.clear()
+                    service_scheduler.forecast()
+
+                compute_ms = timed(recompute)
+                forecast = service_scheduler.forecast()
+                print(f"{len(forecast.proposals)} proposed visits for "
+                      f"{sum(len(proposal.machines) for proposal in forecast.proposals)} due machines")
+                print(f"compute proposals {compute_ms:8.1f} ms")
+
+            with app.test_client() as client:
+                with client.session_transaction() as session:
+                    session['_user_id'] = "1"
+                client.get("/en/calendar")
+                cached_ms = timed(lambda: client.get("/en/calendar"))
+                print(f"calendar (cached) {cached_ms:8.1f} ms")
+
+                def after_new_service() -> None:
+                    with app.app_context():
+                        db.session.add(Service(date=date.today(), machine_id=2, bn_count=10 ** 9))
+                        db.session.commit()
+                    client.get("/en/calendar")
+
+                new_service_ms = timed(after_new_service)
+                print(f"service + calendar {new_service_ms:8.1f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
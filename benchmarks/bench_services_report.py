@@ -0,0 +1,92 @@
+"""
+Benchmark of the quarterly services report for a client with many machines.
+
+Fills a file database with one client's machines and several years of
+monthly services each, then posts the services report form for the current
+quarter. Reports page time and the number of SQL statements.
+
+Usage:
+    python benchmarks/bench_services_report.py [--machines 300] [--years 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system import app, db
+from Management_system.models import Client, Machine, MachineType, Service, User
+
+REPEATS = 5
+
+
+def seed(machines: int, years: int) -> None:
+    db.session.add_all([
+        User(name="Admin", surname="A", phone_number="1", email="admin@test.lt", password="x", is_admin=True),
+        Client(company="Bank", address="Street 1", city="Vilnius", contact_person="Jonas",
+               phone_number="100", email="bank@test.lt"),
+        MachineType(name="BPS C1"),
+    ])
+    db.session.flush()
+    db.session.execute(Machine.__table__.insert(), [
+        {
+            "serial_number": f"S-{i:04}", "start_of_operation": date(2020, 1, 1), "end_of_warranty": date(2022, 1, 1),
+            "machine_type_id": 1, "client_id": 1, "is_active": i % 10 != 0
+        }
+        for i in range(machines)
+    ])
+    this_year = date.today().year
+    db.session.execute(Service.__table__.insert(), [
+        {"date": date(year, month, 1 + machine % 28), "machine_id": machine + 1, "bn_count": month, "user_id": 1}
+        for machine in range(machines)
+        for year in range(this_year - years + 1, this_year + 1)
+        for month in range(1, 13)
+    ])
+    db.session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--machines", type=int, default=300)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        app.config.update(TESTING=True, MAIL_WORKER=False, WTF_CSRF_ENABLED=False)
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *_: statements.append(1))
+
+        with patch.dict(db._app_engines[app], {None: engine}), \
+             patch("Management_system.routes.log_user_action"):
+            with app.app_context():
+                db.create_all()
+                seed(args.machines, args.years)
+
+            today = date.today()
+            form = {"client": "1", "machine_type": "1", "year": str(today.year), "quarter": str((today.month - 1) // 3 + 1)}
+            with app.test_client() as client:
+                with client.session_transaction() as session:
+                    session['_user_id'] = "1"
+                client.post("/en/reports/services.html", data=form)
+
+                statements.clear()
+                start = time.perf_counter()
+                for _ in range(REPEATS):
+                    response = client.post("/en/reports/services.html", data=form)
+                elapsed = (time.perf_counter() - start) / REPEATS
+
+        assert response.status_code == 200
+        print(f"{args.machines} machines, {args.years} years of services: "
+              f"{elapsed * 1000:8.1f} ms/page   {len(statements) / REPEATS:7.1f} statements/page")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
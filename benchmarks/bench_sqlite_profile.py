@@ -0,0 +1,128 @@
+"""
+Mixed read/write load benchmark of the SQLite database profiles.
+
+Reader threads run the users report while writer threads book services
+against the same file database, first with the default configuration and
+then with the production profile (WAL, busy timeout, tuned pragmas, larger
+pool). Reports reads/s, writes/s, failed writes and write latency.
+
+Usage:
+    python benchmarks/bench_sqlite_profile.py [--readers 4] [--writers 4] [--seconds 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from threading import Event, Lock, Thread
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system import app, db
+from Management_system.config import config_profiles
+from Management_system.database import configure_sqlite
+from Management_system.models import Service, User
+from Management_system.reports import users_services_report
+
+USERS = 20
+SERVICES = 20000
+
+
+def seed() -> None:
+    db.session.add_all([
+        User(name=f"User{i}", surname="S", phone_number=str(i), email=f"user{i}@test.lt", password="x")
+        for i in range(USERS)
+    ])
+    db.session.flush()
+    start = date(2025, 1, 1)
+    db.session.execute(Service.__table__.insert(), [
+        {
+            "date": start + timedelta(days=i % 365), "machine_id": i % 500 + 1,
+            "bn_count": i, "user_id": i % USERS + 1
+        }
+        for i in range(SERVICES)
+    ])
+    db.session.commit()
+
+
+def run(profile: str, readers: int, writers: int, seconds: float) -> None:
+    config = config_profiles[profile]
+    options = getattr(config, "SQLALCHEMY_ENGINE_OPTIONS", {})
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", **options)
+        configure_sqlite(engine, getattr(config, "SQLITE_PRAGMAS", {}))
+
+        with app.app_context(), patch.dict(db._app_engines[app], {None: engine}):
+            db.create_all()
+            seed()
+            db.session.remove()
+
+            stop = Event()
+            lock = Lock()
+            stats = {"reads": 0, "writes": 0, "failed": 0, "latencies": []}
+
+            def reader() -> None:
+                with app.app_context():
+                    while not stop.is_set():
+                        users_services_report(2025, random.randint(1, 12))
+                        db.session.remove()
+                        with lock:
+                            stats["reads"] += 1
+
+            def writer() -> None:
+                with app.app_context():
+                    while not stop.is_set():
+                        start = time.perf_counter()
+                        try:
+                            db.session.add(Service(
+                                date=date(2025, 6, 1), machine_id=1, bn_count=1,
+                                user_id=random.randint(1, USERS)
+                            ))
+                            db.session.commit()
+                            key = "writes"
+                        except Exception:
+                            db.session.rollback()
+                            key = "failed"
+                        with lock:
+                            stats[key] += 1
+                            stats["latencies"].append(time.perf_counter() - start)
+
+            threads = [Thread(target=reader) for _ in range(readers)]
+            threads += [Thread(target=writer) for _ in range(writers)]
+            for thread in threads:
+                thread.start()
+            time.sleep(seconds)
+            stop.set()
+            for thread in threads:
+                thread.join()
+        engine.dispose()
+
+    latencies = sorted(stats["latencies"]) or [0]
+    print(
+        f"{profile:<11} {stats['reads'] / seconds:8.1f} reads/s {stats['writes'] / seconds:8.1f} writes/s"
+        f"   failed writes {stats['failed']:4}"
+        f"   write p50 {statistics.median(latencies) * 1000:7.1f} ms"
+        f"   p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    for profile in ("default", "production"):
+        run(profile, args.readers, args.writers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Cold-start benchmark of `import Management_system`.
+
+Imports the package in fresh interpreter processes and reports the median
+wall time and peak RSS. Exits with status 1 when either exceeds its budget,
+so the script can guard deploys against startup regressions.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--max-seconds 1.0] [--max-rss-mb 80]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy modules that must only be imported on first use.
+DEFERRED_MODULES = ["matplotlib", "numpy", "flask_admin.contrib.sqla"]
+
+PROBE = f"""
+import json, resource, sys, time
+start = time.perf_counter()
+import Management_system
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "loaded": [name for name in {DEFERRED_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=1.0)
+    parser.add_argument("--max-rss-mb", type=float, default=80)
+    args = parser.parse_args()
+
+    results = [measure() for _ in range(args.runs)]
+    seconds = statistics.median(result["seconds"] for result in results)
+    rss_mb = max(result["rss_kb"] for result in results) / 1024
+    loaded = sorted({name for result in results for name in result["loaded"]})
+
+    print(f"{'import time (median)':<25} {seconds * 1000:10.1f} ms  (budget {args.max_seconds * 1000:.0f} ms)")
+    print(f"{'peak RSS':<25} {rss_mb:10.1f} MB  (budget {args.max_rss_mb:.0f} MB)")
+    print(f"{'deferred modules loaded':<25} {', '.join(loaded) or 'none'}")
+
+    if seconds > args.max_seconds or rss_mb > args.max_rss_mb or loaded:
+        print("startup budget exceeded")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Contention benchmark of part replacement bookings.
+
+Several threads book one part at a time from the same inventory row of a
+file-based SQLite database until the stock runs out. Compares the previous
+read-check-decrement in Python with the conditional UPDATE used by
+`book_replaced_part`, reporting throughput, the final quantity and how many
+parts were booked beyond the stock.
+
+Usage:
+    python benchmarks/bench_stock.py [--threads 8] [--stock 400]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from threading import Barrier, Lock, Thread
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system import app, db
+from Management_system.models import Inventory, PartsReplaced
+from Management_system.stock import book_replaced_part
+from Management_system.utils import retry_on_lock
+
+
+def replacement() -> PartsReplaced:
+    return PartsReplaced(
+        date=date(2025, 3, 1), part_id=1, quantity=1, machine_id=1, warranty=False, inventory_id=1
+    )
+
+
+@retry_on_lock
+def book_read_check_write(replaced_part: PartsReplaced) -> bool:
+    inventory = db.session.get(Inventory, replaced_part.inventory_id)
+    if inventory.quantity < replaced_part.quantity:
+        db.session.rollback()
+        return False
+    inventory.quantity -= replaced_part.quantity
+    db.session.add(replaced_part)
+    db.session.commit()
+    return True
+
+
+def run(book, threads: int, stock: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", connect_args={"timeout": 0.05})
+        with app.app_context(), patch.dict(db._app_engines[app], {None: engine}):
+            db.create_all()
+            db.session.add(Inventory(part_id=1, location_id=1, quantity=stock))
+            db.session.commit()
+            db.session.remove()
+
+            barrier = Barrier(threads)
+            counter = Lock()
+            results = {"booked": 0, "errors": 0}
+
+            def engineer() -> None:
+                with app.app_context():
+                    barrier.wait()
+                    while True:
+                        try:
+                            booked = book(replacement())
+                        except Exception:
+                            with counter:
+                                results["errors"] += 1
+                            continue
+                        if not booked:
+                            return
+                        with counter:
+                            results["booked"] += 1
+
+            workers = [Thread(target=engineer) for _ in range(threads)]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+
+            quantity = db.session.get(Inventory, 1).quantity
+            rows = PartsReplaced.query.count()
+            db.session.remove()
+        engine.dispose()
+
+    print(
+        f"{book.__name__:<24} {results['booked'] / elapsed:8.0f} bookings/s"
+        f"   final quantity {quantity:4}   replacements {rows:4}"
+        f"   oversold {max(rows - stock, 0):4}   errors {results['errors']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--stock", type=int, default=400)
+    args = parser.parse_args()
+
+    for book in (book_read_check_write, book_replaced_part):
+        run(book, args.threads, args.stock)
+
+
+if __name__ == "__main__":
+    main()
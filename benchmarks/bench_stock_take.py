@@ -0,0 +1,100 @@
+"""
+Benchmark of a stock-take day in the part quantity editor.
+
+Fills an in-memory database with parts stocked at half of the locations, then
+opens and submits the quantity editor for each part, and imports the same
+count as one stock-take CSV, counting SQL statements and timing both.
+
+Usage:
+    python benchmarks/bench_stock_take.py [--parts 300] [--locations 20]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system import app, db
+from Management_system.imports import import_stock_take
+from Management_system.models import Inventory, Location, Part, User
+
+
+def seed(parts: int, locations: int) -> None:
+    db.session.add(User(name="Admin", surname="A", phone_number="1", email="admin@test.lt", password="x", is_admin=True))
+    db.session.add_all([Location(location_en=f"Location {i}", location_lt=f"Vieta {i}") for i in range(locations)])
+    db.session.add_all([
+        Part(part_number=f"P-{i}", name_en="Belt", name_lt="Dirzas", price=10) for i in range(parts)
+    ])
+    db.session.flush()
+    db.session.execute(Inventory.__table__.insert(), [
+        {"part_id": part_id, "location_id": location_id, "quantity": 10}
+        for part_id in range(1, parts + 1)
+        for location_id in range(1, locations // 2 + 1)
+    ])
+    db.session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--parts", type=int, default=300)
+    parser.add_argument("--locations", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *_: statements.append(1))
+
+    app.config.update(TESTING=True, MAIL_WORKER=False)
+    with patch.dict(db._app_engines[app], {None: engine}), \
+         patch("Management_system.routes.log_user_action"):
+        with app.app_context():
+            db.create_all()
+            seed(args.parts, args.locations)
+
+        form = {f"quantity_{location_id}": "7" for location_id in range(1, args.locations + 1)}
+        with app.test_client() as client:
+            with client.session_transaction() as session:
+                session['_user_id'] = "1"
+
+            timings = {"open": 0.0, "save": 0.0}
+            counts = {"open": 0, "save": 0}
+            for i in range(args.parts):
+                url = f"/en/parts/update_part/P-{i}"
+                for step, request in (("open", lambda: client.get(url)), ("save", lambda: client.post(url, data=form))):
+                    statements.clear()
+                    start = time.perf_counter()
+                    request()
+                    timings[step] += time.perf_counter() - start
+                    counts[step] += len(statements)
+
+        for step in ("open", "save"):
+            print(
+                f"{step:<5} {timings[step] / args.parts * 1000:7.2f} ms/part"
+                f"   {counts[step] / args.parts:6.1f} statements/part"
+            )
+        print(f"total {sum(timings.values()):7.2f} s for {args.parts} parts")
+
+        lines = ["part_number,location,quantity"] + [
+            f"P-{i},Location {location},9"
+            for i in range(args.parts)
+            for location in range(args.locations)
+        ]
+        with app.app_context():
+            statements.clear()
+            start = time.perf_counter()
+            result = import_stock_take(io.StringIO("\n".join(lines)))
+            elapsed = time.perf_counter() - start
+        print(
+            f"stock-take import of {len(result.rows)} lines: {elapsed:.2f} s, "
+            f"{len(result.changes)} changes, {len(statements)} statements"
+        )
+
+
+if __name__ == "__main__":
+    main()
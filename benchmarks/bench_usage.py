@@ -0,0 +1,106 @@
+"""
+Benchmark of the fleet-wide banknote counter usage analysis.
+
+Fills a file database with counter readings of many machines, then times
+loading the readings, computing intervals, rates and outliers, and the
+whole usage report JSON endpoint.
+
+Usage:
+    python benchmarks/bench_usage.py [--machines 2000] [--services 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system import app, db
+from Management_system.models import Client, Machine, MachineType, Service, User
+from Management_system.usage import counter_intervals, load_counter_series, machine_usage
+
+REPEATS = 5
+START = date(2020, 1, 1)
+
+
+def seed(machines: int, services: int) -> None:
+    db.session.add(User(name="Admin", surname="A", phone_number="1", email="admin@test.lt", password="x",
+                        is_admin=True))
+    db.session.add_all([MachineType(name=f"Type {i}") for i in range(5)])
+    db.session.add_all([
+        Client(company=f"Bank {i}", address="Street 1", city="Vilnius", contact_person="Jonas",
+               phone_number=f"10{i}", email=f"bank{i}@test.lt")
+        for i in range(50)
+    ])
+    db.session.execute(Machine.__table__.insert(), [
+        {
+            "serial_number": f"S-{i:05}", "start_of_operation": START, "end_of_warranty": START,
+            "machine_type_id": i % 5 + 1, "client_id": i % 50 + 1, "is_active": True
+        }
+        for i in range(machines)
+    ])
+
+    randomizer = random.Random(1)
+    rows = []
+    per_machine = services // machines
+    for machine in range(machines):
+        day, count = START, 0
+        for _ in range(per_machine):
+            days = randomizer.randint(5, 40)
+            day += timedelta(days=days)
+            count = 0 if randomizer.random() < 0.01 else count + days * randomizer.randint(200, 2000)
+            rows.append({"date": day, "machine_id": machine + 1, "bn_count": count})
+    db.session.execute(Service.__table__.insert(), rows)
+    db.session.commit()
+
+
+def timed(function) -> tuple[float, object]:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = function()
+    return (time.perf_counter() - start) / REPEATS * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--machines", type=int, default=2000)
+    parser.add_argument("--services", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        app.config.update(TESTING=True, MAIL_WORKER=False)
+
+        with patch.dict(db._app_engines[app], {None: engine}):
+            with app.app_context():
+                db.create_all()
+                seed(args.machines, args.services)
+
+                date_to = date.today()
+                load_ms, series = timed(lambda: load_counter_series(START, date_to))
+                intervals_ms, intervals = timed(lambda: counter_intervals(series))
+                machines_ms, _ = timed(lambda: machine_usage(intervals))
+                print(f"{len(series.machine_ids)} readings, {len(intervals.machine_ids)} intervals, "
+                      f"{int(intervals.outliers.sum())} outliers")
+                print(f"load readings    {load_ms:8.1f} ms")
+                print(f"intervals        {intervals_ms:8.1f} ms")
+                print(f"machine totals   {machines_ms:8.1f} ms")
+
+            with app.test_client() as client:
+                with client.session_transaction() as session:
+                    session['_user_id'] = "1"
+                url = f"/en/reports/usage.json?date_from={START}&date_to={date.today()}"
+                client.get(url)
+                endpoint_ms, _ = timed(lambda: client.get(url))
+                print(f"usage.json       {endpoint_ms:8.1f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
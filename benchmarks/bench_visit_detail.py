@@ -0,0 +1,100 @@
+"""
+Benchmark of the visit detail page on a large services table.
+
+Fills a file database with many clients and years of services, then opens
+the detail page of a visit to one client with a handful of machines.
+Reports page time and the number of SQL statements.
+
+Usage:
+    python benchmarks/bench_visit_detail.py [--clients 200] [--machines 10] [--years 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Management_system import app, db
+from Management_system.models import Client, Machine, MachineType, Service, User, Visit
+from Management_system.summary import rebuild_summaries
+
+REPEATS = 20
+
+
+def seed(clients: int, machines: int, years: int) -> None:
+    db.session.add_all([
+        User(name="Admin", surname="A", phone_number="1", email="admin@test.lt", password="x", is_admin=True),
+        MachineType(name="BPS C1"),
+    ])
+    db.session.execute(Client.__table__.insert(), [
+        {
+            "company": f"Bank {i}", "address": "Street 1", "city": "Vilnius", "contact_person": "Jonas",
+            "phone_number": str(i), "email": f"bank{i}@test.lt"
+        }
+        for i in range(clients)
+    ])
+    db.session.execute(Machine.__table__.insert(), [
+        {
+            "serial_number": f"S-{i:05}", "start_of_operation": date(2020, 1, 1), "end_of_warranty": date(2022, 1, 1),
+            "machine_type_id": 1, "client_id": i // machines + 1, "is_active": True
+        }
+        for i in range(clients * machines)
+    ])
+    this_year = date.today().year
+    for machine in range(clients * machines):
+        db.session.execute(Service.__table__.insert(), [
+            {
+                "date": date(year, month, 1 + machine % 28), "machine_id": machine + 1, "bn_count": month,
+                "user_id": 1, "note": "Checked" if month % 4 == 0 else None
+            }
+            for year in range(this_year - years + 1, this_year + 1)
+            for month in range(1, 13)
+        ])
+    db.session.add(Visit(client_id=clients // 2, date=date.today(), purpose="Service"))
+    rebuild_summaries(db.session.connection())
+    db.session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--machines", type=int, default=10)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        app.config.update(TESTING=True, MAIL_WORKER=False)
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *_: statements.append(1))
+
+        with patch.dict(db._app_engines[app], {None: engine}):
+            with app.app_context():
+                db.create_all()
+                seed(args.clients, args.machines, args.years)
+
+            with app.test_client() as client:
+                with client.session_transaction() as session:
+                    session['_user_id'] = "1"
+                client.get("/en/visit/1")
+
+                statements.clear()
+                start = time.perf_counter()
+                for _ in range(REPEATS):
+                    response = client.get("/en/visit/1")
+                elapsed = (time.perf_counter() - start) / REPEATS
+
+        assert response.status_code == 200
+        services = args.clients * args.machines * args.years * 12
+        print(f"{services} services: {elapsed * 1000:8.1f} ms/page   {len(statements) / REPEATS:5.1f} statements/page")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 from Management_system import app, db
-from Management_system.utils import create_default_admin
+from Management_system.rollups import ensure_rollups
+from Management_system.summary import ensure_machine_summary
+from Management_system.utils import create_default_admin, upgrade_schema
 
 if __name__ == "__main__":
     with app.app_context():
         db.create_all()
+        upgrade_schema()
+        ensure_machine_summary()
+        ensure_rollups()
         create_default_admin()
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,66 @@
+import pytest
+from datetime import date
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from Management_system import app, db
+from Management_system.models import Machine, User
+from Management_system.refdata import reference_cache
+from Management_system.scheduler import service_scheduler
+
+@pytest.fixture(autouse=True)
+def no_mail_worker():
+    """Keep the background mail worker from starting during tests."""
+    with patch.dict(app.config, {"MAIL_WORKER": False}):
+        yield
+
+@pytest.fixture(autouse=True)
+def no_scheduler():
+    """Keep the background service scheduler from starting during tests."""
+    with patch.dict(app.config, {"SCHEDULER": False}):
+        yield
+
+@pytest.fixture
+def database():
+    """Run the test against a fresh in-memory database instead of demo.db."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    reference_cache.clear()
+    service_scheduler.clear()
+    with app.app_context(), patch.dict(db._app_engines[app], {None: engine}):
+        db.create_all()
+        yield db
+        db.session.remove()
+    engine.dispose()
+
+@pytest.fixture
+def admin_user(database):
+    """Add an administrator account to the test database."""
+    admin = User(name="Admin", surname="A", phone_number="1", email="admin@test.lt", password="x", is_admin=True)
+    database.session.add(admin)
+    database.session.commit()
+    return admin
+
+@pytest.fixture
+def make_machine(database):
+    """Return a function adding a machine with fixed dates to the session."""
+    def make_machine(serial_number, client_id=1, machine_type_id=1, **fields):
+        machine = Machine(
+            serial_number=serial_number, start_of_operation=date(2020, 1, 1), end_of_warranty=date(2022, 1, 1),
+            machine_type_id=machine_type_id, client_id=client_id, **fields
+        )
+        database.session.add(machine)
+        return machine
+    return make_machine
+
+@pytest.fixture
+def logged_in_client(admin_user):
+    """Test client logged in as the administrator."""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        with client.session_transaction() as session:
+            session['_user_id'] = str(admin_user.id)
+        yield client
@@ -0,0 +1,72 @@
+"""Minimal local SMTP server standing in for the mail server in tests."""
+import socketserver
+import threading
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        server = self.server
+        server.connections += 1
+        self.reply("220 localhost ready")
+        envelope = {"recipients": []}
+
+        for raw in self.rfile:
+            command = raw.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif verb == "MAIL":
+                envelope = {"sender": command[10:], "recipients": []}
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipient = command[8:].strip("<>")
+                if recipient in server.rejected:
+                    self.reply("550 No such user")
+                else:
+                    envelope["recipients"].append(recipient)
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                for data in self.rfile:
+                    if data in (b".\r\n", b".\n"):
+                        break
+                    lines.append(data)
+                envelope["data"] = b"".join(lines)
+                server.messages.append(envelope)
+                self.reply("250 OK")
+            elif verb == "RSET":
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.messages: list[dict] = []
+        self.rejected: set[str] = set()
+        self.connections = 0
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def __enter__(self) -> "SMTPServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
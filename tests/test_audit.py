@@ -0,0 +1,108 @@
+import pytest
+from datetime import datetime, timedelta
+from flask import g
+from Management_system import app
+from Management_system.audit import audit_page, format_cursor, parse_cursor
+from Management_system.models import AuditEntry, Part, User
+
+@pytest.fixture
+def user(database):
+    user = User(name="Jonas", surname="J", phone_number="1", email="jonas@test.lt", password="secret", is_admin=True)
+    database.session.add(user)
+    database.session.commit()
+    return user
+
+def entries():
+    return AuditEntry.query.order_by(AuditEntry.id).all()
+
+def test_records_create_update_delete(database):
+    part = Part(part_number="P-1", name_en="Belt", name_lt="Dirzas", price=10)
+    database.session.add(part)
+    database.session.commit()
+
+    part.price = 12.5
+    database.session.commit()
+
+    database.session.delete(part)
+    database.session.commit()
+
+    create, update, delete = entries()
+    assert (create.action, create.entity_type, create.entity_id) == ("create", "parts", part.id)
+    assert create.after["part_number"] == "P-1" and create.before is None
+    assert update.before == {"price": 10} and update.after == {"price": 12.5}
+    assert delete.before["price"] == 12.5 and delete.after is None
+
+def test_rolled_back_changes_are_not_audited(database):
+    database.session.add(Part(part_number="P-1", name_en="Belt", name_lt="Dirzas", price=10))
+    database.session.flush()
+    database.session.rollback()
+
+    assert entries() == []
+
+def test_password_is_redacted(user, database):
+    user.password = "changed"
+    database.session.commit()
+
+    create, update = entries()
+    assert create.after["password"] == "***"
+    assert update.before == {"password": "***"} and update.after == {"password": "***"}
+
+def test_request_entries_written_at_request_end(user, database):
+    with app.test_request_context():
+        g._login_user = user
+        database.session.add(Part(part_number="P-1", name_en="Belt", name_lt="Dirzas", price=10))
+        database.session.commit()
+        database.session.add(Part(part_number="P-2", name_en="Belt", name_lt="Dirzas", price=10))
+        database.session.commit()
+
+        assert AuditEntry.query.filter_by(entity_type="parts").count() == 0
+
+    parts = AuditEntry.query.filter_by(entity_type="parts").all()
+    assert len(parts) == 2
+    assert all(entry.user_id == user.id for entry in parts)
+
+@pytest.fixture
+def history(user, database):
+    start = datetime(2025, 1, 1)
+    rows = [
+        {
+            "user_id": user.id if i % 2 else None, "action": "update", "entity_type": "inventory",
+            "entity_id": i % 3, "before": {"quantity": i}, "after": {"quantity": i + 1},
+            "created_at": start + timedelta(hours=i)
+        }
+        for i in range(30)
+    ]
+    database.session.execute(AuditEntry.__table__.insert(), rows)
+    database.session.commit()
+    return database
+
+def test_audit_page_keyset_navigation(history):
+    first = audit_page(entity_type="inventory", entity_id=1, per_page=4)
+    assert [entry.before["quantity"] for entry in first.items] == [28, 25, 22, 19]
+    assert first.has_next and not first.has_prev
+
+    second = audit_page(entity_type="inventory", entity_id=1, per_page=4, after=parse_cursor(format_cursor(first.items[-1])))
+    assert [entry.before["quantity"] for entry in second.items] == [16, 13, 10, 7]
+
+    back = audit_page(entity_type="inventory", entity_id=1, per_page=4, before=parse_cursor(format_cursor(second.items[0])))
+    assert back.items == first.items
+
+def test_audit_page_filters_by_user(history, user):
+    page = audit_page(user_id=user.id, per_page=100)
+    assert len(page.items) == 15
+    assert all(entry.user.name == "Jonas" for entry in page.items)
+
+def test_parse_cursor_rejects_garbage():
+    assert parse_cursor("nonsense") is None
+    assert parse_cursor(None) is None
+
+def test_admin_audit_log_view(history, user):
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user.id)
+        response = client.get("/admin/audit_log/?entity_type=inventory&entity_id=1")
+
+    assert response.status_code == 200
+    assert response.data.count(b"inventory #1") == 10
+    assert b"inventory #2" not in response.data
@@ -0,0 +1,85 @@
+import os
+import pytest
+from datetime import date
+from unittest.mock import patch
+from Management_system import app
+from Management_system.charts import ChartCache, chart_key, data_version
+from Management_system.models import Service, User
+
+def test_chart_cache_put_and_get(tmp_path):
+    cache = ChartCache(str(tmp_path), max_bytes=100)
+
+    assert cache.get("a.png") is None
+    cache.put("a.png", b"chart")
+    assert cache.get("a.png") == b"chart"
+
+def test_chart_cache_evicts_least_recently_used(tmp_path):
+    cache = ChartCache(str(tmp_path), max_bytes=25)
+    cache.put("a.png", b"a" * 10)
+    cache.put("b.png", b"b" * 10)
+    os.utime(tmp_path / "a.png", (1, 1))
+    os.utime(tmp_path / "b.png", (2, 2))
+
+    cache.get("a.png")
+    cache.put("c.png", b"c" * 10)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.png", "c.png"]
+
+def test_chart_key_changes_with_data():
+    first = chart_key("users", 2025, 3, "en", data_version(["Jonas"], [2]), "png")
+    second = chart_key("users", 2025, 3, "en", data_version(["Jonas"], [3]), "png")
+
+    assert first.startswith("users-2025-03-en-") and first.endswith(".png")
+    assert first != second
+    assert first != chart_key("users", 2025, 3, "lt", data_version(["Jonas"], [2]), "png")
+
+@pytest.fixture
+def chart_client(database, tmp_path):
+    jonas = User(name="Jonas", surname="J", phone_number="1", email="jonas@test.lt", password="x")
+    database.session.add(jonas)
+    database.session.flush()
+    database.session.add_all([
+        Service(date=date(2025, 3, 1), machine_id=1, bn_count=1, user_id=jonas.id),
+        Service(date=date(2025, 3, 2), machine_id=1, bn_count=1, user_id=jonas.id),
+    ])
+    database.session.commit()
+
+    app.config['TESTING'] = True
+    with patch("Management_system.routes.chart_cache", ChartCache(str(tmp_path), 1024 * 1024)), \
+         app.test_client() as client:
+        with client.session_transaction() as session:
+            session['_user_id'] = str(jonas.id)
+        yield client
+
+URL = "/en/reports/users_chart?year=2025&month=3"
+
+@pytest.mark.parametrize("fmt, mimetype", [("png", "image/png"), ("svg", "image/svg+xml")])
+def test_users_report_chart_formats(chart_client, fmt, mimetype):
+    response = chart_client.get(f"{URL}&format={fmt}")
+
+    assert response.status_code == 200
+    assert response.mimetype == mimetype
+    assert response.get_etag()[0].endswith(f".{fmt}")
+
+def test_users_report_chart_not_modified(chart_client):
+    etag = chart_client.get(URL).get_etag()[0]
+
+    with patch("Management_system.routes.render_pie_chart") as render:
+        response = chart_client.get(URL, headers={"If-None-Match": f'"{etag}"'})
+
+    assert response.status_code == 304
+    render.assert_not_called()
+
+def test_users_report_chart_served_from_cache(chart_client):
+    first = chart_client.get(URL)
+
+    with patch("Management_system.routes.render_pie_chart") as render:
+        second = chart_client.get(URL)
+
+    assert second.status_code == 200
+    assert second.data == first.data
+    render.assert_not_called()
+
+def test_users_report_chart_unknown_format_or_month(chart_client):
+    assert chart_client.get(f"{URL}&format=gif").status_code == 404
+    assert chart_client.get("/en/reports/users_chart?year=2024&month=3").status_code == 404
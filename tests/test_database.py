@@ -0,0 +1,27 @@
+from sqlalchemy import create_engine, text
+from Management_system.config import config_profiles
+from Management_system.database import configure_sqlite
+
+def pragma(engine, name):
+    with engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+def test_configure_sqlite_applies_pragmas(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    configure_sqlite(engine, config_profiles["production"].SQLITE_PRAGMAS)
+
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "synchronous") == 1
+    assert pragma(engine, "busy_timeout") == 15000
+    engine.dispose()
+
+def test_configure_sqlite_without_pragmas_keeps_defaults(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    configure_sqlite(engine, {})
+
+    assert pragma(engine, "journal_mode") == "delete"
+    engine.dispose()
+
+def test_default_profile_has_no_pragmas():
+    assert not hasattr(config_profiles["default"], "SQLITE_PRAGMAS")
+    assert config_profiles["production"].SQLALCHEMY_ENGINE_OPTIONS["pool_size"] == 10
@@ -0,0 +1,113 @@
+import csv
+import io
+import zipfile
+import pytest
+from datetime import date
+from Management_system import app
+from unittest.mock import patch
+from Management_system.exports import csv_stream, stream_rows, xlsx_stream
+from Management_system.models import Client, MachineType, Part, PartsReplaced, Service
+from Management_system.reports import quarter_services_query
+
+def test_csv_stream_chunks_rows():
+    chunks = list(csv_stream(["a", "b"], ((i, f"x{i}") for i in range(1200))))
+
+    assert len(chunks) == 3
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert rows[0] == ["a", "b"] and rows[-1] == ["1199", "x1199"] and len(rows) == 1201
+
+def test_xlsx_stream_is_a_readable_workbook():
+    data = b"".join(xlsx_stream(["name", "qty", "ok", "day"], [("A & <B>", 2, True, date(2025, 1, 2))], "Sheet"))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as workbook:
+        assert "[Content_Types].xml" in workbook.namelist()
+        sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+    assert "<t>A &amp; &lt;B&gt;</t>" in sheet
+    assert "<c><v>2</v></c>" in sheet and '<c t="b"><v>1</v></c>' in sheet
+    assert "<t>2025-01-02</t>" in sheet
+
+@pytest.fixture
+def machines(database, make_machine):
+    bank = Client(company="Bank", address="Street 1", city="Vilnius", contact_person="Jonas",
+                  phone_number="100", email="bank@test.lt")
+    database.session.add_all([bank, MachineType(name="BPS C1"), MachineType(name="BPS M7"), Part(part_number="P-1", name_en="Belt", name_lt="Dirzas", price=10)])
+    database.session.flush()
+    for serial_number, is_active in [("S-1", True), ("S-2", True), ("S-3", False), ("S-4", False)]:
+        make_machine(serial_number, bank.id, is_active=is_active)
+    make_machine("M-1", bank.id, machine_type_id=2, is_active=True)
+    database.session.flush()
+    database.session.add_all([
+        Service(date=date(2025, 7, 2), machine_id=1, bn_count=1),
+        Service(date=date(2025, 4, 10), machine_id=1, bn_count=1),
+        Service(date=date(2025, 5, 20), machine_id=1, bn_count=1),
+        Service(date=date(2025, 1, 5), machine_id=2, bn_count=1),
+        Service(date=date(2025, 6, 1), machine_id=3, bn_count=1),
+        PartsReplaced(date=date(2025, 2, 1), part_id=1, quantity=2, machine_id=1, warranty=False, inventory_id=1),
+        PartsReplaced(date=date(2025, 3, 1), part_id=1, quantity=1, machine_id=2, warranty=True, inventory_id=1),
+    ])
+    database.session.commit()
+    return database
+
+def test_quarter_services_query(machines):
+    rows = list(stream_rows(quarter_services_query(1, 1, 2025, 2)))
+
+    assert rows == [
+        ("BPS C1", "S-1", date(2025, 5, 20)),
+        ("BPS C1", "S-2", None),
+        ("BPS C1", "S-3", date(2025, 6, 1)),
+    ]
+
+@pytest.fixture
+def admin_client(machines, logged_in_client):
+    return logged_in_client
+
+def test_parts_report_csv_export(admin_client):
+    with patch("Management_system.routes.log_user_action"):
+        response = admin_client.get("/en/reports/parts.csv?client=1&date_from=2025-01-01&date_to=2025-12-31")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Disposition"] == 'attachment; filename="replaced_parts_2025-01-01_2025-12-31.csv"'
+    rows = list(csv.reader(io.StringIO(response.data.decode("utf-8-sig"))))
+    assert rows[1:] == [
+        ["2025-02-01", "Bank", "Vilnius", "S-1", "P-1", "Belt", "2", "10.0", "False"],
+        ["2025-03-01", "Bank", "Vilnius", "S-2", "P-1", "Belt", "1", "10.0", "True"],
+    ]
+
+def test_parts_report_xlsx_export(admin_client):
+    with patch("Management_system.routes.log_user_action"):
+        response = admin_client.get("/lt/reports/parts.xlsx?date_from=2025-03-01&date_to=2025-03-31")
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.data)) as workbook:
+        sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+    assert sheet.count("<row>") == 2 and "Dirzas" in sheet
+
+def test_parts_report_export_requires_dates(admin_client):
+    assert admin_client.get("/en/reports/parts.csv?client=1").status_code == 400
+    assert admin_client.get("/en/reports/parts.pdf?date_from=2025-01-01&date_to=2025-12-31").status_code == 404
+
+def test_services_report_export(admin_client):
+    with patch("Management_system.routes.log_user_action") as log:
+        response = admin_client.get("/en/reports/services.csv?client=1&machine_type=2&year=2025&quarter=2")
+
+    log.assert_called_once_with(
+        "Admin", "Services_Report_Export", "Client: 1; Machine type: 2; Year: 2025; Quarter: 2; Format: csv"
+    )
+
+    assert response.headers["Content-Disposition"] == 'attachment; filename="services_2025_Q2_1.csv"'
+    rows = list(csv.reader(io.StringIO(response.data.decode("utf-8-sig"))))
+    assert rows[1:] == [["BPS M7", "M-1", ""]]
+    assert admin_client.get("/en/reports/services.csv?client=1&machine_type=2&year=2025&quarter=5").status_code == 400
+    assert admin_client.get("/en/reports/services.csv?client=1&machine_type=2&year=10000&quarter=2").status_code == 400
+    assert admin_client.get("/en/reports/services.csv?client=1&machine_type=9&year=2025&quarter=2").status_code == 400
+    assert admin_client.get("/en/reports/services.csv?machine_type=2&year=2025&quarter=2").status_code == 400
+
+def test_services_report_page_shows_selected_quarter(admin_client):
+    with patch.dict(app.config, {"WTF_CSRF_ENABLED": False}):
+        response = admin_client.post(
+            "/en/reports/services.html", data={"client": "1", "machine_type": "1", "year": "2025", "quarter": "3"}
+        )
+
+    page = response.data.decode()
+    assert "2025-07-02" in page and "S-1" in page and "S-2" in page
+    assert "S-3" not in page and "M-1" not in page
@@ -0,0 +1,155 @@
+import io
+import pytest
+from unittest.mock import patch
+from Management_system import app
+from Management_system.imports import import_data, import_stock_take, validate_stock_take
+from Management_system.models import AuditEntry, Client, Inventory, Location, Machine, MachineType, Part
+from Management_system.stock import StockChange, stock_levels
+
+@pytest.fixture
+def catalog(database):
+    database.session.add_all([
+        Part(part_number="P-1", name_en="Belt", name_lt="Dirzas", price=10),
+        Part(part_number="P-2", name_en="Roller", name_lt="Volelis", price=5),
+        Location(location_en="Warehouse", location_lt="Sandėlis"),
+        Location(location_en="Car", location_lt="Automobilis"),
+    ])
+    database.session.flush()
+    database.session.add(Inventory(part_id=1, location_id=1, quantity=5))
+    database.session.commit()
+    return database
+
+def csv_file(*lines):
+    return io.StringIO("\n".join(["part_number,location,quantity", *lines]))
+
+def test_validate_reports_every_issue(catalog):
+    result = validate_stock_take(csv_file(
+        "P-1,Warehouse,4",
+        "P-9,Warehouse,1",
+        "P-2,Garage,-1",
+        "P-1,warehouse,2",
+        "P-2,Car,²",
+    ))
+
+    assert [(issue.line, issue.message) for issue in result.issues] == [
+        (3, "import_unknown_part"),
+        (4, "import_unknown_location"),
+        (4, "import_invalid_quantity"),
+        (5, "import_duplicate_row"),
+        (6, "import_invalid_quantity"),
+    ]
+
+def test_missing_columns(catalog):
+    result = validate_stock_take(io.StringIO("part,quantity\nP-1,2"))
+    assert result.issues[0].message == "import_missing_columns"
+    assert result.issues[0].value == "part_number, location"
+
+def test_import_with_issues_writes_nothing(catalog):
+    result = import_stock_take(csv_file("P-1,Warehouse,9", "P-9,Warehouse,1"))
+
+    assert result.changes == []
+    assert stock_levels([1, 2]) == {(1, 1): 5}
+
+def test_import_applies_changes_in_batches(catalog):
+    result = import_stock_take(csv_file(
+        "P-1,Warehouse,5",
+        "P-1,Automobilis,2",
+        "P-2,1,7",
+        "P-2,Car,0",
+    ), batch_size=2)
+
+    assert result.changes == [StockChange(1, 2, None, 2), StockChange(2, 1, None, 7)]
+    assert stock_levels([1, 2]) == {(1, 1): 5, (1, 2): 2, (2, 1): 7}
+    assert AuditEntry.query.filter_by(entity_type="inventory", action="create").count() == 3
+
+def test_stock_take_page_lists_changes(catalog, logged_in_client):
+    with patch.dict(app.config, {"WTF_CSRF_ENABLED": False}), patch("Management_system.routes.log_user_action"):
+        data = {"file": (io.BytesIO(b"part_number,location,quantity\nP-1,Warehouse,8\n"), "count.csv")}
+        response = logged_in_client.post("/en/parts/stock_take", data=data, content_type="multipart/form-data")
+
+    assert response.status_code == 200
+    assert "5 → 8".encode() in response.data
+    assert stock_levels([1]) == {(1, 1): 8}
+
+CLIENTS = "company,address,city,contact_person,phone_number,email"
+
+@pytest.fixture
+def bank(database):
+    database.session.add_all([
+        Client(company="Bank", address="Street 1", city="Vilnius", contact_person="Jonas",
+               phone_number="100", email="bank@test.lt"),
+        MachineType(name="BPS C1"),
+        MachineType(name="BPS M7"),
+    ])
+    database.session.commit()
+    return database
+
+def test_client_conflicts_reported_in_dry_run(bank):
+    result = import_data("clients", io.StringIO("\n".join([
+        CLIENTS,
+        "Shop,Street 2,Kaunas,Petras,200,shop@test.lt",
+        "Shop 2,Street 3,Kaunas,Ona,100,other@test.lt",
+        "Shop 3,Street 4,Kaunas,Ona,300,SHOP@test.lt",
+    ])), dry_run=True)
+
+    assert [(issue.line, issue.message, issue.value) for issue in result.issues] == [
+        (3, "import_client_exists", "100"),
+        (4, "import_duplicate_value", "shop@test.lt"),
+    ]
+    assert result.created == 0 and Client.query.count() == 1
+
+def test_dry_run_writes_nothing(bank):
+    result = import_data("clients", io.StringIO(f"{CLIENTS}\nShop,Street 2,Kaunas,Petras,200,shop@test.lt"), dry_run=True)
+
+    assert len(result.rows) == 1 and result.created == 0
+    assert Client.query.count() == 1
+
+def test_import_machines_links_client_and_type(bank):
+    result = import_data("machines", io.StringIO("\n".join([
+        "serial_number,machine_type,client_email,start_of_operation,warranty",
+        "S-1,bps c1,BANK@test.lt,2025-01-15,2",
+        "S-2,BPS M7,bank@test.lt,2025-02-01,1",
+    ])))
+
+    assert result.issues == [] and result.created == 2
+    machine = Machine.query.filter_by(serial_number="S-1").one()
+    assert machine.client.company == "Bank" and machine.machine_type.name == "BPS C1"
+    assert str(machine.end_of_warranty) == "2027-01-15"
+    assert AuditEntry.query.filter_by(entity_type="machines", action="create").count() == 2
+
+def test_import_machines_reports_bad_values(bank):
+    result = import_data("machines", io.StringIO("\n".join([
+        "serial_number,machine_type,client_email,start_of_operation,warranty",
+        "S-1,BPS X,nobody@test.lt,15.01.2025,two",
+        "S-2,BPS C1,bank@test.lt,2025-01-15,²",
+    ])))
+
+    assert [issue.message for issue in result.issues] == [
+        "import_unknown_client", "import_unknown_machine_type", "import_invalid_date", "import_invalid_number",
+        "import_invalid_number",
+    ]
+    assert Machine.query.count() == 0
+
+def test_import_parts_with_compatibility(bank):
+    result = import_data("parts", io.StringIO("\n".join([
+        "part_number,name_en,name_lt,price,machine_types",
+        "P-1,Belt,Dirzas,12.5,BPS C1; BPS M7",
+    ])))
+
+    assert result.created == 1
+    part = Part.query.one()
+    assert part.price == 12.5
+    assert sorted(machine_type.name for machine_type in part.machine_types) == ["BPS C1", "BPS M7"]
+
+def test_data_import_page_dry_run(bank, logged_in_client):
+    with patch.dict(app.config, {"WTF_CSRF_ENABLED": False}), patch("Management_system.routes.log_user_action"):
+        data = {
+            "kind": "clients",
+            "dry_run": "y",
+            "file": (io.BytesIO(f"{CLIENTS}\nShop,Street 2,Kaunas,Petras,200,shop@test.lt\n".encode()), "clients.csv"),
+        }
+        response = logged_in_client.post("/en/imports", data=data, content_type="multipart/form-data")
+
+    assert response.status_code == 200
+    assert b"No issues found" in response.data
+    assert Client.query.count() == 1
@@ -1,5 +1,8 @@
+import os
+import json
 import pytest
 from Management_system import app, g, get_translations, inject_translations
+from Management_system.localization import TranslationCatalog
 
 @pytest.mark.parametrize("lang, expected", [
     ("en", "Name"),
@@ -16,4 +19,22 @@ def test_inject_translations_direct():
         result = inject_translations()
         assert result['lang'] == 'lt'
         assert 'tr' in result
-        assert result['tr']['name'] == 'Pavadinimas'
\ No newline at end of file
+        assert result['tr']['name'] == 'Pavadinimas'
+
+def test_get_translations_returns_cached_mapping():
+    assert get_translations('lt') is get_translations('lt')
+
+def test_get_translations_is_read_only():
+    with pytest.raises(TypeError):
+        get_translations('en')['name'] = "Changed"
+
+def test_catalog_reloads_when_file_changes(tmp_path):
+    path = tmp_path / "translations.json"
+    path.write_text(json.dumps({"name": {"en": "Name", "lt": "Pavadinimas"}}), encoding='utf-8')
+    catalog = TranslationCatalog(str(path))
+    assert catalog.get('lt')['name'] == "Pavadinimas"
+
+    path.write_text(json.dumps({"name": {"en": "Title", "lt": "Antraštė"}}), encoding='utf-8')
+    os.utime(path, (0, os.stat(path).st_mtime + 10))
+    assert catalog.get('en')['name'] == "Title"
+    assert catalog.get('es')['name'] == "name"
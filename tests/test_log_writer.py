@@ -0,0 +1,74 @@
+import gzip
+import logging
+import multiprocessing
+import os
+import time
+from Management_system.log_writer import LogWriter, RotatingLogFile
+
+FORMATTER = logging.Formatter("%(message)s")
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+def test_writer_appends_records_from_queue(tmp_path):
+    writer = LogWriter(max_bytes=1024 * 1024, backup_count=3)
+    logger = logging.getLogger("test_log_writer.queue")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    writer.add_logger(logger, str(tmp_path / "actions.log"), FORMATTER)
+
+    writer.start()
+    for i in range(100):
+        logger.info("line %d", i)
+    writer.stop()
+
+    assert read_lines(tmp_path / "actions.log") == [f"line {i}" for i in range(100)]
+
+def test_rotates_by_size_and_compresses(tmp_path):
+    path = str(tmp_path / "actions.log")
+    log_file = RotatingLogFile(path, max_bytes=50, backup_count=2)
+
+    for batch in range(5):
+        log_file.append([f"batch {batch} " + "x" * 30])
+
+    backups = sorted(name for name in os.listdir(tmp_path) if name.endswith(".gz"))
+    assert len(backups) == 2
+    with gzip.open(tmp_path / backups[-1], "rt") as f:
+        assert f.read().startswith("batch 3")
+    assert read_lines(path)[0].startswith("batch 4")
+
+def test_rotates_file_written_on_earlier_day(tmp_path):
+    path = str(tmp_path / "actions.log")
+    log_file = RotatingLogFile(path, max_bytes=1024, backup_count=2)
+    log_file.append(["yesterday"])
+    yesterday = time.time() - 24 * 60 * 60
+    os.utime(path, (yesterday, yesterday))
+
+    log_file.append(["today"])
+
+    assert read_lines(path) == ["today"]
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".gz")]) == 1
+
+def append_lines(path, worker):
+    log_file = RotatingLogFile(path, max_bytes=4096, backup_count=100)
+    for i in range(200):
+        log_file.append([f"worker {worker} line {i} " + "y" * 40])
+
+def test_concurrent_processes_do_not_interleave_or_lose_lines(tmp_path):
+    path = str(tmp_path / "actions.log")
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=append_lines, args=(path, worker)) for worker in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    lines = read_lines(path)
+    for name in os.listdir(tmp_path):
+        if name.endswith(".gz"):
+            with gzip.open(tmp_path / name, "rt") as f:
+                lines += f.read().splitlines()
+
+    assert len(lines) == 600
+    assert all(line.endswith("y" * 40) for line in lines)
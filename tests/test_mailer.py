@@ -0,0 +1,113 @@
+import time
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from Management_system import app, db
+from Management_system.mailer import (
+    BATCH_SIZE, MAX_ATTEMPTS, MailWorker, claim_messages, deliver_pending, enqueue_email, retry_delay
+)
+from Management_system.models import OutboxMessage, User
+from Management_system.utils import send_email
+from tests.smtp_server import SMTPServer
+
+@pytest.fixture
+def smtp_server(database):
+    with SMTPServer() as server, patch.multiple(
+        app.extensions["mail"],
+        server="127.0.0.1", port=server.port, use_tls=False, use_ssl=False,
+        username=None, password=None, suppress=False
+    ):
+        yield server
+
+@pytest.fixture
+def mail_log():
+    with patch("Management_system.mailer.log_mail_sender") as log:
+        yield log
+
+def test_send_email_commits_with_the_caller(database):
+    with patch("Management_system.mailer.mail.connect") as connect, \
+         patch("Management_system.mailer.mail_worker.notify") as notify, \
+         patch("Management_system.utils.log_mail_sender"):
+        db.session.add(User(name="Jonas", surname="J", phone_number="1", email="a@test.lt", password="x"))
+        send_email("Task", ["a@test.lt", "b@test.lt"], "<p>Task</p>")
+        notify.assert_not_called()
+        db.session.commit()
+
+        send_email("Dropped", ["a@test.lt"], "<p>Task</p>")
+        db.session.rollback()
+
+    connect.assert_not_called()
+    notify.assert_called_once()
+    assert User.query.count() == 1
+    message = OutboxMessage.query.one()
+    assert message.status == "pending"
+    assert message.recipient_list == ["a@test.lt", "b@test.lt"]
+
+def test_deliver_pending_reuses_one_connection(smtp_server, mail_log):
+    for i in range(3):
+        enqueue_email(f"Subject {i}", [f"user{i}@test.lt"], "<p>Hi</p>")
+
+    assert deliver_pending() == 3
+
+    assert smtp_server.connections == 1
+    assert [message["recipients"] for message in smtp_server.messages] == [
+        ["user0@test.lt"], ["user1@test.lt"], ["user2@test.lt"]
+    ]
+    assert all(message.status == "sent" and message.sent_at for message in OutboxMessage.query)
+    assert deliver_pending() == 0
+
+def test_rejected_message_is_retried_with_backoff(smtp_server, mail_log):
+    smtp_server.rejected.add("missing@test.lt")
+    enqueue_email("Bad", ["missing@test.lt"], "<p>Hi</p>")
+    enqueue_email("Good", ["user@test.lt"], "<p>Hi</p>")
+    now = datetime.now()
+
+    deliver_pending(now=now)
+
+    bad, good = OutboxMessage.query.order_by(OutboxMessage.id).all()
+    assert good.status == "sent"
+    assert bad.status == "pending" and bad.attempts == 1
+    assert bad.next_attempt_at == now + retry_delay(1)
+    assert "Attempt 1 failed" in mail_log.call_args_list[0].args[2]
+
+def test_unreachable_server_gives_up_after_max_attempts(database, mail_log):
+    enqueue_email("Subject", ["user@test.lt"], "<p>Hi</p>")
+    now = datetime.now()
+
+    with patch.multiple(app.extensions["mail"], server="127.0.0.1", port=1, use_tls=False, suppress=False):
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            assert deliver_pending(now=now) == 1
+            now += retry_delay(attempt)
+
+    message = OutboxMessage.query.one()
+    assert message.status == "failed" and message.attempts == MAX_ATTEMPTS
+    assert "Failed to send after" in mail_log.call_args.args[2]
+    assert deliver_pending(now=now + timedelta(days=1)) == 0
+
+def test_claimed_messages_are_not_claimed_twice(database):
+    enqueue_email("Subject", ["user@test.lt"], "<p>Hi</p>")
+    now = datetime.now()
+
+    assert len(claim_messages(now, BATCH_SIZE)) == 1
+    assert claim_messages(now, BATCH_SIZE) == []
+
+def test_worker_delivers_queued_mail(smtp_server, mail_log):
+    worker = MailWorker(app)
+    enqueue_email("Subject", ["user@test.lt"], "<p>Hi</p>")
+    db.session.commit()
+    with patch.dict(app.config, {"MAIL_WORKER": True, "MAIL_WORKER_INTERVAL": 0.05}):
+        worker.notify()
+        try:
+            for _ in range(100):
+                if smtp_server.messages:
+                    break
+                time.sleep(0.05)
+        finally:
+            worker.stop(timeout=5)
+
+    assert smtp_server.messages[0]["recipients"] == ["user@test.lt"]
+
+def test_worker_disabled_does_not_start():
+    worker = MailWorker(app)
+    worker.notify()
+    assert worker._thread is None
@@ -1,7 +1,8 @@
 from unittest.mock import MagicMock, patch
 from flask import Response
 from Management_system import Client, Machine, User, Part, Inventory, MachineType, app, db
-from Management_system.models import load_user, AdminModelView, RedirectHomeView
+from Management_system.models import load_user
+from Management_system.admin_views import AdminModelView, RedirectHomeView
 
 def test_client_str():
     client = Client(company="Brinks", city="Vilnius")
@@ -58,7 +59,7 @@ def test_is_accessible_allowed():
     class FakeUser:
         is_authenticated = True
         is_admin = True
-    with patch("Management_system.models.current_user", new=FakeUser()):
+    with patch("Management_system.admin_views.current_user", new=FakeUser()):
         view_1 = AdminModelView(User, db.session)
         view_2 = RedirectHomeView(User, db.session)
         assert view_1.is_accessible() is True
@@ -68,7 +69,7 @@ def test_is_accessible_not_authenticated():
     class FakeUser:
         is_authenticated = False
         is_admin = True
-    with patch("Management_system.models.current_user", new=FakeUser()):
+    with patch("Management_system.admin_views.current_user", new=FakeUser()):
         view_1 = AdminModelView(User, db.session)
         view_2 = RedirectHomeView(User, db.session)
         assert view_1.is_accessible() is False
@@ -78,7 +79,7 @@ def test_is_accessible_not_admin():
     class FakeUser:
         is_authenticated = True
         is_admin = False
-    with patch("Management_system.models.current_user", new=FakeUser()):
+    with patch("Management_system.admin_views.current_user", new=FakeUser()):
         view_1 = AdminModelView(User, db.session)
         view_2 = RedirectHomeView(User, db.session)
         assert view_1.is_accessible() is False
@@ -91,8 +92,8 @@ def test_redirect_home_view_redirects_to_index():
     view = RedirectHomeView()
 
     with app.test_request_context(), \
-         patch("Management_system.models.current_user", new=FakeUser()), \
-         patch("Management_system.models.lang_url_for", return_value="/en/index") as mock_url_for:
+         patch("Management_system.admin_views.current_user", new=FakeUser()), \
+         patch("Management_system.admin_views.lang_url_for", return_value="/en/index") as mock_url_for:
 
         response: Response = view.index()
 
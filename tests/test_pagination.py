@@ -0,0 +1,46 @@
+import pytest
+from datetime import date
+from Management_system.models import Service
+from Management_system.pagination import keyset_page
+
+@pytest.fixture
+def services(database):
+    for day in range(1, 8):
+        database.session.add(Service(date=date(2025, 1, day), machine_id=1, bn_count=day))
+    database.session.add(Service(date=date(2025, 1, 7), machine_id=1, bn_count=8))
+    database.session.commit()
+    return database.session.query(Service.date, Service.id, Service.bn_count)
+
+def counts(page):
+    return [row.bn_count for row in page.items]
+
+def test_first_page(services):
+    page = keyset_page(services, [Service.date, Service.id], 3)
+    assert counts(page) == [1, 2, 3]
+    assert page.has_next and not page.has_prev
+
+def test_page_after_cursor(services):
+    page = keyset_page(services, [Service.date, Service.id], 3, after=(date(2025, 1, 6), 6))
+    assert counts(page) == [7, 8]
+    assert not page.has_next and page.has_prev
+
+def test_page_before_cursor(services):
+    page = keyset_page(services, [Service.date, Service.id], 3, before=(date(2025, 1, 5), 5))
+    assert counts(page) == [2, 3, 4]
+    assert page.has_next and page.has_prev
+
+def test_descending_pages_share_tied_dates(services):
+    first = keyset_page(services, [Service.date, Service.id], 1, descending=True)
+    assert counts(first) == [8]
+
+    last = first.items[-1]
+    second = keyset_page(services, [Service.date, Service.id], 1, after=(last.date, last.id), descending=True)
+    assert counts(second) == [7]
+
+    back = keyset_page(services, [Service.date, Service.id], 1, before=(date(2025, 1, 7), 7), descending=True)
+    assert counts(back) == [8]
+    assert not back.has_prev
+
+def test_single_column_cursor(services):
+    page = keyset_page(services, [Service.id], 5, after=(6,))
+    assert counts(page) == [7, 8]
@@ -0,0 +1,129 @@
+import pytest
+from datetime import date, datetime
+from unittest.mock import patch, PropertyMock
+from sqlalchemy import create_engine, select, inspect, tuple_
+from Management_system import app, db
+from Management_system.models import (
+    Service, PartsReplaced, Inventory, Visit, Task, OneTimeLink, Machine, AuditEntry
+)
+from Management_system.reports import last_services_query
+from Management_system.usage import counter_series_query
+from Management_system.utils import upgrade_schema
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    db.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+def query_plan(engine, statement) -> list[str]:
+    sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as connection:
+        return [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+def assert_uses_index(plan: list[str], table: str, index: str) -> None:
+    steps = [step for step in plan if f" {table} " in f" {step} "]
+    assert steps, plan
+    assert all(step.startswith("SEARCH") for step in steps), plan
+    assert any(index in step for step in steps), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+FROM, TO = date(2025, 1, 1), date(2025, 3, 31)
+
+def audit_history(*filters):
+    cursor = tuple_(AuditEntry.created_at, AuditEntry.id) < tuple_(datetime(2025, 1, 1), 1)
+    return select(AuditEntry).filter(*filters, cursor).order_by(
+        AuditEntry.created_at.desc(), AuditEntry.id.desc()
+    ).limit(51)
+
+@pytest.mark.parametrize("statement, table, index", [
+    (
+        select(Service).filter_by(machine_id=1).order_by(Service.date.desc()),
+        "services", "ix_services_machine_id_date"
+    ),
+    (
+        select(PartsReplaced).filter_by(machine_id=1).order_by(PartsReplaced.date.desc()),
+        "parts_replaced", "ix_parts_replaced_machine_id_date"
+    ),
+    (
+        select(Service).filter(Service.date.between(FROM, TO)),
+        "services", "ix_services_date_user_id"
+    ),
+    (
+        select(Inventory).filter_by(part_id=1, location_id=2),
+        "inventory", "uq_inventory_part_id_location_id"
+    ),
+    (
+        select(Visit).filter_by(client_id=1, date=FROM),
+        "visits", "ix_visits_client_id_date"
+    ),
+    (
+        select(Task).filter_by(is_completed=False).order_by(Task.created_at),
+        "tasks", "ix_tasks_is_completed_created_at"
+    ),
+    (
+        select(OneTimeLink).filter_by(token="token", purpose="registration", used=False),
+        "one_time_links", "(token=?)"
+    ),
+    (
+        audit_history(AuditEntry.entity_type == "inventory", AuditEntry.entity_id == 1),
+        "audit_log", "ix_audit_log_entity_type_entity_id_created_at"
+    ),
+    (
+        audit_history(AuditEntry.entity_type == "inventory"),
+        "audit_log", "ix_audit_log_entity_type_created_at"
+    ),
+    (
+        audit_history(AuditEntry.user_id == 1),
+        "audit_log", "ix_audit_log_user_id_created_at"
+    ),
+    (
+        audit_history(),
+        "audit_log", "ix_audit_log_created_at"
+    ),
+])
+def test_hot_query_uses_index(engine, statement, table, index):
+    assert_uses_index(query_plan(engine, statement), table, index)
+
+def test_parts_report_query_uses_indexes(engine):
+    statement = select(PartsReplaced).join(Machine).filter(
+        Machine.client_id == 1,
+        PartsReplaced.date.between(FROM, TO)
+    )
+    plan = query_plan(engine, statement)
+
+    assert not any(step.startswith("SCAN") for step in plan), plan
+    assert any("ix_machines_client_id" in step for step in plan), plan
+    assert any("ix_parts_replaced_machine_id_date" in step for step in plan), plan
+
+def test_last_services_query_reads_summary_by_key(engine):
+    plan = query_plan(engine, last_services_query(1))
+
+    assert not any(step.startswith("SCAN") for step in plan), plan
+    assert any("ix_machines_client_id" in step for step in plan), plan
+    assert any(step.startswith("SEARCH machine_summary") and "PRIMARY KEY" in step for step in plan), plan
+
+def test_counter_series_query_reads_machine_index_in_order(engine):
+    plan = query_plan(engine, counter_series_query(FROM, TO))
+
+    assert any("ix_services_machine_id_date" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+def test_inventory_part_location_is_unique(engine):
+    unique = [
+        index for index in inspect(engine).get_indexes("inventory")
+        if index["unique"]
+    ]
+    assert [index["column_names"] for index in unique] == [["part_id", "location_id"]]
+
+def test_upgrade_schema_creates_missing_indexes(engine):
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_services_machine_id_date")
+        connection.exec_driver_sql("DROP INDEX ix_visits_client_id_date")
+
+    with app.app_context(), \
+         patch.object(type(db), "engine", new_callable=PropertyMock, return_value=engine):
+
+        assert sorted(upgrade_schema()) == ["ix_services_machine_id_date", "ix_visits_client_id_date"]
+        assert upgrade_schema() == []
@@ -0,0 +1,55 @@
+from sqlalchemy import update
+from Management_system import app
+from Management_system.models import Client, DataVersion, Location, MachineType
+from Management_system.refdata import REFERENCE_VERSION, locations, machine_types
+
+def version(database):
+    return database.session.get(DataVersion, REFERENCE_VERSION)
+
+def test_reference_data_is_cached(database):
+    database.session.add(MachineType(name="BPS C1"))
+    database.session.commit()
+
+    with app.app_context():
+        first = machine_types()
+    with app.app_context():
+        assert machine_types() is first
+    assert [machine_type.name for machine_type in first] == ["BPS C1"]
+
+def test_reference_writes_bump_version(database):
+    database.session.add(Location(location_en="Vilnius", location_lt="Vilnius"))
+    database.session.commit()
+    assert version(database).version == 1
+
+    with app.app_context():
+        assert len(locations()) == 1
+
+    database.session.add(Location(location_en="Kaunas", location_lt="Kaunas"))
+    database.session.commit()
+    assert version(database).version == 2
+
+    with app.app_context():
+        assert [location.location_en for location in locations()] == ["Vilnius", "Kaunas"]
+
+def test_other_writes_keep_version(database):
+    database.session.add(Client(company="UAB", address="A", city="Vilnius", contact_person="J", phone_number="1", email="a@b.lt"))
+    database.session.commit()
+    assert version(database) is None
+
+def test_version_bumped_by_another_process_reloads(database):
+    database.session.add(MachineType(name="BPS C1"))
+    database.session.commit()
+    with app.app_context():
+        first = machine_types()
+
+    database.session.execute(
+        update(MachineType.__table__).values(name="BPS C2")
+    )
+    database.session.execute(
+        update(DataVersion).where(DataVersion.name == REFERENCE_VERSION).values(version=DataVersion.version + 1)
+    )
+    database.session.commit()
+
+    with app.app_context():
+        assert machine_types() is not first
+        assert machine_types()[0].name == "BPS C2"
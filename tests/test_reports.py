@@ -0,0 +1,85 @@
+import pytest
+from datetime import date
+from sqlalchemy import event
+from Management_system.models import Client, MachineType, Service, User
+from Management_system.reports import last_services_query, month_sequence, users_services_report
+
+@pytest.fixture
+def services(database):
+    admin = User(name="Admin", surname="Admin", phone_number="0", email="admin@test.lt", password="x")
+    jonas = User(name="Jonas", surname="J", phone_number="1", email="jonas@test.lt", password="x")
+    petras = User(name="Petras", surname="P", phone_number="2", email="petras@test.lt", password="x")
+    database.session.add_all([admin, jonas, petras])
+    database.session.flush()
+
+    entries = [
+        (jonas, date(2025, 3, 1)), (jonas, date(2025, 3, 31)), (petras, date(2025, 3, 15)),
+        (admin, date(2025, 3, 2)), (None, date(2025, 3, 3)),
+        (jonas, date(2024, 4, 30)), (petras, date(2024, 12, 24)),
+        (jonas, date(2024, 3, 31)), (jonas, date(2025, 4, 1)),
+    ]
+    for user, service_date in entries:
+        database.session.add(Service(
+            date=service_date, machine_id=1, bn_count=1, user_id=user.id if user else None
+        ))
+    database.session.commit()
+    return database
+
+def test_month_sequence_crosses_year():
+    assert month_sequence(2025, 2, 4) == [(2024, 11), (2024, 12), (2025, 1), (2025, 2)]
+
+def test_users_services_report_month(services):
+    report = users_services_report(2025, 3)
+
+    assert report.rows == [
+        {"user": "Jonas", "services_done": 2, "services_percent": "40.00%"},
+        {"user": "Petras", "services_done": 1, "services_percent": "20.00%"},
+    ]
+
+def test_users_services_report_trend(services):
+    report = users_services_report(2025, 3)
+
+    assert report.periods[0] == (2024, 4) and report.periods[-1] == (2025, 3)
+    assert report.trend[0]["services"] == [1] + [0] * 10 + [2]
+    assert report.trend[1]["services"] == [0] * 8 + [1, 0, 0, 1]
+    assert report.totals[0] == 1 and report.totals[-1] == 5
+
+def test_users_services_report_reads_rollup(services):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(services.engine, "before_cursor_execute", listener)
+    users_services_report(2025, 3)
+    event.remove(services.engine, "before_cursor_execute", listener)
+
+    assert not [statement for statement in statements if "FROM services" in statement]
+    assert len([statement for statement in statements if "FROM monthly_user_services" in statement]) == 1
+
+def test_users_services_report_empty_month(services):
+    report = users_services_report(2023, 1)
+    assert all(row["services_percent"] == "0%" for row in report.rows)
+
+def test_last_services_query_picks_latest_service_per_active_machine(database, make_machine):
+    database.session.add_all([
+        MachineType(name="BPS C1"),
+        Client(company="Bank", address="Street 1", city="Vilnius", contact_person="Jonas",
+               phone_number="100", email="bank@test.lt"),
+    ])
+    database.session.flush()
+    for serial_number, client_id, is_active in [("S-1", 1, True), ("S-2", 1, True), ("S-3", 1, False), ("S-4", 2, True)]:
+        make_machine(serial_number, client_id, is_active=is_active)
+    database.session.flush()
+    database.session.add_all([
+        Service(date=date(2025, 3, 1), machine_id=1, bn_count=10, note="Old"),
+        Service(date=date(2025, 5, 1), machine_id=1, bn_count=20),
+        Service(date=date(2025, 5, 1), machine_id=1, bn_count=30, note="Belt worn"),
+        Service(date=date(2025, 6, 1), machine_id=3, bn_count=40),
+        Service(date=date(2025, 6, 1), machine_id=4, bn_count=50),
+    ])
+    database.session.commit()
+
+    rows = database.session.execute(last_services_query(1)).all()
+
+    assert [(machine.serial_number, service and service.bn_count) for machine, service in rows] == [
+        ("S-1", 30), ("S-2", None)
+    ]
+    assert rows[0][0].machine_type.name == "BPS C1" and rows[0][1].note == "Belt worn"
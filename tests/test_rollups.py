@@ -0,0 +1,93 @@
+import pytest
+from datetime import date
+from unittest.mock import patch
+from Management_system import app
+from Management_system.models import (
+    Client, Machine, MachineType, MonthlyClientActivity, MonthlyUserServices, Part, PartsReplaced, Service
+)
+from Management_system.reports import client_activity, yearly_activity_report
+from Management_system.rollups import rebuild_rollups, stale_rollups
+
+@pytest.fixture
+def history(database, admin_user, make_machine):
+    session = database.session
+    session.add_all([
+        MachineType(name="BPS C1"), MachineType(name="BPS M7"),
+        Client(company="Bank", address="Street 1", city="Vilnius", contact_person="Jonas",
+               phone_number="100", email="bank@test.lt"),
+        Part(part_number="P-1", name_en="Belt", name_lt="Dirzas", price=2.5),
+        Part(part_number="P-2", name_en="Roller", name_lt="Volelis", price=10),
+    ])
+    for i in range(6):
+        make_machine(f"S-{i}", client_id=i % 3 + 1, machine_type_id=i % 2 + 1)
+    session.flush()
+    session.add_all([
+        Service(date=date(2024 + i % 2, i % 12 + 1, i % 28 + 1), machine_id=i % 6 + 1, bn_count=1, user_id=i % 3 or None)
+        for i in range(60)
+    ])
+    session.add_all([
+        PartsReplaced(date=date(2024 + i % 2, i % 12 + 1, 3), part_id=i % 2 + 1, quantity=i % 4 + 1,
+                      machine_id=i % 6 + 1, warranty=i % 3 == 0, inventory_id=1)
+        for i in range(40)
+    ])
+    session.commit()
+    return database
+
+def stale(database):
+    return stale_rollups(database.session.connection())
+
+def test_inserts_keep_rollups_current(history):
+    assert stale(history) == {}
+    assert history.session.get(MonthlyUserServices, (date(2025, 4, 1), 0)).services == 5
+
+def test_edits_and_deletes_rebuild_their_months(history):
+    history.session.get(Service, 2).date = date(2023, 5, 5)
+    history.session.delete(history.session.get(PartsReplaced, 3))
+    history.session.commit()
+
+    assert stale(history) == {}
+    assert history.session.get(MonthlyUserServices, (date(2023, 5, 1), 1)).services == 1
+
+def test_price_and_machine_changes_rebuild_their_months(history):
+    history.session.get(Part, 1).price = 7
+    history.session.get(Machine, 1).client_id = 9
+    history.session.commit()
+
+    assert stale(history) == {}
+    assert MonthlyClientActivity.query.filter_by(client_id=9).count() > 0
+
+def test_verify_reports_stale_months_and_rebuild_fixes_them(history):
+    history.session.execute(Service.__table__.update().where(Service.id == 1).values(date=date(2023, 1, 1)))
+
+    assert list(stale(history)) == ["monthly_user_services", "monthly_machine_type_activity", "monthly_client_activity"]
+    assert stale(history)["monthly_user_services"] == [date(2023, 1, 1), date(2024, 1, 1)]
+
+    runner = app.test_cli_runner()
+    verify = runner.invoke(args=["rebuild-rollups", "--verify"])
+    assert verify.exit_code == 1 and "monthly_user_services: 2023-01, 2024-01" in verify.output
+
+    rebuild_rollups(history.session.connection(), {date(2023, 1, 1), date(2024, 1, 1)})
+    assert stale(history) == {}
+
+def test_yearly_activity_report(history):
+    report = yearly_activity_report(2024, 2025, "en")
+
+    assert report.years == [2024, 2025]
+    assert [row["machine_type"] for row in report.machine_types] == ["BPS C1", "BPS M7"]
+    assert sum(sum(row["services"]) for row in report.machine_types) == 60
+    assert [part["part_number"] for part in report.parts] == ["P-2", "P-1"]
+    assert sum(part["quantity"] for part in report.parts) == sum(i % 4 + 1 for i in range(40))
+
+def test_client_activity_uses_whole_months(history):
+    rows = client_activity(1, date(2024, 1, 15), date(2024, 7, 2))
+
+    assert [row.month for row in rows] == [date(2024, 1, 1), date(2024, 7, 1)]
+    assert rows[0].services == 5 and rows[0].parts_quantity == 4 and rows[0].parts_cost == 10
+
+def test_activity_report_page(history, logged_in_client):
+    with patch("Management_system.routes.log_user_action"):
+        response = logged_in_client.get("/en/reports/activity.html?year_from=2024&year_to=2025")
+
+    page = response.data.decode()
+    assert response.status_code == 200 and "flash error" not in page
+    assert "BPS M7" in page and "Roller" in page
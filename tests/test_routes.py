@@ -1,8 +1,13 @@
 import pytest
+from datetime import date
 from flask import g
+from sqlalchemy import event
 from werkzeug.exceptions import Forbidden, NotFound
 from unittest.mock import patch, MagicMock
 from Management_system import app
+from Management_system.models import (
+    Client, Machine, MachineType, User, Service, Part, PartsReplaced, Inventory, Location
+)
 from Management_system.routes import page_not_found
 
 @pytest.fixture
@@ -66,3 +71,115 @@ def test_403_error_handler(client):
         html, status_code = app.handle_user_exception(Forbidden())
 
         assert status_code == 403
+
+@pytest.fixture
+def machines_db(database):
+    machine_types = [MachineType(name="BPS C1"), MachineType(name="BPS M7")]
+    clients = [
+        Client(company="Brinks", address="A", city="Vilnius", contact_person="A",
+               phone_number="1", email="brinks@test.lt"),
+        Client(company="Loomis", address="B", city="Kaunas", contact_person="B",
+               phone_number="2", email="loomis@test.lt"),
+    ]
+    user = User(name="Tester", surname="Test", phone_number="3", email="tester@test.lt", password="x")
+    database.session.add_all(machine_types + clients + [user])
+    database.session.flush()
+
+    for number in range(1, 8):
+        database.session.add(Machine(
+            serial_number=f"{number:04}",
+            start_of_operation=date(2020, 1, 1),
+            end_of_warranty=date(2022, 1, 1),
+            machine_type_id=machine_types[number % 2].id,
+            client_id=clients[number % 2].id
+        ))
+    database.session.commit()
+    return database
+
+def count_statements(engine, request):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = request()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return response, statements
+
+@pytest.fixture
+def logged_in_client(machines_db):
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        with client.session_transaction() as session:
+            session['_user_id'] = str(User.query.first().id)
+        yield client
+
+def test_machine_list_pages_with_one_machines_query(logged_in_client, machines_db):
+    with patch("Management_system.routes.MACHINES_PER_PAGE", 3):
+        response, statements = count_statements(
+            machines_db.engine,
+            lambda: logged_in_client.get("/en/machines/machines_list?after=0002")
+        )
+
+    html = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert ["0003" in html, "0005" in html, "0006" in html] == [True, True, False]
+    assert "before=0003" in html and "after=0005" in html
+    assert len([statement for statement in statements if "FROM machines" in statement]) == 1
+
+def test_machine_list_filters(logged_in_client):
+    response = logged_in_client.get("/en/machines/machines_list?city=Kaunas&type=2")
+    html = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert all(f"{number:04}" in html for number in (1, 3, 5, 7))
+    assert not any(f"{number:04}" in html for number in (2, 4, 6))
+
+@pytest.fixture
+def machine_history(machines_db):
+    machine = Machine.query.filter_by(serial_number="0001").first()
+    user = User.query.first()
+    part = Part(part_number="503507011", name_en="Belt", name_lt="Diržas", price=10)
+    location = Location(location_en="Warehouse", location_lt="Sandėlis")
+    machines_db.session.add_all([part, location])
+    machines_db.session.flush()
+    inventory = Inventory(part_id=part.id, location_id=location.id, quantity=100)
+    machines_db.session.add(inventory)
+    machines_db.session.flush()
+
+    for day in range(1, 26):
+        machines_db.session.add(Service(
+            date=date(2025, 1, day), machine_id=machine.id, bn_count=day, user_id=user.id
+        ))
+        machines_db.session.add(PartsReplaced(
+            date=date(2025, 1, day), part_id=part.id, quantity=1, machine_id=machine.id,
+            warranty=False, user_id=user.id, inventory_id=inventory.id
+        ))
+    machines_db.session.commit()
+    return machines_db
+
+def test_machine_info_fixed_number_of_queries(logged_in_client, machine_history):
+    response, statements = count_statements(
+        machine_history.engine,
+        lambda: logged_in_client.get("/en/machines/machine_info/0001")
+    )
+    html = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert "2025-01-25" in html and "2025-01-06" in html and "2025-01-05" not in html
+    assert "date=2025-01-06" in html
+    assert len(statements) == 4
+
+def test_machine_services_next_chunk(logged_in_client, machine_history):
+    service = Service.query.filter_by(date=date(2025, 1, 6)).first()
+    response = logged_in_client.get(f"/en/machines/machine_info/0001/services?date=2025-01-06&id={service.id}")
+    html = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert "2025-01-05" in html and "2025-01-01" in html and "2025-01-06" not in html
+    assert "load-more" not in html
+
+def test_machine_parts_unknown_machine(logged_in_client):
+    response = logged_in_client.get("/en/machines/machine_info/9999/parts")
+    assert response.status_code == 404
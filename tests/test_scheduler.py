@@ -0,0 +1,103 @@
+import pytest
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+from Management_system import app
+from Management_system.models import Client, MachineType, Service, Visit
+from Management_system.scheduler import DueMachine, VisitProposal, forecast_due_dates, propose_visits, service_scheduler
+
+TODAY = date.today()
+THRESHOLD = 10000
+
+def day(offset):
+    return TODAY + timedelta(days=offset)
+
+@pytest.fixture
+def fleet(database, admin_user, make_machine):
+    session = database.session
+    session.add(MachineType(name="BPS C1"))
+    session.add_all([
+        Client(company=company, address="Street 1", city=city, contact_person="Jonas",
+               phone_number=f"10{i}", email=f"client{i}@test.lt")
+        for i, (company, city) in enumerate([("Bank", "Vilnius"), ("Shop", "Kaunas"), ("Post", "Vilnius")])
+    ])
+    # serial number, client, active, readings as (day offset, bn_count)
+    machines = [
+        ("S-1", 1, True, [(-29, 0), (-19, 5000)]),
+        ("S-2", 1, True, [(-60, 0), (-50, 10000)]),
+        ("S-3", 2, True, [(-10, 0), (0, 200)]),
+        ("S-4", 2, False, [(-10, 0), (-5, 50000)]),
+        ("S-5", 3, True, [(-10, 0), (-5, 50000)]),
+        ("S-6", 2, True, [(-5, 100)]),
+        ("S-7", 2, True, [(-10, 0), (-5, 5000)]),
+    ]
+    for machine_id, (serial_number, client_id, active, readings) in enumerate(machines, 1):
+        make_machine(serial_number, client_id, is_active=active)
+        session.flush()
+        session.add_all([
+            Service(date=day(offset), machine_id=machine_id, bn_count=bn_count) for offset, bn_count in readings
+        ])
+    session.add(Visit(client_id=3, date=day(10), purpose="Planned"))
+    session.commit()
+    return database
+
+def test_forecast_due_dates(fleet):
+    machine_ids, due_days, rates = forecast_due_dates(fleet.session, TODAY, THRESHOLD, 365)
+
+    assert machine_ids.tolist() == [1, 2, 3, 5, 7]
+    assert due_days.tolist() == [day(offset).toordinal() for offset in (1, -40, 500, -4, 5)]
+    assert rates.tolist() == [500, 1000, 20, 10000, 1000]
+
+def test_propose_visits_groups_due_machines_by_client(fleet):
+    proposals = propose_visits(fleet.session, TODAY, THRESHOLD, 30, 365)
+
+    assert proposals == [
+        VisitProposal(2, "Shop", "Kaunas", day(5), [DueMachine("S-7", day(5), 1000.0)]),
+        VisitProposal(1, "Bank", "Vilnius", TODAY, [
+            DueMachine("S-2", day(-40), 1000.0), DueMachine("S-1", day(1), 500.0)
+        ]),
+    ]
+    assert proposals[1].purpose("Service due") == f"Service due: S-2 ({day(-40)}), S-1 ({day(1)})"
+
+def test_forecast_is_cached_until_services_change(fleet):
+    with patch.dict(app.config, {"SERVICE_INTERVAL_BANKNOTES": THRESHOLD}), \
+         patch("Management_system.scheduler.propose_visits", wraps=propose_visits) as compute:
+        first = service_scheduler.forecast()
+        assert service_scheduler.forecast() is first
+
+        service_scheduler._wake.clear()
+        fleet.session.add(Service(date=TODAY, machine_id=7, bn_count=6000))
+        fleet.session.commit()
+        second = service_scheduler.forecast()
+
+    assert compute.call_count == 2 and service_scheduler._wake.is_set()
+    assert second.version > first.version
+    assert second.proposals[0].machines == [DueMachine("S-7", day(17), 600.0)]
+
+def test_calendar_shows_proposals(fleet, logged_in_client):
+    client = logged_in_client
+    with patch.dict(app.config, {"SERVICE_INTERVAL_BANKNOTES": THRESHOLD}), \
+         patch("Management_system.routes.log_user_action"):
+        calendar = client.get("/en/calendar")
+        proposals = client.get("/en/visit/proposals")
+        new_visit = client.get(f"/en/visit/new?client=2&date={day(5)}&purpose=Service+due:+S-7")
+
+    assert calendar.status_code == 200 and b"Proposed: Shop - Kaunas" in calendar.data
+    assert proposals.status_code == 200 and b"S-7" in proposals.data and b"/en/visit/new?client=2" in proposals.data
+    assert new_visit.status_code == 200
+    assert day(5).isoformat().encode() in new_visit.data and b"Service due: S-7" in new_visit.data
+
+def test_scheduler_thread_computes_forecast(fleet):
+    service_scheduler.clear()
+    with patch.dict(app.config, {"SCHEDULER": True, "SERVICE_INTERVAL_BANKNOTES": THRESHOLD}):
+        service_scheduler.start()
+        try:
+            for _ in range(100):
+                if service_scheduler._forecast is not None:
+                    break
+                time.sleep(0.05)
+        finally:
+            service_scheduler.stop(5)
+
+    assert not service_scheduler._thread.is_alive()
+    assert [proposal.client_id for proposal in service_scheduler._forecast.proposals] == [2, 1]
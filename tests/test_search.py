@@ -0,0 +1,76 @@
+import pytest
+from datetime import date
+from Management_system import app
+from Management_system.models import Client, Machine, MachineType, Part, User
+from Management_system.search import search_limit, search_machines, search_parts, search_clients
+
+@pytest.fixture
+def records(database):
+    client_1 = Client(company="Brinks", address="Street 1", city="Vilnius",
+                      contact_person="Jonas", phone_number="1", email="brinks@test.lt")
+    client_2 = Client(company="Loomis", address="Street 2", city="Kaunas",
+                      contact_person="Petras", phone_number="2", email="loomis@test.lt")
+    machine_type = MachineType(name="BPS C1")
+    database.session.add_all([client_1, client_2, machine_type])
+    database.session.flush()
+
+    for serial_number in ["1001", "1002", "2100", "3001"]:
+        database.session.add(Machine(
+            serial_number=serial_number,
+            start_of_operation=date(2020, 1, 1),
+            end_of_warranty=date(2022, 1, 1),
+            machine_type_id=machine_type.id,
+            client_id=client_1.id
+        ))
+
+    database.session.add_all([
+        Part(part_number="503507011", name_en="Belt", name_lt="Diržas", price=10),
+        Part(part_number="503507012", name_en="Roller", name_lt="Volelis", price=5),
+    ])
+    database.session.add(User(name="Tester", surname="Test", phone_number="3",
+                              email="tester@test.lt", password="x"))
+    database.session.commit()
+    return database
+
+@pytest.fixture
+def logged_in_client(records):
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        with client.session_transaction() as session:
+            session['_user_id'] = str(User.query.first().id)
+        yield client
+
+@pytest.mark.parametrize("value, expected", [
+    (None, 20), ("abc", 20), ("5", 5), ("0", 1), ("1000", 50)
+])
+def test_search_limit(value, expected):
+    assert search_limit(value) == expected
+
+def test_search_machines_prefix_first(records):
+    results = search_machines("100")
+    assert [result["value"] for result in results] == ["1001", "1002", "2100"]
+    assert results[0]["label"] == "1001 - BPS C1"
+
+def test_search_machines_respects_limit(records):
+    assert [result["value"] for result in search_machines("", limit=2)] == ["1001", "1002"]
+
+def test_search_parts_label_in_language(records):
+    results = search_parts("5035", "lt")
+    assert [result["label"] for result in results] == ["503507011 - Diržas", "503507012 - Volelis"]
+
+def test_search_clients_substring_case_insensitive(records):
+    results = search_clients("oomi")
+    assert results == [{"id": 2, "value": "Loomis - Kaunas", "label": "Loomis - Kaunas"}]
+
+def test_search_ignores_like_wildcards(records):
+    assert search_machines("%") == []
+
+def test_search_machines_api(logged_in_client):
+    response = logged_in_client.get("/en/search/machines?q=300")
+    assert response.status_code == 200
+    assert response.get_json() == [{"id": 4, "value": "3001", "label": "3001 - BPS C1"}]
+
+def test_search_api_requires_login(records):
+    with app.test_client() as client:
+        response = client.get("/en/search/parts?q=5")
+        assert response.status_code == 302
@@ -0,0 +1,105 @@
+import os
+import sqlite3
+import pytest
+from datetime import date
+from threading import Barrier, Thread
+from unittest.mock import patch
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from Management_system import app
+from Management_system.models import Service, User
+from Management_system.reports import users_services_report
+from Management_system.snapshot import ReportSnapshot, report_session, report_snapshot
+
+@pytest.fixture
+def snapshot(database, tmp_path):
+    jonas = User(name="Jonas", surname="J", phone_number="1", email="jonas@test.lt", password="x", is_admin=True)
+    database.session.add(jonas)
+    database.session.flush()
+    database.session.add(Service(date=date(2025, 3, 1), machine_id=1, bn_count=1, user_id=jonas.id))
+    database.session.commit()
+
+    settings = {"REPORT_SNAPSHOT": True, "REPORT_SNAPSHOT_PATH": str(tmp_path / "reports.db")}
+    with patch.dict(app.config, settings):
+        yield jonas
+    report_snapshot.dispose()
+
+def services_done():
+    with app.app_context():
+        return users_services_report(2025, 3, months=1).rows[0]["services_done"]
+
+def test_reports_read_snapshot_until_refreshed(snapshot, database):
+    assert services_done() == 1
+
+    database.session.add(Service(date=date(2025, 3, 2), machine_id=1, bn_count=1, user_id=snapshot.id))
+    database.session.commit()
+    assert services_done() == 1
+
+    report_snapshot.refresh()
+    assert services_done() == 2
+
+def test_concurrent_refreshes_use_their_own_files(snapshot, tmp_path):
+    # Separate instances have separate locks, like refreshers in different worker processes.
+    snapshots = [ReportSnapshot(app) for _ in range(4)]
+    barrier = Barrier(len(snapshots))
+    errors = []
+
+    def refresh(instance):
+        with app.app_context():
+            barrier.wait()
+            try:
+                for _ in range(5):
+                    instance.refresh()
+            except Exception as error:
+                errors.append(error)
+
+    threads = [Thread(target=refresh, args=(instance,)) for instance in snapshots]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert os.listdir(tmp_path) == ["reports.db"]
+    with sqlite3.connect(tmp_path / "reports.db") as connection:
+        assert connection.execute("SELECT COUNT(*) FROM services").fetchone() == (1,)
+
+def test_failed_refresh_removes_its_file(snapshot, tmp_path):
+    with patch("Management_system.snapshot.sqlite3.connect", side_effect=sqlite3.OperationalError("disk full")):
+        with pytest.raises(sqlite3.OperationalError):
+            report_snapshot.refresh()
+
+    assert os.listdir(tmp_path) == []
+
+def test_snapshot_is_read_only(snapshot):
+    with app.app_context():
+        with pytest.raises(OperationalError):
+            report_session().execute(text("DELETE FROM services"))
+
+def test_report_session_is_live_without_snapshot(database):
+    assert report_session() is database.session
+
+def test_report_shows_age_and_refreshes_on_demand(snapshot):
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        with client.session_transaction() as session:
+            session['_user_id'] = str(snapshot.id)
+
+        page = client.get("/en/reports/users.html?year=2025&month=3")
+        assert b"Data captured" in page.data
+
+        taken_at = report_snapshot.taken_at()
+        response = client.post("/en/reports/snapshot")
+
+    assert response.status_code == 302
+    assert report_snapshot.taken_at() >= taken_at
+
+def test_refresh_requires_admin(snapshot, database):
+    snapshot.is_admin = False
+    database.session.commit()
+
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        with client.session_transaction() as session:
+            session['_user_id'] = str(snapshot.id)
+        assert client.post("/en/reports/snapshot").status_code == 403
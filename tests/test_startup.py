@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+from Management_system import app, admin
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_import_defers_heavy_modules():
+    probe = (
+        "import sys, Management_system; "
+        "print([name for name in ('matplotlib', 'numpy', 'flask_admin.contrib.sqla') if name in sys.modules])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+
+    assert output.strip().splitlines()[-1] == "[]"
+
+def test_admin_views_registered_before_first_request():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        client.get("/en/login")
+
+    endpoints = [view.endpoint for view in admin._views]
+    assert "user" in endpoints and "visit" in endpoints
+    assert len(endpoints) == len(set(endpoints))
@@ -0,0 +1,135 @@
+import pytest
+from datetime import date
+from threading import Barrier, Thread
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from Management_system import app, db
+from Management_system.models import AuditEntry, Inventory, Location, Part, PartsReplaced
+from Management_system.stock import (
+    StockChange, book_replaced_part, consume_stock, set_stock_levels, stock_changes, stock_levels
+)
+from Management_system.utils import retry_on_lock
+
+def replacement(inventory_id, quantity=1):
+    return PartsReplaced(
+        date=date(2025, 3, 1), part_id=1, quantity=quantity, machine_id=1,
+        warranty=False, inventory_id=inventory_id
+    )
+
+@pytest.fixture
+def stock(database):
+    inventory = Inventory(part_id=1, location_id=1, quantity=5)
+    database.session.add(inventory)
+    database.session.commit()
+    return inventory.id
+
+def test_consume_stock_takes_quantity(stock):
+    assert consume_stock(stock, 3)
+    db.session.commit()
+    assert db.session.get(Inventory, stock).quantity == 2
+
+def test_consume_stock_refuses_more_than_available(stock):
+    assert not consume_stock(stock, 6)
+    db.session.commit()
+    assert db.session.get(Inventory, stock).quantity == 5
+
+def test_consume_stock_refuses_non_positive_quantity(stock):
+    assert not consume_stock(stock, 0)
+    assert not consume_stock(stock, -3)
+    db.session.commit()
+    assert db.session.get(Inventory, stock).quantity == 5
+
+def test_book_replaced_part_saves_nothing_without_stock(stock):
+    assert book_replaced_part(replacement(stock, 2))
+    assert not book_replaced_part(replacement(stock, 4))
+
+    assert PartsReplaced.query.count() == 1
+    assert db.session.get(Inventory, stock).quantity == 3
+
+def test_stock_changes_skips_unchanged_and_empty_locations():
+    changes = stock_changes({(1, 1): 5, (1, 2): 3}, {(1, 1): 5, (1, 2): 0, (1, 3): 0, (1, 4): 7})
+    assert changes == [StockChange(1, 2, 3, 0), StockChange(1, 4, None, 7)]
+
+def test_set_stock_levels_upserts_and_audits(stock):
+    set_stock_levels(stock_changes(stock_levels([1]), {(1, 1): 2, (1, 2): 4}))
+    db.session.commit()
+
+    assert stock_levels([1]) == {(1, 1): 2, (1, 2): 4}
+    entries = AuditEntry.query.filter_by(entity_type="inventory").order_by(AuditEntry.id).all()
+    assert [(entry.action, entry.after["quantity"]) for entry in entries][-2:] == [("update", 2), ("create", 4)]
+
+def test_update_part_form_saves_quantities(database, logged_in_client):
+    database.session.add_all([
+        Part(part_number="P-1", name_en="Belt", name_lt="Dirzas", price=10),
+        Location(location_en="Vilnius", location_lt="Vilnius"),
+        Location(location_en="Kaunas", location_lt="Kaunas"),
+    ])
+    database.session.flush()
+    database.session.add(Inventory(part_id=1, location_id=1, quantity=5))
+    database.session.commit()
+
+    client = logged_in_client
+    with patch("Management_system.routes.log_user_action"):
+        page = client.get("/en/parts/update_part/P-1")
+        response = client.post("/en/parts/update_part/P-1", data={"quantity_1": "3", "quantity_2": "6"})
+
+    assert b'name="quantity_1"' in page.data and b'value="5"' in page.data
+    assert response.status_code == 302
+    assert stock_levels([1]) == {(1, 1): 3, (1, 2): 6}
+
+def test_retry_on_lock_retries_locked_database(database):
+    locked = OperationalError("UPDATE", {}, Exception("database is locked"))
+    calls = []
+
+    @retry_on_lock
+    def transaction():
+        calls.append(1)
+        if len(calls) < 3:
+            raise locked
+        return True
+
+    with patch("Management_system.utils.time.sleep"):
+        assert transaction()
+    assert len(calls) == 3
+
+def test_retry_on_lock_reraises_other_errors(database):
+    @retry_on_lock
+    def transaction():
+        raise OperationalError("UPDATE", {}, Exception("no such table: inventory"))
+
+    with pytest.raises(OperationalError):
+        transaction()
+
+@pytest.fixture
+def file_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stock.db'}", connect_args={"timeout": 0.05})
+    with app.app_context(), patch.dict(db._app_engines[app], {None: engine}):
+        db.create_all()
+        db.session.add(Inventory(part_id=1, location_id=1, quantity=40))
+        db.session.commit()
+        db.session.remove()
+        yield engine
+    engine.dispose()
+
+def test_concurrent_bookings_never_overdraw_stock(file_database):
+    threads, bookings = 8, 10
+    barrier = Barrier(threads)
+    booked = []
+
+    def engineer():
+        with app.app_context():
+            barrier.wait()
+            for _ in range(bookings):
+                if book_replaced_part(replacement(1)):
+                    booked.append(1)
+
+    workers = [Thread(target=engineer) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    with app.app_context():
+        assert db.session.get(Inventory, 1).quantity == 0
+        assert PartsReplaced.query.count() == len(booked) == 40
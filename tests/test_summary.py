@@ -0,0 +1,120 @@
+import pytest
+from datetime import date
+from unittest.mock import patch
+from Management_system import app, db
+from Management_system.models import MachineSummary, Part, PartsReplaced, Service
+from Management_system.summary import rebuild_summaries, stale_summaries
+
+def summary(machine_id):
+    row = db.session.get(MachineSummary, machine_id, populate_existing=True)
+    return row and (row.last_service_date, row.last_bn_count, row.service_count, round(row.parts_cost, 2))
+
+@pytest.fixture
+def machines(database, make_machine):
+    make_machine("S-1")
+    make_machine("S-2")
+    database.session.add_all([
+        Part(part_number="P-1", name_en="Belt", name_lt="Dirzas", price=12.5),
+        Part(part_number="P-2", name_en="Roller", name_lt="Volelis", price=3),
+    ])
+    database.session.commit()
+    return database
+
+def replacement(part_id, quantity, machine_id=1):
+    return PartsReplaced(
+        date=date(2025, 3, 1), part_id=part_id, quantity=quantity, machine_id=machine_id,
+        warranty=False, inventory_id=1
+    )
+
+def test_services_update_summary(machines):
+    machines.session.add_all([
+        Service(date=date(2025, 3, 1), machine_id=1, bn_count=100),
+        Service(date=date(2025, 1, 1), machine_id=1, bn_count=50),
+    ])
+    machines.session.commit()
+    machines.session.add(Service(date=date(2025, 3, 1), machine_id=1, bn_count=120))
+    machines.session.commit()
+
+    assert summary(1) == (date(2025, 3, 1), 120, 3, 0)
+    assert summary(2) is None
+
+def test_replaced_parts_add_cost(machines):
+    machines.session.add_all([replacement(1, 2), replacement(2, 1)])
+    machines.session.commit()
+
+    assert summary(1) == (None, None, 0, 28.0)
+
+def test_price_change_recomputes_cost(machines):
+    machines.session.add(replacement(1, 2))
+    machines.session.commit()
+
+    machines.session.get(Part, 1).price = 20
+    machines.session.commit()
+
+    assert summary(1) == (None, None, 0, 40.0)
+
+def test_deleting_latest_service_restores_previous(machines):
+    machines.session.add_all([
+        Service(date=date(2025, 1, 1), machine_id=1, bn_count=50),
+        Service(date=date(2025, 2, 1), machine_id=1, bn_count=80),
+    ])
+    machines.session.commit()
+
+    machines.session.delete(Service.query.filter_by(bn_count=80).one())
+    machines.session.commit()
+
+    assert summary(1) == (date(2025, 1, 1), 50, 1, 0)
+
+def test_moving_service_updates_both_machines(machines):
+    machines.session.add(Service(date=date(2025, 1, 1), machine_id=1, bn_count=50))
+    machines.session.commit()
+
+    Service.query.one().machine_id = 2
+    machines.session.commit()
+
+    assert summary(1) is None
+    assert summary(2) == (date(2025, 1, 1), 50, 1, 0)
+    assert stale_summaries(machines.session.connection()) == []
+
+def test_rebuild_repairs_stale_summaries(machines):
+    machines.session.add_all([
+        Service(date=date(2025, 1, 1), machine_id=2, bn_count=50),
+        replacement(1, 3, machine_id=2),
+    ])
+    machines.session.commit()
+    machines.session.execute(MachineSummary.__table__.update().values(service_count=7))
+    machines.session.execute(MachineSummary.__table__.insert().values(machine_id=1, service_count=1, parts_cost=0))
+
+    connection = machines.session.connection()
+    assert stale_summaries(connection) == [1, 2]
+
+    rebuild_summaries(connection)
+    assert stale_summaries(connection) == []
+    assert summary(1) is None and summary(2) == (date(2025, 1, 1), 50, 1, 37.5)
+
+def test_rebuild_command_verifies_and_rebuilds(machines):
+    machines.session.add(Service(date=date(2025, 1, 1), machine_id=1, bn_count=50))
+    machines.session.commit()
+    machines.session.execute(MachineSummary.__table__.delete())
+    machines.session.commit()
+
+    runner = app.test_cli_runner()
+    verify = runner.invoke(args=["rebuild-machine-summary", "--verify"])
+    rebuild = runner.invoke(args=["rebuild-machine-summary"])
+
+    assert verify.exit_code == 1 and "1 machine summaries out of date: 1" in verify.output
+    assert rebuild.exit_code == 0 and "Rebuilt 1 machine summaries" in rebuild.output
+    assert summary(1) == (date(2025, 1, 1), 50, 1, 0)
+
+def test_new_service_checks_summary(machines, logged_in_client):
+    machines.session.add(Service(date=date(2025, 3, 1), machine_id=1, bn_count=100))
+    machines.session.commit()
+
+    client = logged_in_client
+    with patch.dict(app.config, {"WTF_CSRF_ENABLED": False}), patch("Management_system.routes.log_user_action"):
+        older = client.post("/en/service/add_new", data={"date": "2025-02-01", "serial_number": "S-1", "bn_count": "150"})
+        lower = client.post("/en/service/add_new", data={"date": "2025-04-01", "serial_number": "S-1", "bn_count": "90"})
+        added = client.post("/en/service/add_new", data={"date": "2025-04-01", "serial_number": "S-1", "bn_count": "150"})
+
+    assert older.status_code == lower.status_code == 200 and added.status_code == 302
+    assert summary(1) == (date(2025, 4, 1), 150, 2, 0)
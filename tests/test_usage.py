@@ -0,0 +1,101 @@
+import pytest
+import numpy as np
+from datetime import date
+from unittest.mock import patch
+from Management_system.models import Client, MachineType, Service
+from Management_system.usage import CounterSeries, counter_intervals, load_counter_series, machine_usage, usage_report
+
+def series(*rows):
+    machine_ids, days, counts = zip(*rows)
+    return CounterSeries(np.array(machine_ids), np.array(days), np.array(counts))
+
+@pytest.fixture
+def readings(database, admin_user, make_machine):
+    session = database.session
+    session.add_all([
+        MachineType(name="BPS C1"),
+        Client(company="Bank", address="Street 1", city="Vilnius", contact_person="Jonas",
+               phone_number="100", email="bank@test.lt"),
+        Client(company="Shop", address="Street 2", city="Kaunas", contact_person="Petras",
+               phone_number="200", email="shop@test.lt"),
+    ])
+    for i in (1, 2):
+        make_machine(f"S-{i}", client_id=i)
+    session.flush()
+    session.add_all([
+        Service(date=date(2025, 1, 1), machine_id=1, bn_count=1000),
+        Service(date=date(2025, 1, 11), machine_id=1, bn_count=2000),
+        Service(date=date(2025, 1, 21), machine_id=1, bn_count=3000),
+        Service(date=date(2025, 1, 31), machine_id=1, bn_count=4000),
+        Service(date=date(2025, 2, 1), machine_id=1, bn_count=9000),
+        Service(date=date(2025, 2, 10), machine_id=1, bn_count=50),
+        Service(date=date(2025, 1, 5), machine_id=2, bn_count=0),
+        Service(date=date(2025, 1, 15), machine_id=2, bn_count=300),
+        Service(date=date(2024, 12, 1), machine_id=2, bn_count=100),
+    ])
+    session.commit()
+    return database
+
+def test_intervals_stay_within_machines():
+    intervals = counter_intervals(series((1, 0, 10), (1, 4, 30), (2, 4, 5), (2, 4, 9), (3, 1, 0)))
+
+    assert intervals.machine_ids.tolist() == [1, 2]
+    assert intervals.banknotes.tolist() == [20, 4]
+    assert intervals.rates[0] == 5 and np.isnan(intervals.rates[1])
+    assert not intervals.outliers.any()
+
+def test_resets_and_spikes_are_outliers():
+    intervals = counter_intervals(series(
+        (1, 0, 0), (1, 10, 100), (1, 20, 200), (1, 30, 300), (1, 31, 1300), (1, 40, 10),
+        (2, 0, 0), (2, 1, 1000),
+    ))
+
+    assert intervals.resets.tolist() == [False, False, False, False, True, False]
+    assert intervals.outliers.tolist() == [False, False, False, True, True, False]
+
+def test_machine_usage_weighs_by_days():
+    usage = machine_usage(counter_intervals(series((1, 0, 0), (1, 1, 100), (1, 11, 200), (2, 0, 0))))
+
+    assert usage.machine_ids.tolist() == [1]
+    assert usage.banknotes.tolist() == [200] and usage.days.tolist() == [11]
+    assert usage.daily_rates[0] == pytest.approx(200 / 11)
+    assert usage.peak_rates.tolist() == [100]
+
+def test_empty_series():
+    usage = machine_usage(counter_intervals(series((1, 0, 0))))
+
+    assert len(usage.machine_ids) == 0
+
+def test_load_counter_series_orders_by_machine_and_date(readings):
+    loaded = load_counter_series(date(2025, 1, 1), date(2025, 12, 31))
+
+    assert loaded.machine_ids.tolist() == [1] * 6 + [2] * 2
+    assert loaded.days.tolist()[:2] == [date(2025, 1, 1).toordinal(), date(2025, 1, 11).toordinal()]
+    assert loaded.counts.tolist()[-2:] == [0, 300]
+    assert load_counter_series(date(2024, 1, 1), date(2025, 12, 31), client_id=2).counts.tolist() == [100, 0, 300]
+
+def test_usage_report(readings):
+    report = usage_report(date(2025, 1, 1), date(2025, 12, 31))
+
+    assert report.fleet == {
+        "services": 8, "machines": 2, "intervals": 6, "banknotes": 8300, "daily_rate": 202.4,
+        "median_daily_rate": 144.0, "resets": 1, "outliers": 2,
+    }
+    assert [(machine["serial_number"], machine["daily_rate"]) for machine in report.machines] == [
+        ("S-1", 258.1), ("S-2", 30.0)
+    ]
+    assert [(outlier["date_to"], outlier["daily_rate"], outlier["reset"]) for outlier in report.outliers] == [
+        ("2025-02-10", None, True), ("2025-02-01", 5000.0, False)
+    ]
+
+def test_usage_json_endpoint(readings, logged_in_client):
+    client = logged_in_client
+    with patch("Management_system.routes.log_user_action"):
+        response = client.get("/en/reports/usage.json?date_from=2025-01-01&date_to=2025-12-31&client=2")
+        page = client.get("/en/reports/usage.html?date_from=2025-01-01&date_to=2025-12-31")
+
+    assert response.status_code == 200
+    assert response.json["fleet"]["banknotes"] == 300
+    assert response.json["machines"][0] | {"serial_number": "S-2", "client": "Shop", "daily_rate": 30.0} == \
+        response.json["machines"][0]
+    assert page.status_code == 200 and b"S-1" in page.data
@@ -72,19 +72,18 @@ def test_strip_tags_empty_str():
     assert result == ""
 
 
-def test_send_email_success():
-    with app.app_context(), \
-         patch("Management_system.utils.mail.send") as mock_send, \
+def test_send_email_queues(database):
+    with patch("Management_system.mailer.mail_worker.notify") as mock_notify, \
          patch("Management_system.utils.log_mail_sender") as mock_log:
 
         send_email("Subject", "admin@test.lt", "<p>Hello</p>")
+        database.session.commit()
 
-        mock_send.assert_called_once()
-        mock_log.assert_called_once_with(["admin@test.lt"], "Subject", "Sent")
+        mock_notify.assert_called_once()
+        mock_log.assert_called_once_with(["admin@test.lt"], "Subject", "Queued")
 
-def test_send_email_failed():
-    with app.app_context(), \
-         patch("Management_system.utils.mail.send", side_effect=Exception("SMTP error")), \
+def test_send_email_failed(database):
+    with patch("Management_system.mailer.enqueue_email", side_effect=Exception("DB error")), \
          patch("Management_system.utils.log_mail_sender") as mock_log:
 
         send_email("Subject", ["admin@test.lt"], "<p>Some Text</p>")
@@ -94,8 +93,8 @@ def test_send_email_failed():
 
         assert args[0] == ["admin@test.lt"]
         assert args[1] == "Subject"
-        assert "Failed to send" in args[2]
-        assert "SMTP error" in args[2]
+        assert "Failed to queue" in args[2]
+        assert "DB error" in args[2]
 
 
 def test_generate_link_adds_token_to_db():